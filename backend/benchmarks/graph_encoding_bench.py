@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compare JSON and columnar MessagePack encodings of /api/graph responses.
+
+Usage (from backend/):
+  python benchmarks/graph_encoding_bench.py [--edges 100000] [--repeat 5]
+
+- json: GraphResponse validation + pydantic-core JSON (the default
+  response, Accept: application/json)
+- msgpack: one array per node/edge field, packed with msgpack
+  (Accept: application/msgpack)
+
+The graph is synthetic: one politician holding `--edges` companies. The
+report gives median encode time and payload size, raw and gzipped (what a
+client behind a compressing proxy would download).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DATABASE_URL", "postgresql://bench@localhost/bench")
+
+
+def synthetic_graph(edges: int):
+    """(nodes, edges) as the graph router builds them, before encoding."""
+    from src.routers.graph import _edge_response
+    from src.services.graph_service import holding_edge
+
+    nodes = [
+        {
+            "id": 1,
+            "type": "person",
+            "name": "Politician 1",
+            "position": "Senator",
+            "state": "California",
+            "party_affiliation": "Independent",
+            "estimated_net_worth": Decimal("1234567.89"),
+            "last_trade_date": date(2024, 1, 1),
+        }
+    ]
+    nodes += [
+        {"id": i, "type": "company", "name": f"Company {i}", "ticker": f"C{i}"}
+        for i in range(1, edges + 1)
+    ]
+    edge_rows = [
+        _edge_response(holding_edge(1, i, Decimal(i * 37 % 2_000_000 - 200_000) + Decimal("0.25")))
+        for i in range(1, edges + 1)
+    ]
+    return nodes, edge_rows
+
+
+def timed(fn, repeat: int):
+    """(median ms, output of the last call)"""
+    fn()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark graph response encodings")
+    parser.add_argument("--edges", type=int, default=100_000, help="Edges in the synthetic graph")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per encoding")
+    args = parser.parse_args()
+
+    import msgpack
+    from src.routers.graph import _graph_columns
+    from src.schemas.graph import GraphResponse
+    from src.utils.responses import FastJSONResponse, MsgpackResponse
+
+    nodes, edges = synthetic_graph(args.edges)
+
+    def json_body():
+        model = GraphResponse(center_id=1, center_type="person", nodes=nodes, edges=edges)
+        return FastJSONResponse(model).body
+
+    def msgpack_body():
+        return MsgpackResponse(_graph_columns(1, "person", nodes, edges)).body
+
+    json_ms, json_bytes = timed(json_body, args.repeat)
+    msgpack_ms, msgpack_bytes = timed(msgpack_body, args.repeat)
+    decoded = msgpack.unpackb(msgpack_bytes)
+    if len(decoded["edges"]["source"]) != args.edges:
+        raise SystemExit("msgpack payload lost edges")
+
+    print(f"{args.edges} edges, {len(nodes)} nodes")
+    print(f"{'encoding':<9} {'encode ms':>10} {'bytes':>11} {'gzip bytes':>11}")
+    for name, ms, body in (("json", json_ms, json_bytes), ("msgpack", msgpack_ms, msgpack_bytes)):
+        print(f"{name:<9} {ms:>10.1f} {len(body):>11} {len(gzip.compress(body, 6)):>11}")
+    print(
+        f"msgpack: {len(msgpack_bytes) / len(json_bytes):.0%} of JSON size, "
+        f"{json_ms / msgpack_ms:.1f}x faster to encode"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the heuristic classifier in src/utils/nlp_fallbacks.py.
+
+Usage (from backend/):
+  python benchmarks/nlp_fallbacks_bench.py --max-us 10
+
+Reports per-term cost for simple_classify and classify_many over a mixed
+set of tickers, person names, company names and free text. Exits non-zero
+if either exceeds --max-us, so it can gate regressions in CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.utils.nlp_fallbacks import classify_many, simple_classify  # noqa: E402
+
+TERMS = [
+    "NVDA",
+    "BRK.",
+    "Nancy Pelosi",
+    "John M. Doe",
+    "Sen. Bob Smith",
+    "Lockheed Martin Corp",
+    "NorthStar Defense Systems",
+    "McDonalds",
+    "senator from texas",
+    "the people's fund",
+    "45 years old investor",
+    "tesla",
+    "Vice President Harris",
+    "pacific digital ventures",
+    "Elaine Wu",
+    "something unrecognisable",
+]
+
+
+def per_term_us(fn, number: int) -> float:
+    """Best-of-5 per-term cost in microseconds."""
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / (number * len(TERMS)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark heuristic classification")
+    parser.add_argument("--number", type=int, default=2000, help="Passes over the term set per repeat")
+    parser.add_argument("--max-us", type=float, default=10.0, help="Fail if per-term cost exceeds this")
+    args = parser.parse_args()
+
+    # classify_many dedupes within a call, so feed it distinct terms
+    many_input = [f"{t} {i}" for i in range(args.number) for t in TERMS]
+
+    single = per_term_us(lambda: [simple_classify(t) for t in TERMS], args.number)
+    many = min(timeit.repeat(lambda: classify_many(many_input), number=1, repeat=5))
+    many = many / len(many_input) * 1e6
+
+    print(f"simple_classify  {single:6.2f} us/term")
+    print(f"classify_many    {many:6.2f} us/term")
+
+    failed = [name for name, us in (("simple_classify", single), ("classify_many", many)) if us > args.max_us]
+    if failed:
+        print(f"FAIL: {', '.join(failed)} above {args.max_us} us/term")
+        sys.exit(1)
+    print(f"OK: below {args.max_us} us/term")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Compare FastAPI's default response pipeline with FastJSONResponse.
+
+Usage (from backend/):
+  python benchmarks/response_bench.py [--seconds 1.0]
+
+- default: handler returns a dict -> response_model validation ->
+  serialize to JSON-able dicts -> json.dumps (JSONResponse)
+- fast: handler builds the response model once -> pydantic-core writes the
+  JSON bytes directly (FastJSONResponse)
+
+Payloads are synthetic but shaped like each endpoint's real responses, so
+no database is needed. Both pipelines must produce identical bytes; the
+script checks that before timing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DATABASE_URL", "postgresql://bench@localhost/bench")
+
+
+def person(i):
+    return {
+        "id": i,
+        "name": f"Politician {i}",
+        "position": "Senator",
+        "state": "California",
+        "party_affiliation": "Independent",
+        "estimated_net_worth": Decimal("1234567.89") + i,
+        "last_trade_date": date(2024, 1, 1 + i % 28),
+    }
+
+
+def graph(edges):
+    nodes = [{"type": "person", "ticker": None, **person(0)}]
+    nodes += [
+        {"id": i, "type": "company", "name": f"Company {i}", "ticker": f"C{i}"}
+        for i in range(1, edges + 1)
+    ]
+    return {
+        "center_id": 0,
+        "center_type": "person",
+        "nodes": nodes,
+        "edges": [
+            {
+                "source": 0,
+                "target": i,
+                "type": "stock-holding",
+                "holding_value": Decimal(i * 1000) + Decimal("0.25"),
+                "label": f"${i}K",
+                "status": "active" if i % 3 else "sold",
+            }
+            for i in range(1, edges + 1)
+        ],
+    }
+
+
+def payloads():
+    from src.schemas.company import CompanyResponse
+    from src.schemas.graph import GraphResponse
+    from src.schemas.person import PersonResponse
+    from src.schemas.search import BatchSearchResponse, SearchResponse, SuggestResponse
+
+    search = {
+        "id": "42",
+        "type": "person",
+        "confidence": 0.93,
+        "reasoning": "Exact name match",
+        "alternatives": [
+            {"id": str(i), "type": "company", "name": f"Company {i}", "score": 0.5 + i / 100}
+            for i in range(5)
+        ],
+    }
+    suggest = {
+        "suggestions": [
+            {"id": str(i), "type": "company", "name": f"Company {i}", "ticker": f"C{i}"}
+            for i in range(10)
+        ]
+    }
+    batch = {
+        "results": [
+            {
+                "term": f"term {i}",
+                "found": bool(i % 4),
+                "id": str(i) if i % 4 else None,
+                "type": "person" if i % 4 else None,
+                "name": f"Politician {i}" if i % 4 else None,
+                "confidence": 1.0 if i % 4 else None,
+                "reasoning": "Known entity" if i % 4 else None,
+            }
+            for i in range(500)
+        ]
+    }
+    return [
+        ("/api/search", SearchResponse, search),
+        ("/api/search/suggest", SuggestResponse, suggest),
+        ("/api/search/batch (500)", BatchSearchResponse, batch),
+        ("/api/graph (10 edges)", GraphResponse, graph(10)),
+        ("/api/graph (1k edges)", GraphResponse, graph(1_000)),
+        ("/api/person/{id}", PersonResponse, person(7)),
+        ("/api/company/{id}", CompanyResponse, {"id": 7, "name": "Company 7", "ticker": "C7"}),
+    ]
+
+
+def ops_per_second(fn, seconds):
+    fn()
+    calls, started = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        fn()
+        calls += 1
+    return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API response serialization")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time per endpoint and pipeline")
+    args = parser.parse_args()
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from src.utils.responses import FastJSONResponse
+
+    loop = asyncio.new_event_loop()
+    print(f"{'endpoint':<26} {'default/s':>10} {'fast/s':>10} {'speedup':>8} {'bytes':>8}")
+    for name, model, data in payloads():
+        field = create_response_field(name=f"bench_{model.__name__}", type_=model)
+
+        def default():
+            jsonable = loop.run_until_complete(
+                serialize_response(field=field, response_content=data)
+            )
+            return JSONResponse(jsonable).body
+
+        def fast():
+            return FastJSONResponse(model(**data)).body
+
+        body = default()
+        if fast() != body:
+            raise SystemExit(f"{name}: pipelines produce different JSON")
+        before = ops_per_second(default, args.seconds)
+        after = ops_per_second(fast, args.seconds)
+        print(f"{name:<26} {before:>10.0f} {after:>10.0f} {after / before:>7.1f}x {len(body):>8}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
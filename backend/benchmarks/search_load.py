@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Load test: /api/graph latency while /api/search requests are in flight.
+
+Usage:
+  python benchmarks/search_load.py --base-url http://localhost:8000 \
+      --graph-id 1 --graph-type person --searchers 20 --duration 15
+
+Runs two phases against a live server:
+  1. baseline - only /api/graph requests
+  2. contended - the same /api/graph load while `--searchers` concurrent
+     clients hammer /api/search with terms that go through classification
+
+If classification blocked the event loop, graph p99 in phase 2 would climb to
+roughly the LLM round-trip time. With the async client it should stay flat.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+SEARCH_TERMS = [
+    "Nancy Pelosi",
+    "NVDA",
+    "Lockheed Martin",
+    "Senator Smith",
+    "Acme Holdings",
+    "Robert Jenkins",
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def graph_worker(client: httpx.AsyncClient, params: dict, stop_at: float, out: List[float]):
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        await client.get("/api/graph", params=params)
+        out.append((time.perf_counter() - start) * 1000)
+
+
+async def search_worker(client: httpx.AsyncClient, worker_id: int, stop_at: float, out: List[float]):
+    i = worker_id
+    while time.perf_counter() < stop_at:
+        # Suffix keeps terms distinct so caches in front of the LLM don't short-circuit
+        term = f"{SEARCH_TERMS[i % len(SEARCH_TERMS)]} {i}"
+        i += 1
+        start = time.perf_counter()
+        await client.get("/api/search", params={"q": term})
+        out.append((time.perf_counter() - start) * 1000)
+
+
+async def run_phase(args, searchers: int) -> tuple[List[float], List[float]]:
+    graph_ms: List[float] = []
+    search_ms: List[float] = []
+    stop_at = time.perf_counter() + args.duration
+    params = {"id": args.graph_id, "type": args.graph_type}
+    limits = httpx.Limits(max_connections=args.graph_clients + searchers + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        tasks = [graph_worker(client, params, stop_at, graph_ms) for _ in range(args.graph_clients)]
+        tasks += [search_worker(client, n, stop_at, search_ms) for n in range(searchers)]
+        await asyncio.gather(*tasks)
+    return graph_ms, search_ms
+
+
+def report(label: str, samples: List[float]):
+    if not samples:
+        print(f"{label:<22} no samples")
+        return
+    print(
+        f"{label:<22} n={len(samples):<6} "
+        f"p50={statistics.median(samples):7.2f}ms "
+        f"p95={percentile(samples, 95):7.2f}ms "
+        f"p99={percentile(samples, 99):7.2f}ms"
+    )
+
+
+async def main_async(args):
+    base_graph, _ = await run_phase(args, searchers=0)
+    report("graph (baseline)", base_graph)
+
+    graph_ms, search_ms = await run_phase(args, searchers=args.searchers)
+    report("graph (with search)", graph_ms)
+    report("search", search_ms)
+
+    if base_graph and graph_ms:
+        ratio = percentile(graph_ms, 99) / max(percentile(base_graph, 99), 1e-6)
+        print(f"graph p99 ratio contended/baseline: {ratio:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure /api/graph latency under concurrent /api/search load")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--graph-id", default="1")
+    parser.add_argument("--graph-type", default="person", choices=["person", "company"])
+    parser.add_argument("--graph-clients", type=int, default=4, help="Concurrent /api/graph clients")
+    parser.add_argument("--searchers", type=int, default=20, help="Concurrent /api/search clients in phase 2")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per phase")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
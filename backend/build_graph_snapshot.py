@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Build the shared graph snapshot file served by GRAPH_ENGINE=memory.
+
+Usage (from backend/):
+  python build_graph_snapshot.py --output /dev/shm/graph.snap
+
+Reads politicians, companies and holdings from DATABASE_URL and writes the
+memory-mappable snapshot, replacing any existing file atomically. Workers
+with GRAPH_SNAPSHOT_PATH pointing at the same file pick it up within
+GRAPH_SNAPSHOT_POLL_SECONDS. Run it from cron (with GRAPH_SNAPSHOT_BUILD=false
+on the API) to keep snapshot builds off the serving processes entirely.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+import asyncpg
+
+from src.core.config import settings
+from src.services.graph_snapshot import GraphSnapshot, build_graph_snapshot
+
+
+async def run(args):
+    conn = await asyncpg.connect(settings.DATABASE_URL)
+    try:
+        snap = await build_graph_snapshot(conn)
+    finally:
+        await conn.close()
+    out_dir = os.path.dirname(args.output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    snap.write(args.output)
+    print(
+        f"wrote {args.output}: {len(snap.person_ids)} politicians, "
+        f"{len(snap.company_ids)} companies, {snap.holdings_count} holdings, "
+        f"{os.path.getsize(args.output) / 1e6:.1f} MB, built in {snap.build_seconds:.2f}s"
+    )
+
+    started = time.perf_counter()
+    GraphSnapshot.open(args.output)
+    print(f"mapped back in {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the shared graph snapshot file")
+    parser.add_argument(
+        "--output", "-o", default=settings.GRAPH_SNAPSHOT_PATH, required=not settings.GRAPH_SNAPSHOT_PATH,
+        help="Snapshot path (defaults to GRAPH_SNAPSHOT_PATH)",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Build the shared similarity index file behind /api/person|company/{id}/similar.
+
+Usage (from backend/):
+  python build_similarity_index.py --output /tmp/similarity.idx
+
+Reads holdings from the graph snapshot file at GRAPH_SNAPSHOT_PATH if there
+is one, otherwise from DATABASE_URL, and writes the memory-mappable index,
+replacing any existing file atomically. Workers with SIMILARITY_INDEX_PATH
+pointing at the same file pick it up within SIMILARITY_INDEX_POLL_SECONDS.
+Run it from cron (with SIMILARITY_INDEX_BUILD=false on the API) to keep
+index builds off the serving processes entirely.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+import asyncpg
+
+from src.core.config import settings
+from src.services.graph_snapshot import GraphSnapshot
+from src.services.similarity_index import (
+    SimilarityIndex,
+    compute_similarity_index,
+    fetch_holdings,
+    snapshot_holdings,
+)
+
+
+async def run(args):
+    snapshot_path = settings.GRAPH_SNAPSHOT_PATH
+    if snapshot_path and os.path.exists(snapshot_path):
+        holdings = snapshot_holdings(GraphSnapshot.open(snapshot_path))
+    else:
+        conn = await asyncpg.connect(settings.DATABASE_URL)
+        try:
+            holdings = await fetch_holdings(conn)
+        finally:
+            await conn.close()
+    index = await compute_similarity_index(holdings)
+    out_dir = os.path.dirname(args.output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    index.write(args.output)
+    print(
+        f"wrote {args.output}: {index.entity_count('person')} politicians, "
+        f"{index.entity_count('company')} companies from {index.source}, "
+        f"{os.path.getsize(args.output) / 1e6:.1f} MB, built in {index.build_seconds:.2f}s"
+    )
+
+    started = time.perf_counter()
+    SimilarityIndex.open(args.output)
+    print(f"mapped back in {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the shared similarity index file")
+    parser.add_argument(
+        "--output", "-o", default=settings.SIMILARITY_INDEX_PATH, required=not settings.SIMILARITY_INDEX_PATH,
+        help="Index path (defaults to SIMILARITY_INDEX_PATH)",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Export politicians, companies and holdings to files.
+
+Usage (from backend/):
+  python export_graph.py --output-dir exports/ --format parquet
+  python export_graph.py --output-dir exports/ --state Texas --min-value 100000
+
+Writes one file per table (politicians.csv, companies.csv, holdings.csv, or
+.parquet / .arrows) from DATABASE_URL, streaming each through the same code
+as /api/export, so memory stays flat however large the tables are. The
+filters select a subgraph: matching politicians, their holdings above
+--min-value, and the companies those holdings point to. All tables are read
+in one REPEATABLE READ transaction, so the files agree with each other.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+import asyncpg
+
+from src.core.config import settings
+from src.services.export_service import (
+    EXPORT_FORMATS,
+    EXPORT_TABLES,
+    FILE_EXTENSIONS,
+    export_format_available,
+    stream_export,
+)
+
+
+async def run(args):
+    os.makedirs(args.output_dir, exist_ok=True)
+    conn = await asyncpg.connect(settings.DATABASE_URL)
+    try:
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            for table in args.tables:
+                path = os.path.join(args.output_dir, f"{table}.{FILE_EXTENSIONS[args.format]}")
+                tmp_path = path + ".tmp"
+                started = time.perf_counter()
+                size = 0
+                with open(tmp_path, "wb") as f:
+                    async for chunk in stream_export(
+                        conn,
+                        table,
+                        args.format,
+                        state=args.state,
+                        party=args.party,
+                        min_value=args.min_value,
+                        block_bytes=args.block_bytes,
+                    ):
+                        f.write(chunk)
+                        size += len(chunk)
+                os.replace(tmp_path, path)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"wrote {path}: {size / 1e6:.1f} MB in {elapsed:.1f}s "
+                    f"({size / 1e6 / max(elapsed, 1e-9):.0f} MB/s)"
+                )
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the holdings graph to files")
+    parser.add_argument("--output-dir", "-o", required=True, help="Directory for the exported files")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument(
+        "--tables", nargs="+", choices=EXPORT_TABLES, default=list(EXPORT_TABLES),
+        help="Tables to export (default: all)",
+    )
+    parser.add_argument("--state", help="Only politicians from this state")
+    parser.add_argument("--party", help="Only politicians of this party")
+    parser.add_argument("--min-value", type=float, help="Only holdings with abs(holding_value) >= this")
+    parser.add_argument(
+        "--block-bytes", type=int, default=settings.EXPORT_BLOCK_BYTES,
+        help="CSV bytes per Parquet row group / Arrow batch",
+    )
+    args = parser.parse_args()
+    if not export_format_available(args.format):
+        parser.error(f"{args.format} export requires pyarrow (pip install pyarrow)")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,82 @@ class Settings(BaseSettings):
     APP_ENV: str = "development"
     DB_POOL_MIN_SIZE: int = 1
     DB_POOL_MAX_SIZE: int = 10
+    # Classification (Claude)
+    CLASSIFY_MODEL: str = "claude-3-haiku-20240307"
+    CLASSIFY_TIMEOUT_SECONDS: float = 5.0
+    CLASSIFY_MAX_CONCURRENCY: int = 8
+    # Answer from heuristics if Claude is slower than this (0 = wait for timeout)
+    CLASSIFY_LATENCY_BUDGET_MS: int = 1500
+    CLASSIFY_BREAKER_FAILURE_THRESHOLD: int = 5
+    CLASSIFY_BREAKER_COOLDOWN_SECONDS: float = 30.0
+    # Multi-hop graph expansion caps
+    GRAPH_MAX_NODES: int = 500
+    GRAPH_MAX_EDGES: int = 2000
+    GRAPH_HOP_FANOUT: int = 25  # edges followed per node per hop
+    # Have Postgres render depth-1 /api/graph responses as JSON
+    GRAPH_SQL_JSON: bool = False
+    # Rows per cursor fetch (one NDJSON chunk) when streaming /api/graph
+    GRAPH_STREAM_BATCH_ROWS: int = 1000
+    # NDJSON streams per worker, each holding a pool connection while the
+    # client reads; further NDJSON requests are built in full instead
+    GRAPH_STREAM_MAX_CONCURRENT: int = 4
+    # Bulk export (/api/export): concurrent exports, CSV bytes per Parquet/Arrow block
+    EXPORT_MAX_CONCURRENT: int = 2
+    EXPORT_BLOCK_BYTES: int = 8 * 1024 * 1024
+    # /api/person/{id}/holdings and /api/company/{id}/holders page sizes
+    HOLDINGS_PAGE_SIZE: int = 50
+    HOLDINGS_PAGE_MAX: int = 500
+    # /api/graph/path search limits
+    GRAPH_PATH_MAX_HOPS: int = 6
+    GRAPH_PATH_TIME_BUDGET_MS: int = 2000
+    GRAPH_PATH_MAX_FRONTIER: int = 50000  # nodes in one BFS level
+    # "postgres" queries per request; "memory" serves graph/person/company
+    # from an in-process snapshot
+    GRAPH_ENGINE: str = "postgres"
+    GRAPH_SNAPSHOT_REFRESH_SECONDS: float = 600.0
+    GRAPH_SNAPSHOT_LISTEN: bool = True  # rebuild on NOTIFY graph_changed
+    GRAPH_SNAPSHOT_NOTIFY_DEBOUNCE_SECONDS: float = 5.0
+    # Share one memory-mapped snapshot file across worker processes
+    GRAPH_SNAPSHOT_PATH: Optional[str] = None  # e.g. /dev/shm/graph.snap
+    GRAPH_SNAPSHOT_POLL_SECONDS: float = 2.0  # how often workers check for a new file
+    GRAPH_SNAPSHOT_BUILD: bool = True  # False if build_graph_snapshot.py owns the file
+    # Run person/company lookups concurrently with classification by default
+    SEARCH_SPECULATIVE: bool = False
+    # Local n-gram classifier consulted before Claude
+    LOCAL_CLASSIFIER_ENABLED: bool = True
+    LOCAL_CLASSIFIER_PATH: Optional[str] = None  # gzipped JSON model file
+    LOCAL_CLASSIFIER_TRAIN_ON_STARTUP: bool = True
+    LOCAL_CLASSIFIER_MIN_CONFIDENCE: float = 0.95
+    # Classification cache
+    CLASSIFY_CACHE_SIZE: int = 10000
+    CLASSIFY_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    CLASSIFY_CACHE_PATH: Optional[str] = None  # SQLite file, e.g. /tmp/classify.db
+    # Read-through cache of person/company rows and first holdings pages
+    ENTITY_CACHE_SIZE: int = 10000  # rows per entity type; 0 disables
+    ENTITY_CACHE_HOLDINGS_SIZE: int = 1000  # holdings pages
+    ENTITY_CACHE_TTL_SECONDS: float = 300.0
+    ENTITY_CACHE_LISTEN: bool = True  # invalidate on NOTIFY entity_changed
+    # In-memory entity index (search fast path)
+    ENTITY_INDEX_ENABLED: bool = True
+    ENTITY_INDEX_REFRESH_SECONDS: float = 60.0  # incremental (new rows only)
+    ENTITY_INDEX_FULL_RELOAD_EVERY: int = 10  # full rebuild every N refreshes (0 = never)
+    # Precomputed co-holding similarity (similar politicians/companies).
+    # Unset = on when no worker has to scan holdings for its own copy: built
+    # from the graph snapshot (GRAPH_ENGINE=memory) or shared through
+    # SIMILARITY_INDEX_PATH. True also lets each worker read Postgres itself.
+    SIMILARITY_INDEX_ENABLED: Optional[bool] = None
+    # One memory-mapped index file per host, built by one worker ("" = per worker)
+    SIMILARITY_INDEX_PATH: Optional[str] = "/tmp/similarity.idx"
+    SIMILARITY_INDEX_POLL_SECONDS: float = 10.0  # how often workers check for a new file
+    SIMILARITY_INDEX_BUILD: bool = True  # False if build_similarity_index.py owns the file
+    SIMILARITY_TOP_K: int = 50
+    # Companies/politicians with more holders than this don't seed candidates
+    SIMILARITY_MAX_FEATURE_DEGREE: int = 2000
+    SIMILARITY_REFRESH_SECONDS: float = 3600.0
+    # Shared Anthropic HTTP connection pool
+    ANTHROPIC_MAX_CONNECTIONS: int = 20
+    ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    ANTHROPIC_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
 
     class Config:
         env_file = ".env"
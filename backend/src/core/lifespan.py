@@ -2,11 +2,34 @@
 
 from contextlib import asynccontextmanager
 from src.db.pool import init_pool, close_pool
+from src.integrations.anthropic_client import init_anthropic, close_anthropic
+from src.services.classification_cache import (
+    init_classification_cache,
+    close_classification_cache,
+)
+from src.services.entity_cache import start_entity_cache, stop_entity_cache
+from src.services.entity_index import start_entity_index, stop_entity_index
+from src.services.graph_snapshot import start_graph_engine, stop_graph_engine
+from src.services.local_classifier import start_local_classifier
+from src.services.similarity_index import start_similarity_index, stop_similarity_index
 
 
 @asynccontextmanager
 async def lifespan(app):
     """Manage application lifespan - initialize and cleanup resources."""
     await init_pool()
+    await init_anthropic()
+    init_classification_cache()
+    await start_entity_index()
+    await start_entity_cache()
+    await start_local_classifier()
+    await start_graph_engine()
+    await start_similarity_index()
     yield
+    await stop_similarity_index()
+    await stop_graph_engine()
+    await stop_entity_cache()
+    await stop_entity_index()
+    close_classification_cache()
+    await close_anthropic()
     await close_pool()
@@ -30,6 +30,11 @@ async def close_pool():
         logger.info("Database pool closed")
 
 
+def get_pool():
+    """Get the database pool for work outside a request (startup, background tasks)."""
+    return _db_pool
+
+
 async def get_db():
     """Get a database connection from the pool."""
     global _db_pool
@@ -1,14 +1,93 @@
 """Anthropic Claude client integration."""
 
 import anthropic
+import httpx
 import logging
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_anthropic_client = None
+
+# Counters for HTTP connection reuse on the shared client
+_metrics = {
+    "requests": 0,
+    "connections_opened": 0,
+}
+
+
+async def _trace(event_name: str, info: dict):
+    """httpcore trace hook - counts every fresh TCP connection."""
+    if event_name == "connection.connect_tcp.complete":
+        _metrics["connections_opened"] += 1
+
+
+async def _on_request(request: httpx.Request):
+    """httpx request hook - counts requests and attaches the trace hook."""
+    _metrics["requests"] += 1
+    request.extensions["trace"] = _trace
+
+
+async def init_anthropic():
+    """Initialize the shared Anthropic client with a keep-alive connection pool."""
+    global _anthropic_client
+    if _anthropic_client or not settings.ANTHROPIC_API_KEY:
+        return
+    http_client = anthropic.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=settings.ANTHROPIC_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.ANTHROPIC_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        event_hooks={"request": [_on_request]},
+    )
+    _anthropic_client = anthropic.AsyncAnthropic(
+        api_key=settings.ANTHROPIC_API_KEY,
+        timeout=settings.CLASSIFY_TIMEOUT_SECONDS,
+        http_client=http_client,
+    )
+    logger.info("Anthropic client initialized")
+
+
+async def close_anthropic():
+    """Close the shared Anthropic client and its connection pool."""
+    global _anthropic_client
+    if _anthropic_client:
+        await _anthropic_client.close()
+        _anthropic_client = None
+        logger.info("Anthropic client closed")
+
 
 def get_anthropic():
-    """Get Anthropic client if API key is configured."""
-    if not settings.ANTHROPIC_API_KEY:
-        return None
-    return anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+    """Get the shared async Anthropic client, or None if not configured."""
+    return _anthropic_client
+
+
+def get_anthropic_metrics() -> dict:
+    """
+    Connection pool metrics for the shared Anthropic client.
+
+    Returns:
+        dict with request/connection counters, reuse ratio and the number
+        of connections currently held by the pool
+    """
+    requests = _metrics["requests"]
+    opened = _metrics["connections_opened"]
+    open_connections = None
+    if _anthropic_client:
+        # httpx doesn't expose pool size publicly; read it defensively
+        transport = getattr(_anthropic_client._client, "_transport", None)
+        pool = getattr(transport, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            open_connections = len(connections)
+    return {
+        "enabled": _anthropic_client is not None,
+        "requests": requests,
+        "connections_opened": opened,
+        "connection_reuse_ratio": (
+            round(1 - opened / requests, 4) if requests else None
+        ),
+        "open_connections": open_connections,
+        "max_connections": settings.ANTHROPIC_MAX_CONNECTIONS,
+    }
@@ -2,7 +2,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.core.lifespan import lifespan
-from src.routers import search, graph, person, company
+from src.routers import search, graph, person, company, export, metrics
 
 app = FastAPI(
     title="Web Weyes - Connections API",
@@ -36,4 +36,6 @@ app.include_router(search.router, prefix="/api/search", tags=["search"])
 app.include_router(graph.router, prefix="/api/graph", tags=["graph"])
 app.include_router(person.router, prefix="/api/person", tags=["person"])
 app.include_router(company.router, prefix="/api/company", tags=["company"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
 
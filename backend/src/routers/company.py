@@ -1,29 +1,193 @@
 """Company router."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from asyncpg import Connection
-from src.db.pool import get_db
-from src.services.company_service import get_company_by_id
-from src.schemas.company import CompanyResponse
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from src.core.config import settings
+from src.db.pool import get_pool
+from src.services.company_service import get_company_politicians
+from src.services.entity_cache import (
+    get_cached_companies,
+    get_cached_company,
+    get_cached_company_holders,
+)
+from src.services.graph_snapshot import get_graph_snapshot
+from src.services.similarity_index import get_similar_entities, similarity_index_ready
+from src.schemas.common import MAX_BATCH_IDS, MAX_ENTITY_ID, EntityIdsRequest
+from src.schemas.company import (
+    CompanyBatchItem,
+    CompanyBatchResponse,
+    CompanyHolder,
+    CompanyHoldersResponse,
+    CompanyResponse,
+)
+from src.schemas.similarity import SimilarResponse
+from src.utils.cursor import decode_cursor, encode_cursor
+from src.utils.responses import FastJSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
+
+
+def _company_response(row) -> CompanyResponse:
+    return CompanyResponse(
+        id=row["id"],
+        name=row["name"],
+        ticker=row["ticker"],
+    )
+
+
+async def _company_batch(ids: List[int]) -> FastJSONResponse:
+    """Look up `ids` in one go and answer in request order."""
+    snapshot = get_graph_snapshot()
+    if snapshot is not None:
+        rows = {}
+        for entity_id in set(ids):
+            row = snapshot.get_company(entity_id)
+            if row:
+                rows[entity_id] = row
+    else:
+        rows = await get_cached_companies(ids)
+
+    return FastJSONResponse(
+        CompanyBatchResponse(
+            results=[
+                CompanyBatchItem(
+                    id=entity_id,
+                    found=entity_id in rows,
+                    company=_company_response(rows[entity_id]) if entity_id in rows else None,
+                )
+                for entity_id in ids
+            ]
+        )
+    )
+
+
+@router.get("", response_model=CompanyBatchResponse)
+async def get_companies(
+    ids: str = Query(..., pattern=r"^\d+(,\d+)*$", description="Comma-separated company IDs"),
+):
+    """
+    Get metadata for several companies in one request.
+
+    One query however many ids are asked for (at most MAX_BATCH_IDS).
+    Results follow the order of `ids`, duplicates included; ids with no
+    company come back with found=false. Use POST /batch for long lists.
+    """
+    id_strings = ids.split(",")
+    if len(id_strings) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    # Leading zeros off and length checked first: int() refuses more than 4300 digits
+    digits = [entity_id.lstrip("0") or "0" for entity_id in id_strings]
+    if any(len(d) > 19 or int(d) > MAX_ENTITY_ID for d in digits):
+        raise HTTPException(status_code=422, detail=f"Ids must be at most {MAX_ENTITY_ID}")
+    id_list = [int(d) for d in digits]
+    return await _company_batch(id_list)
+
+
+@router.post("/batch", response_model=CompanyBatchResponse)
+async def get_companies_batch(
+    body: EntityIdsRequest,
+):
+    """
+    Get metadata for several companies, ids in the request body.
+
+    Same as GET with `ids`, for lists too long for a URL.
+    """
+    return await _company_batch(body.ids)
 
 
 @router.get("/{id}", response_model=CompanyResponse)
 async def get_company(
     id: str,
-    db: Connection = Depends(get_db),
 ):
     """
     Get metadata for a specific company.
     """
-    row = await get_company_by_id(id, db)
+    snapshot = get_graph_snapshot()
+    if snapshot is not None:
+        row = snapshot.get_company(int(id)) if id.isdigit() else None
+    else:
+        row = await get_cached_company(int(id)) if id.isdigit() else None
 
     if not row:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    return {
-        "id": row["id"],
-        "name": row["name"],
-        "ticker": row["ticker"],
-    }
+    return FastJSONResponse(_company_response(row))
+
+
+@router.get("/{id}/holders", response_model=CompanyHoldersResponse)
+async def get_holders(
+    id: str,
+    limit: int = Query(settings.HOLDINGS_PAGE_SIZE, ge=1, le=settings.HOLDINGS_PAGE_MAX),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+):
+    """
+    Get one page of the politicians holding a company, largest holding first.
+
+    Pages are keyset-paginated on (holding_value, holding id): pass the
+    previous page's `next_cursor` as `cursor` to continue. Every page is
+    one index range scan, so deep pages cost the same as the first.
+    """
+    if not id.isdigit():
+        raise HTTPException(status_code=404, detail="Company not found")
+    # One extra row tells whether there is a next page
+    if cursor is None:
+        rows = await get_cached_company_holders(int(id), limit + 1)
+    else:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        async with get_pool().acquire() as db:
+            rows = await get_company_politicians(id, db, limit + 1, after)
+
+    if not rows and cursor is None and not await get_cached_company(int(id)):
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page[-1]["holding_value"], page[-1]["holding_id"])
+    return FastJSONResponse(
+        CompanyHoldersResponse(
+            company_id=int(id),
+            holders=[
+                CompanyHolder(
+                    holding_id=row["holding_id"],
+                    id=row["id"],
+                    name=row["name"],
+                    position=row["position"],
+                    state=row["state"],
+                    party_affiliation=row["party_affiliation"],
+                    estimated_net_worth=row["estimated_net_worth"],
+                    last_trade_date=row["last_trade_date"],
+                    holding_value=row["holding_value"],
+                )
+                for row in page
+            ],
+            next_cursor=next_cursor,
+        )
+    )
+
+
+@router.get("/{id}/similar", response_model=SimilarResponse)
+async def get_similar_companies(
+    id: str,
+    metric: str = Query("jaccard", pattern="^(jaccard|cosine)$", description="Similarity metric"),
+    limit: int = Query(10, ge=1, le=settings.SIMILARITY_TOP_K),
+):
+    """
+    Get the companies most similar to this one by shared holdings.
+
+    Compares the politicians holding each company; `cosine` weights each
+    holding by its value, `jaccard` only counts overlap. Served from a
+    precomputed index.
+    """
+    if not similarity_index_ready():
+        raise HTTPException(status_code=503, detail="Similarity index not built yet")
+    results = get_similar_entities("company", int(id), metric, limit) if id.isdigit() else None
+    if results is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    return FastJSONResponse(
+        SimilarResponse(id=int(id), type="company", metric=metric, results=results)
+    )
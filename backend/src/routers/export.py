@@ -0,0 +1,76 @@
+"""Bulk export router."""
+
+from contextlib import aclosing
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Path, Query
+from src.core.config import settings
+from src.db.pool import get_pool
+from src.services.export_service import (
+    FILE_EXTENSIONS,
+    MEDIA_TYPES,
+    export_format_available,
+    release_export_slot,
+    reserve_export_slot,
+    stream_export,
+)
+from src.utils.responses import ClosingStreamingResponse, prepend
+
+router = APIRouter()
+
+
+async def _export_chunks(table: str, format: str, **filters):
+    """Export chunks; gives back the caller's export slot when done or closed."""
+    try:
+        async with get_pool().acquire() as db:
+            chunks = stream_export(
+                db, table, format, block_bytes=settings.EXPORT_BLOCK_BYTES, **filters
+            )
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    yield chunk
+    finally:
+        release_export_slot()
+
+
+@router.get("/{table}")
+async def export_table(
+    table: str = Path(..., pattern="^(politicians|companies|holdings)$"),
+    format: str = Query("csv", pattern="^(csv|parquet|arrow)$", description="Output format"),
+    state: Optional[str] = Query(None, description="Only politicians from this state"),
+    party: Optional[str] = Query(None, description="Only politicians of this party"),
+    min_value: Optional[float] = Query(
+        None, ge=0, description="Only holdings with abs(holding_value) >= this"
+    ),
+):
+    """
+    Download a whole table, or its share of a filtered subgraph.
+
+    Filters apply across tables: the politicians matching state/party,
+    their holdings worth at least min_value, and the companies those
+    holdings point to. Export all three tables with the same filters to
+    get a consistent subgraph.
+
+    CSV (with a header row) is produced by Postgres COPY and relayed as it
+    arrives. Parquet (zstd) and Arrow IPC stream are transcoded from it in
+    blocks of EXPORT_BLOCK_BYTES and need pyarrow installed. Memory use is
+    constant regardless of table size. At most EXPORT_MAX_CONCURRENT
+    exports run per worker, each holding one database connection.
+    """
+    if not export_format_available(format):
+        raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow")
+    # Taken before any await; _export_chunks releases it
+    if not reserve_export_slot(settings.EXPORT_MAX_CONCURRENT):
+        raise HTTPException(status_code=503, detail="Too many exports running, try again later")
+
+    chunks = _export_chunks(table, format, state=state, party=party, min_value=min_value)
+    # Read ahead so a failing query is an error status, not a truncated file.
+    # Starting the generator here also enters its try/finally, so the slot
+    # is released on every path from now on.
+    first = await chunks.__anext__()
+    return ClosingStreamingResponse(
+        prepend(first, chunks),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{table}.{FILE_EXTENSIONS[format]}"'
+        },
+    )
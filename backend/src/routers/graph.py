@@ -1,68 +1,308 @@
 """Graph visualization router."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from asyncpg import Connection
-from src.db.pool import get_db
-from src.services.graph_service import get_entity_graph
-from src.schemas.graph import GraphResponse, GraphNode, GraphEdge
+import asyncio
+from contextlib import aclosing
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from src.core.config import settings
+from src.db.pool import get_pool
+from src.services.graph_service import (
+    get_entity_graph,
+    get_entity_graph_json,
+    get_entity_graph_multi_hop,
+    stream_entity_graph,
+)
+from src.services.graph_snapshot import get_graph_snapshot
+from src.services.path_service import FrontierTooLarge, find_connection_path
+from src.schemas.graph import GraphEdge, GraphNode, GraphResponse
+from src.utils.responses import (
+    ClosingStreamingResponse,
+    FastJSONResponse,
+    MsgpackResponse,
+    negotiate_media_type,
+    prepend,
+)
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
+# NDJSON streams in this worker holding a pool connection until the client
+# has read them; capped by GRAPH_STREAM_MAX_CONCURRENT
+_open_streams = 0
 
-@router.get("", response_model=GraphResponse)
+
+def _edge_response(e: dict) -> dict:
+    return {
+        "source": e["source"],
+        "target": e["target"],
+        "type": e["edge_type"],
+        "holding_value": e["ownership_value"],
+        "label": e.get("label", e["edge_type"]),
+        "status": e.get("status", "active"),
+    }
+
+
+def _graph_columns(center_id: int, center_type: str, nodes: list, edges: list) -> dict:
+    """GraphResponse as one array per GraphNode/GraphEdge field."""
+    return {
+        "center_id": center_id,
+        "center_type": center_type,
+        "nodes": {field: [n.get(field) for n in nodes] for field in GraphNode.model_fields},
+        "edges": {field: [e[field] for e in edges] for field in GraphEdge.model_fields},
+    }
+
+
+def _ndjson_lines(nodes: list, edges: list) -> bytes:
+    """One {"node": ...} / {"edge": ...} line per node and edge."""
+    lines = [f'{{"node":{GraphNode(**n).model_dump_json()}}}\n' for n in nodes]
+    lines += [f'{{"edge":{GraphEdge(**e).model_dump_json()}}}\n' for e in edges]
+    return "".join(lines).encode()
+
+
+def _ndjson_header(center_id: int, center_type: str) -> bytes:
+    return f'{{"center_id":{center_id},"center_type":"{center_type}"}}\n'.encode()
+
+
+def _ndjson_footer(node_count: int, edge_count: int) -> bytes:
+    return f'{{"end":{{"nodes":{node_count},"edges":{edge_count}}}}}\n'.encode()
+
+
+async def _graph_ndjson_chunks(id: str, type: str, limit: Optional[int]):
+    """NDJSON chunks for a depth-1 graph, one per cursor batch; frees the caller's stream slot."""
+    global _open_streams
+    node_count = edge_count = 0
+    try:
+        async with get_pool().acquire() as db:
+            batches = stream_entity_graph(
+                id, type, db, limit=limit, batch_rows=settings.GRAPH_STREAM_BATCH_ROWS
+            )
+            async with aclosing(batches):
+                async for nodes_rows, edges_rows in batches:
+                    edges = [_edge_response(e) for e in edges_rows]
+                    chunk = _ndjson_lines(nodes_rows, edges)
+                    if node_count == 0:
+                        chunk = _ndjson_header(nodes_rows[0]["id"], nodes_rows[0]["type"]) + chunk
+                    node_count += len(nodes_rows)
+                    edge_count += len(edges)
+                    yield chunk
+    finally:
+        _open_streams -= 1
+    if node_count:
+        yield _ndjson_footer(node_count, edge_count)
+
+
+# application/x-msgpack is the older, unregistered name some clients still send
+_MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+_NDJSON_TYPE = "application/x-ndjson"
+_GRAPH_MEDIA_TYPES = ("application/json", *_MSGPACK_TYPES, _NDJSON_TYPE)
+
+
+@router.get(
+    "",
+    response_model=GraphResponse,
+    responses={200: {"content": {"application/msgpack": {}, _NDJSON_TYPE: {}}}},
+)
 async def graph(
     id: str = Query(..., description="Entity ID"),
     type: str = Query(..., pattern="^(person|company)$", description="Entity type"),
-    db: Connection = Depends(get_db),
+    depth: int = Query(1, ge=1, le=3, description="Number of hops from the entity"),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=10000,
+        description="Top-k neighbors by holding value; the rest are "
+        "summarised in one aggregate node (depth=1 only)",
+    ),
+    accept: Optional[str] = Header(None),
 ):
     """
     Get graph data for visualization centered on an entity.
 
-    Returns nodes and edges in a D3-friendly format.
+    Returns nodes and edges in a D3-friendly format. With depth > 1 the
+    neighborhood is expanded in a single query, capped at GRAPH_MAX_NODES
+    nodes and GRAPH_MAX_EDGES edges.
+
+    With `limit`, high-degree entities return only their largest holdings
+    plus an aggregate "N others" node.
+
+    With GRAPH_ENGINE=memory the graph comes from the in-process snapshot
+    and no database connection is used. Otherwise, with GRAPH_SQL_JSON,
+    depth-1 graphs are rendered to JSON by Postgres and passed through
+    untouched.
+
+    JSON is the default. Clients sending `Accept: application/msgpack` get
+    the same graph as MessagePack in columnar form: `nodes` and `edges`
+    map each GraphNode/GraphEdge field to an array with one entry per
+    node/edge (null where a field does not apply). Decimals are encoded
+    as floats and dates as ISO 8601 strings.
+
+    With `Accept: application/x-ndjson` the graph is sent as
+    newline-delimited JSON: a {"center_id", "center_type"} line, one
+    {"node": GraphNode} or {"edge": GraphEdge} line per node and edge, and
+    a closing {"end": {"nodes": n, "edges": m}} line (missing if the
+    stream was cut short). Depth-1 graphs served from Postgres are
+    streamed from a server-side cursor, GRAPH_STREAM_BATCH_ROWS rows per
+    chunk, so clients can render while the query runs and the API never
+    holds the whole neighborhood in memory. A stream keeps its pool
+    connection until the client has read it, so at most
+    GRAPH_STREAM_MAX_CONCURRENT run per worker; past that, NDJSON is built
+    in full and sent like the other formats.
     """
-    nodes_rows, edges_rows = await get_entity_graph(id, type, db)
+    media_type = negotiate_media_type(accept, _GRAPH_MEDIA_TYPES)
+    headers = {"Vary": "Accept"}
+
+    global _open_streams
+    snapshot = get_graph_snapshot()
+    stream = (
+        snapshot is None
+        and depth == 1
+        and media_type == _NDJSON_TYPE
+        and _open_streams < settings.GRAPH_STREAM_MAX_CONCURRENT
+    )
+    if stream:
+        # Taken before any await; _graph_ndjson_chunks gives it back
+        _open_streams += 1
+        chunks = _graph_ndjson_chunks(id, type, limit)
+        # Starting the generator enters its try/finally, so the slot is
+        # released on every path from here on
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            raise HTTPException(status_code=404, detail="Entity or graph not found")
+        return ClosingStreamingResponse(
+            prepend(first, chunks), media_type=_NDJSON_TYPE, headers=headers
+        )
+
+    sql_json = settings.GRAPH_SQL_JSON and media_type == "application/json"
+    if snapshot is None and depth == 1 and sql_json:
+        async with get_pool().acquire() as db:
+            body = await get_entity_graph_json(id, type, db, limit=limit)
+        if body is None:
+            raise HTTPException(status_code=404, detail="Entity or graph not found")
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    if snapshot is not None:
+        entity_id = int(id) if id.isdigit() else -1
+        if depth == 1:
+            nodes_rows, edges_rows = snapshot.entity_graph(entity_id, type, limit=limit)
+        else:
+            nodes_rows, edges_rows = snapshot.entity_graph_multi_hop(
+                entity_id,
+                type,
+                depth=depth,
+                max_nodes=settings.GRAPH_MAX_NODES,
+                max_edges=settings.GRAPH_MAX_EDGES,
+                fanout=settings.GRAPH_HOP_FANOUT,
+            )
+    else:
+        async with get_pool().acquire() as db:
+            if depth == 1:
+                nodes_rows, edges_rows = await get_entity_graph(id, type, db, limit=limit)
+            else:
+                nodes_rows, edges_rows = await get_entity_graph_multi_hop(
+                    id,
+                    type,
+                    db,
+                    depth=depth,
+                    max_nodes=settings.GRAPH_MAX_NODES,
+                    max_edges=settings.GRAPH_MAX_EDGES,
+                    fanout=settings.GRAPH_HOP_FANOUT,
+                )
 
     if not nodes_rows:
         raise HTTPException(status_code=404, detail="Entity or graph not found")
 
-    # Format nodes
-    nodes = []
-    for row in nodes_rows:
-        if "name" in row:
-            node = GraphNode(
-                id=row["id"],
-                type=row["type"],
-                name=row["name"],
-                position=row.get("position"),
-                state=row.get("state"),
-                party_affiliation=row.get("party_affiliation"),
-                estimated_net_worth=row.get("estimated_net_worth"),
-                last_trade_date=row.get("last_trade_date"),
-                ticker=row.get("ticker"),
-            )
-            nodes.append(node)
-
-    # Format edges
-    edges = []
-    for e in edges_rows:
-        edge = GraphEdge(
-            source=e["source"],
-            target=e["target"],
-            type=e["edge_type"],
-            holding_value=e["ownership_value"],
-            label=e.get("edge_type"),
-            status=e.get("status", "active"),
-        )
-        edges.append(edge)
+    # Plain dicts: the NDJSON and MessagePack encoders write them as they are,
+    # and GraphResponse below validates them once for JSON
+    nodes = [row for row in nodes_rows if "name" in row]
+    edges = [_edge_response(e) for e in edges_rows]
 
     # Find center node
     center_node = nodes[0] if nodes else None
     if not center_node:
         raise HTTPException(status_code=404, detail="Center node not found")
 
-    return {
-        "center_id": center_node.id,
-        "center_type": center_node.type,
-        "nodes": nodes,
-        "edges": edges,
-    }
+    if media_type == _NDJSON_TYPE:
+        body = (
+            _ndjson_header(center_node["id"], center_node["type"])
+            + _ndjson_lines(nodes, edges)
+            + _ndjson_footer(len(nodes), len(edges))
+        )
+        return Response(content=body, media_type=_NDJSON_TYPE, headers=headers)
+    if media_type in _MSGPACK_TYPES:
+        return MsgpackResponse(
+            _graph_columns(center_node["id"], center_node["type"], nodes, edges),
+            headers=headers,
+        )
+    return FastJSONResponse(
+        GraphResponse(
+            center_id=center_node["id"],
+            center_type=center_node["type"],
+            nodes=nodes,
+            edges=edges,
+        ),
+        headers=headers,
+    )
+
+
+@router.get("/path", response_model=GraphResponse)
+async def graph_path(
+    from_id: str = Query(..., alias="from", description="Start entity ID"),
+    from_type: str = Query(..., pattern="^(person|company)$", description="Start entity type"),
+    to_id: str = Query(..., alias="to", description="End entity ID"),
+    to_type: str = Query(..., pattern="^(person|company)$", description="End entity type"),
+    max_hops: int = Query(
+        settings.GRAPH_PATH_MAX_HOPS, ge=1, le=12, description="Maximum path length in edges"
+    ),
+    weighted: bool = Query(
+        False, description="Among equally short paths, prefer larger holdings"
+    ),
+):
+    """
+    Get the shortest connection between two entities.
+
+    Runs a bidirectional BFS over the politician-company holdings graph and
+    returns just the path (nodes in path order, one edge per hop) in the
+    same shape as /api/graph, centered on the start entity.
+
+    The search stops after GRAPH_PATH_TIME_BUDGET_MS or when one BFS level
+    exceeds GRAPH_PATH_MAX_FRONTIER nodes.
+    """
+    if not from_id.isdigit() or not to_id.isdigit():
+        raise HTTPException(status_code=404, detail="Entity not found")
+    source = (from_type, int(from_id))
+    target = (to_type, int(to_id))
+
+    snapshot = get_graph_snapshot()
+    kwargs = dict(
+        max_hops=max_hops,
+        time_budget=settings.GRAPH_PATH_TIME_BUDGET_MS / 1000,
+        weighted=weighted,
+        max_frontier=settings.GRAPH_PATH_MAX_FRONTIER,
+    )
+    try:
+        if snapshot is not None:
+            found = await find_connection_path(source, target, snapshot=snapshot, **kwargs)
+        else:
+            async with get_pool().acquire() as db:
+                found = await find_connection_path(source, target, db=db, **kwargs)
+    except (asyncio.TimeoutError, FrontierTooLarge):
+        raise HTTPException(
+            status_code=504, detail="Path search exceeded its budget; try fewer hops"
+        )
+
+    if not found:
+        if source == target:
+            raise HTTPException(status_code=404, detail="Entity not found")
+        raise HTTPException(
+            status_code=404, detail=f"No connection within {max_hops} hops"
+        )
+
+    nodes, edges = found
+    return FastJSONResponse(
+        GraphResponse(
+            center_id=source[1],
+            center_type=source[0],
+            nodes=nodes,
+            edges=[_edge_response(e) for e in edges],
+        )
+    )
@@ -0,0 +1,32 @@
+"""Runtime metrics router."""
+
+from fastapi import APIRouter
+from src.integrations.anthropic_client import get_anthropic_metrics
+from src.services.classification_cache import get_classification_cache_metrics
+from src.services.classification_service import get_classifier_metrics
+from src.services.entity_cache import get_entity_cache_metrics
+from src.services.entity_index import get_entity_index_metrics
+from src.services.export_service import get_export_metrics
+from src.services.graph_snapshot import get_graph_engine_metrics
+from src.services.local_classifier import get_local_classifier_metrics
+from src.services.similarity_index import get_similarity_index_metrics
+
+router = APIRouter()
+
+
+@router.get("")
+async def metrics():
+    """
+    Get in-process runtime metrics for this worker.
+    """
+    return {
+        "anthropic": get_anthropic_metrics(),
+        "classifier": get_classifier_metrics(),
+        "local_classifier": get_local_classifier_metrics(),
+        "classification_cache": get_classification_cache_metrics(),
+        "entity_index": get_entity_index_metrics(),
+        "entity_cache": get_entity_cache_metrics(),
+        "graph_engine": get_graph_engine_metrics(),
+        "similarity_index": get_similarity_index_metrics(),
+        "export": get_export_metrics(),
+    }
@@ -1,30 +1,86 @@
 """Search router."""
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Query
-from asyncpg import Connection
-from src.db.pool import get_db
-from src.services.classification_service import classify_search_term
-from src.services.search_service import resolve_entity_id_by_search
-from src.schemas.search import SearchResponse
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from src.core.config import settings
+from src.db.pool import get_pool
+from src.services.classification_service import (
+    classify_search_term,
+    classify_search_terms,
+)
+from src.services.entity_index import lookup_entity, suggest_entities
+from src.services.search_service import (
+    resolve_exact_batch,
+    resolve_speculatively,
+    search_best_candidates_batch,
+    search_entity_candidates,
+)
+from src.schemas.search import (
+    BatchSearchRequest,
+    BatchSearchResponse,
+    SearchResponse,
+    SuggestResponse,
+)
+from src.utils.responses import FastJSONResponse
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 
 @router.get("", response_model=SearchResponse)
 async def search(
     q: str = Query(..., description="Search term (person or company)"),
-    db: Connection = Depends(get_db),
+    alternatives: int = Query(
+        0, ge=0, le=20, description="Also return up to N runner-up matches"
+    ),
+    speculative: Optional[bool] = Query(
+        None,
+        description="Look up both entity types while classifying "
+        "(defaults to SEARCH_SPECULATIVE)",
+    ),
 ):
     """
     Search for entities and return canonical ID and type.
 
-    Uses AI to classify the search term, then searches the database
-    to return the entity's ID and type.
+    Exact tickers and names are answered from the in-memory entity index.
+    Otherwise uses AI to classify the search term, then fuzzy-searches the
+    database and returns the best-ranked entity's ID and type.
     """
     logger.info(f"🔍 Search request for: '{q}'")
-    
+
+    known = lookup_entity(q)
+    if known:
+        logger.info(f"⚡ Index hit: ID={known['id']}, type={known['type']}")
+        return FastJSONResponse(
+            SearchResponse(
+                id=known["id"],
+                type=known["type"],
+                confidence=1.0,
+                reasoning=known["reasoning"],
+            )
+        )
+
+    if speculative is None:
+        speculative = settings.SEARCH_SPECULATIVE
+    if speculative:
+        result = await resolve_speculatively(q, limit=alternatives + 1)
+        if not result:
+            logger.warning(f"❌ No match found for search term: '{q}'")
+            raise HTTPException(status_code=404, detail="Entity not found")
+        candidates = result["candidates"]
+        match = candidates[0]
+        logger.info(f"✅ Match found: ID={match['id']}, type={match['type']}")
+        return FastJSONResponse(
+            SearchResponse(
+                id=match["id"],
+                type=match["type"],
+                confidence=result["confidence"],
+                reasoning=result["reasoning"],
+                alternatives=candidates[1:] if alternatives else None,
+            )
+        )
+
     classification = await classify_search_term(q)
     logger.info(
         f"Classification: {classification['type']} "
@@ -32,17 +88,105 @@ async def search(
         f"reasoning: {classification['reasoning']})"
     )
     
-    match = await resolve_entity_id_by_search(q, db, classification['type'])
-    
-    if not match:
+    # Acquired only now: index hits need no connection, and none is held
+    # while the classifier runs
+    async with get_pool().acquire() as db:
+        candidates = await search_entity_candidates(
+            q, db, classification["type"], limit=alternatives + 1
+        )
+
+    if not candidates:
         logger.warning(f"❌ No match found for search term: '{q}'")
         raise HTTPException(status_code=404, detail="Entity not found")
 
+    match = candidates[0]
     logger.info(f"✅ Match found: ID={match['id']}, type={match['type']}")
-    
-    return {
-        "id": match["id"],
-        "type": match["type"],
-        "confidence": classification["confidence"],
-        "reasoning": classification["reasoning"],
-    }
+
+    return FastJSONResponse(
+        SearchResponse(
+            id=match["id"],
+            type=match["type"],
+            confidence=classification["confidence"],
+            reasoning=classification["reasoning"],
+            alternatives=candidates[1:] if alternatives else None,
+        )
+    )
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum suggestions"),
+):
+    """
+    Typeahead suggestions for politician names, company names and tickers.
+
+    Served entirely from the in-memory prefix index - no database or AI call.
+    """
+    return FastJSONResponse(SuggestResponse(suggestions=suggest_entities(q, limit)))
+
+
+@router.post("/batch", response_model=BatchSearchResponse)
+async def search_batch(body: BatchSearchRequest):
+    """
+    Resolve many search terms in one request.
+
+    Terms are resolved in stages, each stage only seeing what the previous
+    ones left over: in-memory index, one exact ticker/name query, concurrent
+    classification, then one fuzzy query per entity table. Results are
+    returned in input order; unresolved terms have found=false.
+
+    A pool connection is held only for each of the two queries, never
+    while classification runs.
+    """
+    terms = list(dict.fromkeys(t for t in body.terms if t.strip()))
+    logger.info(f"🔍 Batch search request for {len(terms)} distinct terms")
+
+    resolved = {}
+    for term in terms:
+        known = lookup_entity(term)
+        if known:
+            resolved[term] = {**known, "confidence": 1.0}
+
+    pending = [t for t in terms if t not in resolved]
+    if pending:
+        async with get_pool().acquire() as db:
+            exact = await resolve_exact_batch(pending, db)
+        for term, match in exact.items():
+            resolved[term] = {**match, "confidence": 1.0}
+
+    pending = [t for t in terms if t not in resolved]
+    classifications = dict(zip(pending, await classify_search_terms(pending)))
+    fuzzy = {}
+    if classifications:
+        async with get_pool().acquire() as db:
+            fuzzy = await search_best_candidates_batch(
+                {t: c["type"] for t, c in classifications.items()}, db
+            )
+    for term, match in fuzzy.items():
+        resolved[term] = {
+            **match,
+            "confidence": classifications[term]["confidence"],
+            "reasoning": classifications[term].get("reasoning"),
+        }
+
+    logger.info(f"✅ Batch resolved {len(resolved)}/{len(terms)} terms")
+
+    results = []
+    for term in body.terms:
+        match = resolved.get(term)
+        if not match:
+            results.append({"term": term, "found": False})
+            continue
+        results.append(
+            {
+                "term": term,
+                "found": True,
+                "id": match["id"],
+                "type": match["type"],
+                "name": match["name"],
+                "confidence": match["confidence"],
+                "reasoning": match.get("reasoning"),
+            }
+        )
+    return FastJSONResponse(BatchSearchResponse(results=results))
@@ -1,11 +1,16 @@
 """Common schemas."""
 
-from pydantic import BaseModel
-from typing import Optional, Literal
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional, Literal
 from uuid import UUID
 
 EntityType = Literal["person", "company"]
 
+# Most ids one batch metadata request (GET ?ids= or POST /batch) may ask for
+MAX_BATCH_IDS = 1000
+# Ids are Postgres bigints; larger ones cannot even be sent as query parameters
+MAX_ENTITY_ID = 2**63 - 1
+
 
 class EntityRef(BaseModel):
     """Reference to an entity (person or company)."""
@@ -14,3 +19,11 @@ class EntityRef(BaseModel):
     type: EntityType
     name: str
     ticker: Optional[str] = None
+
+
+class EntityIdsRequest(BaseModel):
+    """Request body for batch metadata lookups."""
+
+    ids: List[Annotated[int, Field(ge=0, le=MAX_ENTITY_ID)]] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_IDS
+    )
@@ -1,6 +1,9 @@
 """Company entity schemas."""
 
 from pydantic import BaseModel
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
 
 
 class CompanyResponse(BaseModel):
@@ -9,3 +12,40 @@ class CompanyResponse(BaseModel):
     id: int
     name: str
     ticker: str
+
+
+class CompanyBatchItem(BaseModel):
+    """One requested id of a batch lookup; company is null when not found."""
+
+    id: int
+    found: bool
+    company: Optional[CompanyResponse] = None
+
+
+class CompanyBatchResponse(BaseModel):
+    """Batch company lookup, in request order."""
+
+    results: List[CompanyBatchItem]
+
+
+class CompanyHolder(BaseModel):
+    """One politician holding a company, with the holding."""
+
+    holding_id: int
+    id: int
+    name: str
+    position: str
+    state: str
+    party_affiliation: str
+    estimated_net_worth: Decimal
+    last_trade_date: Optional[date] = None
+    holding_value: Decimal
+
+
+class CompanyHoldersResponse(BaseModel):
+    """One page of a company's holders, largest holding first."""
+
+    company_id: int
+    holders: List[CompanyHolder]
+    # Pass as `cursor` for the next page; null on the last page
+    next_cursor: Optional[str] = None
@@ -35,6 +35,8 @@ class GraphNode(BaseModel):
     last_trade_date: Optional[date] = None
     # Company fields
     ticker: Optional[str] = None
+    # Set on the synthetic "N others" node of a top-k graph
+    aggregated_count: Optional[int] = None
 
 
 class GraphEdge(BaseModel):
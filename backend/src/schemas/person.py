@@ -2,7 +2,7 @@
 
 from pydantic import BaseModel
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 
 
@@ -16,3 +16,36 @@ class PersonResponse(BaseModel):
     party_affiliation: str
     estimated_net_worth: Decimal
     last_trade_date: Optional[date] = None
+
+
+class PersonBatchItem(BaseModel):
+    """One requested id of a batch lookup; person is null when not found."""
+
+    id: int
+    found: bool
+    person: Optional[PersonResponse] = None
+
+
+class PersonBatchResponse(BaseModel):
+    """Batch person lookup, in request order."""
+
+    results: List[PersonBatchItem]
+
+
+class PersonHolding(BaseModel):
+    """One holding of a person, with the company held."""
+
+    id: int
+    company_id: int
+    company_name: str
+    ticker: str
+    holding_value: Decimal
+
+
+class PersonHoldingsResponse(BaseModel):
+    """One page of a person's holdings, largest first."""
+
+    person_id: int
+    holdings: List[PersonHolding]
+    # Pass as `cursor` for the next page; null on the last page
+    next_cursor: Optional[str] = None
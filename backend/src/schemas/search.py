@@ -1,7 +1,16 @@
 """Search response schemas."""
 
-from pydantic import BaseModel
-from typing import Literal
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class SearchCandidate(BaseModel):
+    """A ranked fuzzy-match candidate."""
+
+    id: str
+    type: Literal["person", "company"]
+    name: str
+    score: float
 
 
 class SearchResponse(BaseModel):
@@ -11,3 +20,43 @@ class SearchResponse(BaseModel):
     type: Literal["person", "company"]
     confidence: float
     reasoning: str
+    alternatives: Optional[List[SearchCandidate]] = None
+
+
+class SuggestItem(BaseModel):
+    """Typeahead suggestion."""
+
+    id: str
+    type: Literal["person", "company"]
+    name: str
+    ticker: Optional[str] = None
+
+
+class SuggestResponse(BaseModel):
+    """Response from suggest endpoint."""
+
+    suggestions: List[SuggestItem]
+
+
+class BatchSearchRequest(BaseModel):
+    """Request body for batch search."""
+
+    terms: List[str] = Field(..., min_length=1, max_length=500)
+
+
+class BatchSearchResult(BaseModel):
+    """Resolution of one term in a batch search."""
+
+    term: str
+    found: bool
+    id: Optional[str] = None
+    type: Optional[Literal["person", "company"]] = None
+    name: Optional[str] = None
+    confidence: Optional[float] = None
+    reasoning: Optional[str] = None
+
+
+class BatchSearchResponse(BaseModel):
+    """Response from batch search endpoint, in request order."""
+
+    results: List[BatchSearchResult]
@@ -0,0 +1,22 @@
+"""Co-holding similarity schemas."""
+
+from pydantic import BaseModel
+from typing import List, Literal
+
+
+class SimilarEntity(BaseModel):
+    """One similar politician or company."""
+
+    id: int
+    name: str
+    score: float
+    shared_holdings: int
+
+
+class SimilarResponse(BaseModel):
+    """Top-k most similar entities of the same type."""
+
+    id: int
+    type: Literal["person", "company"]
+    metric: Literal["jaccard", "cosine"]
+    results: List[SimilarEntity]
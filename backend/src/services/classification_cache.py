@@ -0,0 +1,144 @@
+"""Cache for search term classifications.
+
+Two tiers:
+- an in-memory LRU with TTL per worker
+- an optional SQLite file (CLASSIFY_CACHE_PATH) shared by every worker on
+  the host and surviving restarts
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional
+from src.core.config import settings
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_memory = TTLCache(
+    maxsize=settings.CLASSIFY_CACHE_SIZE,
+    ttl=settings.CLASSIFY_CACHE_TTL_SECONDS,
+)
+
+_sqlite_conn: Optional[sqlite3.Connection] = None
+_sqlite_lock = threading.Lock()
+_disk_stats = {"hits": 0, "misses": 0}
+
+
+def normalize_term(term: str) -> str:
+    """Cache key for a search term: collapsed whitespace, case-folded."""
+    return " ".join(term.split()).casefold()
+
+
+def init_classification_cache():
+    """Open the persistent cache file if CLASSIFY_CACHE_PATH is configured."""
+    global _sqlite_conn
+    if _sqlite_conn or not settings.CLASSIFY_CACHE_PATH:
+        return
+    conn = sqlite3.connect(
+        settings.CLASSIFY_CACHE_PATH,
+        check_same_thread=False,
+        isolation_level=None,
+    )
+    # WAL lets several uvicorn workers read while one writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS classification_cache (
+            term        TEXT PRIMARY KEY,
+            result      TEXT NOT NULL,
+            expires_at  REAL NOT NULL
+        )
+        """
+    )
+    conn.execute("DELETE FROM classification_cache WHERE expires_at < ?", (time.time(),))
+    _sqlite_conn = conn
+    logger.info(f"Classification cache persisted at {settings.CLASSIFY_CACHE_PATH}")
+
+
+def close_classification_cache():
+    """Close the persistent cache file."""
+    global _sqlite_conn
+    if _sqlite_conn:
+        with _sqlite_lock:
+            _sqlite_conn.close()
+        _sqlite_conn = None
+
+
+def _disk_get(key: str) -> Optional[dict]:
+    with _sqlite_lock:
+        row = _sqlite_conn.execute(
+            "SELECT result FROM classification_cache WHERE term = ? AND expires_at >= ?",
+            (key, time.time()),
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def _disk_set(key: str, result: dict):
+    with _sqlite_lock:
+        _sqlite_conn.execute(
+            "INSERT OR REPLACE INTO classification_cache (term, result, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(result), time.time() + settings.CLASSIFY_CACHE_TTL_SECONDS),
+        )
+
+
+async def get_cached_classification(term: str) -> Optional[dict]:
+    """
+    Look up a cached classification.
+
+    Args:
+        term: Raw search term
+
+    Returns:
+        Cached classification dict or None
+    """
+    key = normalize_term(term)
+    result = _memory.get(key)
+    if result is not None:
+        return result
+    if not _sqlite_conn:
+        return None
+    try:
+        result = await asyncio.to_thread(_disk_get, key)
+    except sqlite3.Error as e:
+        logger.warning(f"Classification cache read failed: {e}")
+        return None
+    if result is None:
+        _disk_stats["misses"] += 1
+        return None
+    _disk_stats["hits"] += 1
+    _memory.set(key, result)
+    return result
+
+
+async def set_cached_classification(term: str, result: dict):
+    """
+    Store a classification in both cache tiers.
+
+    Args:
+        term: Raw search term
+        result: Classification dict ('type', 'confidence', 'reasoning')
+    """
+    key = normalize_term(term)
+    _memory.set(key, result)
+    if not _sqlite_conn:
+        return
+    try:
+        await asyncio.to_thread(_disk_set, key, result)
+    except sqlite3.Error as e:
+        logger.warning(f"Classification cache write failed: {e}")
+
+
+def get_classification_cache_metrics() -> dict:
+    """Hit/miss counters for both cache tiers."""
+    return {
+        "memory": _memory.stats(),
+        "disk": {
+            "enabled": _sqlite_conn is not None,
+            **_disk_stats,
+        },
+    }
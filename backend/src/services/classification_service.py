@@ -1,18 +1,66 @@
 """Entity classification service using AI."""
 
+import asyncio
 import json
 import logging
+from typing import List, Optional
+from src.core.config import settings
 from src.integrations.anthropic_client import get_anthropic
-from src.utils.nlp_fallbacks import simple_classify
+from src.services.classification_cache import (
+    get_cached_classification,
+    set_cached_classification,
+)
+from src.services.local_classifier import classify_locally
+from src.utils.circuit_breaker import HALF_OPEN, CircuitBreaker
+from src.utils.nlp_fallbacks import classify_many, simple_classify
 
 logger = logging.getLogger(__name__)
 
+# Caps in-flight Claude calls per worker so a burst of searches can't pile up
+# unbounded sockets/tasks while the rest of the API keeps serving.
+_classify_semaphore = asyncio.Semaphore(settings.CLASSIFY_MAX_CONCURRENCY)
+
+# Skips Claude entirely for a cool-down after repeated errors/timeouts
+_breaker = CircuitBreaker(
+    failure_threshold=settings.CLASSIFY_BREAKER_FAILURE_THRESHOLD,
+    cooldown=settings.CLASSIFY_BREAKER_COOLDOWN_SECONDS,
+)
+
+# Claude calls that outlived the latency budget; kept referenced so they can
+# finish and populate the cache for the next search of the same term
+_background_calls = set()
+
+_stats = {
+    "claude_calls": 0,
+    "fallbacks": {
+        "no_client": 0,
+        "breaker_open": 0,
+        "latency_budget": 0,
+        "error": 0,
+    },
+}
+
+
+async def _create_message(client, prompt: str):
+    """Send the classification prompt to Claude under the concurrency cap."""
+    async with _classify_semaphore:
+        return await client.messages.create(
+            model=settings.CLASSIFY_MODEL,
+            max_tokens=200,
+            messages=[{"role": "user", "content": prompt}],
+        )
+
 
 async def classify_search_term(search_term: str) -> dict:
     """
     Classify a search term as person or company using Anthropic Claude.
 
-    Falls back to heuristic classification if AI is unavailable.
+    Results are cached per normalized term. Terms the local n-gram model
+    is confident about never reach Claude. Falls back to heuristic
+    classification if AI is unavailable, if the circuit breaker is open,
+    or if Claude hasn't answered within CLASSIFY_LATENCY_BUDGET_MS. In the
+    latter case the Claude call keeps running (up to
+    CLASSIFY_TIMEOUT_SECONDS) so its answer lands in the cache.
 
     Args:
         search_term: The term to classify
@@ -20,10 +68,138 @@ async def classify_search_term(search_term: str) -> dict:
     Returns:
         dict with 'type' ('person' or 'company'), 'confidence', 'reasoning'
     """
+    cached = await get_cached_classification(search_term)
+    if cached is not None:
+        logger.info(f"Classification cache hit for: '{search_term}'")
+        return cached
+
+    local = classify_locally(search_term)
+    if local is not None:
+        await set_cached_classification(search_term, local)
+        return local
+
     client = get_anthropic()
     if not client:
-        return simple_classify(search_term)
+        _stats["fallbacks"]["no_client"] += 1
+        result = simple_classify(search_term)
+        await set_cached_classification(search_term, result)
+        return result
+
+    if not _breaker.allow_request():
+        logger.info(f"Classifier breaker open, using heuristics for: '{search_term}'")
+        return _fallback(search_term, "breaker_open")
+
+    is_probe = _breaker.state == HALF_OPEN
+    _stats["claude_calls"] += 1
+    task = asyncio.create_task(_classify_and_record(client, search_term))
+    if is_probe:
+        task.add_done_callback(_release_unrecorded_probe)
+    budget = settings.CLASSIFY_LATENCY_BUDGET_MS / 1000 or None
+    try:
+        done, _ = await asyncio.wait({task}, timeout=budget)
+    except asyncio.CancelledError:
+        # Caller gave up (e.g. speculative search didn't need us)
+        task.cancel()
+        raise
+
+    if not done:
+        logger.info(
+            f"Claude exceeded {settings.CLASSIFY_LATENCY_BUDGET_MS}ms budget "
+            f"for: '{search_term}', answering from heuristics"
+        )
+        _background_calls.add(task)
+        task.add_done_callback(_background_calls.discard)
+        return _fallback(search_term, "latency_budget")
+
+    result = task.result()
+    if result is None:
+        return _fallback(search_term, "error")
+    return result
+
+
+def _fallback(search_term: str, reason: str) -> dict:
+    """Heuristic classification; not cached so Claude is retried next time."""
+    _stats["fallbacks"][reason] += 1
+    logger.info(f"Falling back to simple classification for: '{search_term}'")
+    fallback_result = simple_classify(search_term)
+    logger.info(f"Simple classification result: {fallback_result}")
+    return fallback_result
+
+
+def _release_unrecorded_probe(task: asyncio.Task):
+    # A probe cancelled (even before it started) or crashed never reports
+    # to the breaker, which would otherwise stay half-open and reject
+    # every call from then on
+    if task.cancelled() or task.exception() is not None:
+        _breaker.release_probe()
+
+
+async def _classify_and_record(client, search_term: str) -> Optional[dict]:
+    """Call Claude, feed the outcome to the breaker and cache successes."""
+    result = await _classify_with_claude(client, search_term)
+    if result is None:
+        _breaker.record_failure()
+        return None
+    _breaker.record_success()
+    await set_cached_classification(search_term, result)
+    return result
+
+
+def get_classifier_metrics() -> dict:
+    """Breaker state and fallback counters for the Claude classifier."""
+    fallbacks = sum(_stats["fallbacks"].values())
+    total = _stats["claude_calls"] + _stats["fallbacks"]["breaker_open"] + _stats["fallbacks"]["no_client"]
+    return {
+        "breaker": _breaker.stats(),
+        "latency_budget_ms": settings.CLASSIFY_LATENCY_BUDGET_MS,
+        "claude_calls": _stats["claude_calls"],
+        "claude_calls_in_background": len(_background_calls),
+        "fallbacks": dict(_stats["fallbacks"]),
+        "fallback_rate": round(fallbacks / total, 4) if total else None,
+    }
+
+
+async def classify_search_terms(search_terms: List[str]) -> List[dict]:
+    """
+    Classify several terms concurrently, at most CLASSIFY_MAX_CONCURRENCY at a time.
+
+    Args:
+        search_terms: Terms to classify
+
+    Returns:
+        Classification dicts in the same order as search_terms
+    """
+    if not get_anthropic():
+        # Local model and heuristics are microseconds per term; skip the
+        # per-term task overhead
+        results = [classify_locally(t) for t in search_terms]
+        leftovers = [t for t, r in zip(search_terms, results) if r is None]
+        _stats["fallbacks"]["no_client"] += len(leftovers)
+        heuristics = iter(classify_many(leftovers))
+        return [r if r is not None else next(heuristics) for r in results]
+
+    # Admit only as many terms as can be sent at once, so queueing inside
+    # classify_search_term doesn't eat into each call's timeout
+    gate = asyncio.Semaphore(settings.CLASSIFY_MAX_CONCURRENCY)
+
+    async def _one(term: str) -> dict:
+        async with gate:
+            return await classify_search_term(term)
+
+    return await asyncio.gather(*(_one(t) for t in search_terms))
+
+
+async def _classify_with_claude(client, search_term: str) -> Optional[dict]:
+    """
+    Ask Claude to classify a search term.
+
+    Args:
+        client: Shared async Anthropic client
+        search_term: The term to classify
 
+    Returns:
+        Validated classification dict, or None on error/timeout
+    """
     prompt = f"""
 Analyze this search term and determine if it refers to a PERSON (politician/individual) or a COMPANY (corporation/organization).
 
@@ -45,10 +221,10 @@ Respond with valid JSON only:
 
     try:
         logger.info(f"Using Claude to classify: '{search_term}'")
-        response = client.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=200,
-            messages=[{"role": "user", "content": prompt}],
+        # Time spent queued behind the concurrency cap counts against the budget
+        response = await asyncio.wait_for(
+            _create_message(client, prompt),
+            timeout=settings.CLASSIFY_TIMEOUT_SECONDS,
         )
 
         result = json.loads(response.content[0].text)
@@ -62,9 +238,13 @@ Respond with valid JSON only:
 
         return result
 
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Claude classification timed out after "
+            f"{settings.CLASSIFY_TIMEOUT_SECONDS}s for: '{search_term}'"
+        )
+        return None
+
     except Exception as e:
         logger.warning(f"Claude classification failed: {e}")
-        logger.info(f"Falling back to simple classification for: '{search_term}'")
-        fallback_result = simple_classify(search_term)
-        logger.info(f"Simple classification result: {fallback_result}")
-        return fallback_result
+        return None
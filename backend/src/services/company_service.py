@@ -1,7 +1,9 @@
 """Company service for retrieving company data."""
 
 import logging
-from asyncpg import Connection
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from asyncpg import Connection, Record
 
 logger = logging.getLogger(__name__)
 
@@ -28,26 +30,66 @@ async def get_company_by_id(company_id: str, db: Connection):
     return row
 
 
-async def get_company_politicians(company_id: str, db: Connection):
+async def get_companies_by_ids(company_ids: List[int], db: Connection) -> Dict[int, Record]:
     """
-    Get all politicians who have holdings in this company.
+    Get metadata for many companies in one query.
+
+    Args:
+        company_ids: Company IDs (duplicates allowed)
+        db: Database connection
+
+    Returns:
+        Rows keyed by ID; IDs with no company are absent
+    """
+    rows = await db.fetch(
+        """
+        SELECT id, name, ticker
+        FROM companies
+        WHERE id = ANY($1::bigint[])
+        """,
+        list(set(company_ids)),
+    )
+    return {row["id"]: row for row in rows}
+
+
+async def get_company_politicians(
+    company_id: str,
+    db: Connection,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[Decimal, int]] = None,
+):
+    """
+    Get all politicians who have holdings in this company, largest first.
+
+    Ordered by (holding_value, holding id) descending, which
+    idx_holdings_co_value_id serves directly, so a page starting `after`
+    a given row costs the same however deep it is.
 
     Args:
         company_id: Company ID
         db: Database connection
+        limit: Maximum rows to return (None for all)
+        after: (holding_value, holding id) of the last row already seen
 
     Returns:
         List of politician holdings
     """
+    args = [int(company_id) if company_id.isdigit() else company_id, limit]
+    seek = ""
+    if after is not None:
+        args.extend(after)
+        seek = "AND (h.holding_value, h.id) < ($3, $4)"
     rows = await db.fetch(
-        """
+        f"""
         SELECT p.id, p.name, p.position, p.state, p.party_affiliation,
-               p.estimated_net_worth, p.last_trade_date, h.holding_value
+               p.estimated_net_worth, p.last_trade_date, h.holding_value,
+               h.id AS holding_id
         FROM holdings h
         JOIN politicians p ON h.politician_id = p.id
-        WHERE h.company_id = $1
-        ORDER BY h.holding_value DESC NULLS LAST
+        WHERE h.company_id = $1 {seek}
+        ORDER BY h.holding_value DESC, h.id DESC
+        LIMIT $2
         """,
-        int(company_id) if company_id.isdigit() else company_id,
+        *args,
     )
     return rows
@@ -0,0 +1,298 @@
+"""Read-through cache of person/company rows and first holdings pages.
+
+Rows change maybe once a day but are read on every request, so each worker
+keeps the ones it has served in LRU caches with a TTL
+(ENTITY_CACHE_TTL_SECONDS). Concurrent misses for the same entity share one
+query. Misses for ids that do not exist are cached too.
+
+Writes invalidate exactly the affected entries: statement-level triggers
+(see schema.sql) send `NOTIFY entity_changed` with each changed politician,
+company or holding, or a wildcard after bulk statements, and a LISTEN
+connection drops those entries (everything, for a wildcard). Without the
+LISTEN connection entries are at most a TTL stale.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set
+import asyncpg
+from asyncpg import Record
+from src.core.config import settings
+from src.db.pool import get_pool
+from src.services.company_service import (
+    get_companies_by_ids,
+    get_company_by_id,
+    get_company_politicians,
+)
+from src.services.person_service import (
+    get_people_by_ids,
+    get_person_by_id,
+    get_person_holdings,
+)
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "entity_changed"
+
+_people = TTLCache(maxsize=settings.ENTITY_CACHE_SIZE, ttl=settings.ENTITY_CACHE_TTL_SECONDS)
+_companies = TTLCache(maxsize=settings.ENTITY_CACHE_SIZE, ttl=settings.ENTITY_CACHE_TTL_SECONDS)
+# First pages: ("person", id, limit) -> that person's holdings, ("company", id, limit) -> its holders
+_holdings = TTLCache(
+    maxsize=settings.ENTITY_CACHE_HOLDINGS_SIZE,
+    ttl=settings.ENTITY_CACHE_TTL_SECONDS,
+)
+
+_ABSENT = object()
+_inflight: Dict[Hashable, asyncio.Task] = {}
+# Bumped by every invalidation; a load that overlapped one is not cached
+_generation = 0
+_stats = {"coalesced": 0, "notifications": 0}
+_listen_conn: Optional[asyncpg.Connection] = None
+# Notifications received but not applied yet; past this many, clear instead
+_pending: Set[str] = set()
+_MAX_TARGETED_INVALIDATIONS = 100
+
+
+async def _read_through(cache: TTLCache, key: Hashable, load: Callable[[], Awaitable]):
+    value = cache.get(key, _ABSENT)
+    if value is not _ABSENT:
+        return value
+
+    flight_key = (id(cache), key)
+    task = _inflight.get(flight_key)
+    if task is not None:
+        _stats["coalesced"] += 1
+    else:
+        generation = _generation
+
+        async def load_and_store():
+            try:
+                value = await load()
+                if generation == _generation:
+                    cache.set(key, value)
+                return value
+            finally:
+                if _inflight.get(flight_key) is task:
+                    del _inflight[flight_key]
+
+        task = asyncio.create_task(load_and_store())
+        _inflight[flight_key] = task
+    # One waiter giving up must not cancel the query for the others
+    return await asyncio.shield(task)
+
+
+async def _fetch_with(fn, entity_id, *args):
+    async with get_pool().acquire() as db:
+        return await fn(entity_id, db, *args)
+
+
+async def get_cached_person(person_id: int) -> Optional[Record]:
+    """Person row by ID (None if there is none), from cache or Postgres."""
+    return await _read_through(
+        _people, person_id, lambda: _fetch_with(get_person_by_id, str(person_id))
+    )
+
+
+async def get_cached_company(company_id: int) -> Optional[Record]:
+    """Company row by ID (None if there is none), from cache or Postgres."""
+    return await _read_through(
+        _companies, company_id, lambda: _fetch_with(get_company_by_id, str(company_id))
+    )
+
+
+async def get_cached_person_holdings(person_id: int, limit: int) -> List[Record]:
+    """First `limit` holdings of a person (largest first), from cache or Postgres."""
+    return await _read_through(
+        _holdings,
+        ("person", person_id, limit),
+        lambda: _fetch_with(get_person_holdings, str(person_id), limit),
+    )
+
+
+async def get_cached_company_holders(company_id: int, limit: int) -> List[Record]:
+    """First `limit` holders of a company (largest first), from cache or Postgres."""
+    return await _read_through(
+        _holdings,
+        ("company", company_id, limit),
+        lambda: _fetch_with(get_company_politicians, str(company_id), limit),
+    )
+
+
+async def _read_many(cache: TTLCache, ids: List[int], load_many) -> Dict[int, Record]:
+    rows = {}
+    missing = []
+    for entity_id in set(ids):
+        row = cache.get(entity_id, _ABSENT)
+        if row is _ABSENT:
+            missing.append(entity_id)
+        elif row is not None:
+            rows[entity_id] = row
+    if missing:
+        generation = _generation
+        loaded = await _fetch_with(load_many, missing)
+        if generation == _generation:
+            for entity_id in missing:
+                cache.set(entity_id, loaded.get(entity_id))
+        rows.update(loaded)
+    return rows
+
+
+async def get_cached_people(person_ids: List[int]) -> Dict[int, Record]:
+    """
+    Person rows for many IDs; the ones not cached come from one query.
+
+    Returns:
+        Rows keyed by ID; IDs with no politician are absent
+    """
+    return await _read_many(_people, person_ids, get_people_by_ids)
+
+
+async def get_cached_companies(company_ids: List[int]) -> Dict[int, Record]:
+    """
+    Company rows for many IDs; the ones not cached come from one query.
+
+    Returns:
+        Rows keyed by ID; IDs with no company are absent
+    """
+    return await _read_many(_companies, company_ids, get_companies_by_ids)
+
+
+def _invalidate(cache: TTLCache, key: Hashable):
+    cache.invalidate(key)
+    # Later readers must not join a load that started before the change
+    _inflight.pop((id(cache), key), None)
+
+
+def _drop_holdings_pages(person_ids: Set[int], company_ids: Set[int], kinds: Set[str] = frozenset()):
+    """Drop the cached holdings pages of these entities, and every page of `kinds`, in one pass."""
+    for key in _holdings.keys():
+        kind, entity_id = key[0], key[1]
+        if kind in kinds or entity_id in (person_ids if kind == "person" else company_ids):
+            _invalidate(_holdings, key)
+
+
+def clear_entity_cache():
+    """Drop every cached entry."""
+    global _generation
+    _generation += 1
+    for cache in (_people, _companies, _holdings):
+        cache.clear()
+    _inflight.clear()
+
+
+def invalidate_entities(payloads: Iterable[str]):
+    """
+    Drop the entries a batch of `entity_changed` notifications refers to.
+
+    Args:
+        payloads: 'person:<id>', 'company:<id>' or
+            'holding:<politician_id>:<company_id>'; '*' for an id means
+            too many rows changed to list (bulk statement or TRUNCATE)
+    """
+    global _generation
+    _generation += 1
+    people: Set[int] = set()
+    companies: Set[int] = set()
+    holding_people: Set[int] = set()
+    holding_companies: Set[int] = set()
+    try:
+        for payload in payloads:
+            kind, _, ids = payload.partition(":")
+            if "*" in ids or not ids:
+                clear_entity_cache()
+                return
+            if kind == "person":
+                people.add(int(ids))
+            elif kind == "company":
+                companies.add(int(ids))
+            elif kind == "holding":
+                person_id, company_id = (int(part) for part in ids.split(":"))
+                holding_people.add(person_id)
+                holding_companies.add(company_id)
+            else:
+                raise ValueError(kind)
+    except ValueError:
+        logger.warning(f"Unexpected {NOTIFY_CHANNEL} payload {payload!r}, clearing entity cache")
+        clear_entity_cache()
+        return
+
+    for person_id in people:
+        _invalidate(_people, person_id)
+    for company_id in companies:
+        _invalidate(_companies, company_id)
+    # Holder pages embed politician columns and holdings pages company
+    # columns; which pages include a changed entity is not tracked, so a
+    # changed person drops every company's holder pages and vice versa
+    kinds = set()
+    if people:
+        kinds.add("company")
+    if companies:
+        kinds.add("person")
+    if people or companies or holding_people:
+        _drop_holdings_pages(people | holding_people, companies | holding_companies, kinds)
+
+
+def _apply_pending_notifications():
+    payloads = list(_pending)
+    _pending.clear()
+    if len(payloads) > _MAX_TARGETED_INVALIDATIONS:
+        clear_entity_cache()
+    else:
+        invalidate_entities(payloads)
+
+
+def _on_notify(conn, pid, channel, payload):
+    global _generation
+    _stats["notifications"] += 1
+    # Loads finishing before the batch is applied must not be cached
+    _generation += 1
+    if not _pending:
+        # Apply everything that arrives in this loop iteration at once
+        asyncio.get_running_loop().call_soon(_apply_pending_notifications)
+    _pending.add(payload)
+
+
+def _on_listen_lost(conn):
+    global _listen_conn
+    # Changes are no longer seen; start over from Postgres and rely on the TTL
+    logger.warning(f"LISTEN {NOTIFY_CHANNEL} connection lost, entity cache falls back to TTL")
+    _listen_conn = None
+    clear_entity_cache()
+
+
+async def start_entity_cache():
+    """Subscribe to row change notifications, if ENTITY_CACHE_LISTEN."""
+    global _listen_conn
+    if not settings.ENTITY_CACHE_LISTEN or settings.ENTITY_CACHE_SIZE <= 0:
+        return
+    try:
+        _listen_conn = await asyncpg.connect(settings.DATABASE_URL)
+        await _listen_conn.add_listener(NOTIFY_CHANNEL, _on_notify)
+        _listen_conn.add_termination_listener(_on_listen_lost)
+    except Exception as e:
+        logger.warning(f"LISTEN {NOTIFY_CHANNEL} unavailable, entity cache relies on TTL only: {e}")
+        _listen_conn = None
+
+
+async def stop_entity_cache():
+    """Drop the LISTEN connection and the cached entries."""
+    global _listen_conn
+    if _listen_conn:
+        conn, _listen_conn = _listen_conn, None
+        conn.remove_termination_listener(_on_listen_lost)
+        await conn.close()
+    clear_entity_cache()
+
+
+def get_entity_cache_metrics() -> dict:
+    """Hit rates per cache, coalesced misses and invalidation activity."""
+    return {
+        "person": _people.stats(),
+        "company": _companies.stats(),
+        "holdings": _holdings.stats(),
+        "coalesced_misses": _stats["coalesced"],
+        "inflight": len(_inflight),
+        "notifications": _stats["notifications"],
+        "listening": _listen_conn is not None,
+    }
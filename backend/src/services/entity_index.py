@@ -0,0 +1,335 @@
+"""In-memory index of known entity names and tickers.
+
+Lets /api/search resolve exact and near-exact hits (a ticker, a full
+politician or company name) without calling the classifier or Postgres,
+and serves /api/search/suggest typeahead from a sorted prefix array.
+The index is loaded at startup and refreshed in the background; each
+refresh swaps in a new immutable snapshot, so readers never see a
+half-built index.
+"""
+
+import asyncio
+import logging
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from src.core.config import settings
+from src.db.pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+# Trailing words dropped for near-exact company matching ("Acme Corp." == "Acme")
+_COMPANY_SUFFIXES = frozenset(
+    {"inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "llc", "plc"}
+)
+# Leading titles dropped for near-exact person matching ("Sen. Jane Doe" == "Jane Doe")
+_PERSON_TITLES = frozenset(
+    {"mr", "mrs", "ms", "dr", "sen", "senator", "rep", "representative", "gov", "governor"}
+)
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold, drop punctuation and collapse whitespace."""
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", name.casefold())).strip()
+
+
+def _strip_company_suffix(norm: str) -> str:
+    words = norm.split(" ")
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def _strip_person_title(norm: str) -> str:
+    words = norm.split(" ")
+    while len(words) > 1 and words[0] in _PERSON_TITLES:
+        words.pop(0)
+    return " ".join(words)
+
+
+# (id, type, name, ticker)
+Entity = Tuple[int, str, str, Optional[str]]
+
+# Prefix ranks: whole-name/ticker prefixes sort ahead of later-word prefixes
+_RANK_START = 0
+_RANK_WORD = 1
+
+
+def _prefix_keys(entity: Entity) -> List[Tuple[str, int, Entity]]:
+    """Sorted-array entries for one entity: full name, each later word, ticker."""
+    norm = normalize_name(entity[2])
+    keys = [(norm, _RANK_START, entity)]
+    pos = norm.find(" ")
+    while pos != -1:
+        keys.append((norm[pos + 1 :], _RANK_WORD, entity))
+        pos = norm.find(" ", pos + 1)
+    if entity[3]:
+        keys.append((entity[3].casefold(), _RANK_START, entity))
+    return keys
+
+
+@dataclass
+class EntityIndexSnapshot:
+    """Immutable lookup tables built from one load of the entity tables."""
+
+    tickers: Dict[str, Entity] = field(default_factory=dict)
+    # Normalized name -> every entity with that name (duplicates => ambiguous)
+    names: Dict[str, List[Entity]] = field(default_factory=dict)
+    # Near-exact keys: company suffixes / person titles stripped
+    loose_names: Dict[str, List[Entity]] = field(default_factory=dict)
+    # Sorted (key, rank, entity) tuples for prefix search via bisect
+    prefixes: List[Tuple[str, int, Entity]] = field(default_factory=list)
+    max_politician_id: int = 0
+    max_company_id: int = 0
+
+    @classmethod
+    def build(cls, politicians, companies) -> "EntityIndexSnapshot":
+        return cls().extended(politicians, companies)
+
+    def extended(self, politicians, companies) -> "EntityIndexSnapshot":
+        """
+        Return a new snapshot with extra rows added; self is left untouched.
+
+        The prefix array is merged rather than rebuilt: the new keys are
+        sorted on their own and Python's sort merges the two runs in
+        linear time.
+        """
+        snap = EntityIndexSnapshot(
+            tickers=dict(self.tickers),
+            names=dict(self.names),
+            loose_names=dict(self.loose_names),
+            max_politician_id=self.max_politician_id,
+            max_company_id=self.max_company_id,
+        )
+        new_keys = []
+        for row in companies:
+            entity = (row["id"], "company", row["name"], row["ticker"])
+            if row["ticker"]:
+                snap.tickers[row["ticker"].upper()] = entity
+            norm = normalize_name(row["name"])
+            snap._add(snap.names, norm, entity)
+            snap._add(snap.loose_names, _strip_company_suffix(norm), entity)
+            new_keys.extend(_prefix_keys(entity))
+            snap.max_company_id = max(snap.max_company_id, row["id"])
+        for row in politicians:
+            entity = (row["id"], "person", row["name"], None)
+            norm = normalize_name(row["name"])
+            snap._add(snap.names, norm, entity)
+            snap._add(snap.loose_names, norm, entity)
+            new_keys.extend(_prefix_keys(entity))
+            snap.max_politician_id = max(snap.max_politician_id, row["id"])
+        new_keys.sort()
+        snap.prefixes = self.prefixes + new_keys
+        snap.prefixes.sort()
+        return snap
+
+    @staticmethod
+    def _add(table: Dict[str, List[Entity]], key: str, entity: Entity):
+        # Copy-on-write so lists shared with the previous snapshot stay intact
+        table[key] = table.get(key, []) + [entity]
+
+    def lookup(self, term: str) -> Optional[Tuple[Entity, str]]:
+        """
+        Resolve a term to a single entity.
+
+        Returns:
+            (entity, reasoning) or None if there is no unambiguous hit
+        """
+        t = term.strip()
+        if not t:
+            return None
+
+        entity = self.tickers.get(t.upper())
+        if entity and " " not in t:
+            return entity, "Exact ticker match"
+
+        norm = normalize_name(t)
+        hits = self.names.get(norm)
+        if hits and len(hits) == 1:
+            return hits[0], "Exact name match"
+        if hits:
+            return None  # Same name on several entities - let the slow path decide
+
+        for key in {_strip_company_suffix(norm), _strip_person_title(norm)}:
+            hits = self.loose_names.get(key)
+            if hits and len(hits) == 1:
+                return hits[0], "Near-exact name match"
+        return None
+
+    def suggest(self, prefix: str, limit: int) -> List[Entity]:
+        """
+        Entities whose name, any name word, or ticker starts with `prefix`.
+
+        Scans at most a small window of the sorted array, so cost is
+        O(log n + limit) regardless of how many entities match.
+        """
+        p = normalize_name(prefix)
+        if not p or limit <= 0:
+            return []
+        window = limit * 4
+        matches = []
+        i = bisect_left(self.prefixes, (p,))
+        while i < len(self.prefixes) and len(matches) < window:
+            key, rank, entity = self.prefixes[i]
+            if not key.startswith(p):
+                break
+            matches.append((rank, len(entity[2]), entity))
+            i += 1
+        matches.sort(key=lambda m: (m[0], m[1]))
+
+        results = []
+        seen = set()
+        for _, _, entity in matches:
+            ident = (entity[1], entity[0])
+            if ident in seen:
+                continue
+            seen.add(ident)
+            results.append(entity)
+            if len(results) == limit:
+                break
+        return results
+
+
+_snapshot = EntityIndexSnapshot()
+_loaded = False
+_refresh_task: Optional[asyncio.Task] = None
+
+
+async def load_entity_index():
+    """Load politicians and companies from Postgres and swap in a new index."""
+    global _snapshot, _loaded
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        politicians = await conn.fetch("SELECT id, name FROM politicians")
+        companies = await conn.fetch("SELECT id, name, ticker FROM companies")
+    # Building is CPU-bound; keep it off the event loop
+    _snapshot = await asyncio.to_thread(EntityIndexSnapshot.build, politicians, companies)
+    _loaded = True
+    logger.info(
+        f"Entity index loaded: {len(politicians)} politicians, {len(companies)} companies"
+    )
+
+
+async def refresh_entity_index():
+    """
+    Add rows inserted since the last load without rebuilding the index.
+
+    Only catches new ids; renames and deletes are picked up by the
+    periodic full reload.
+    """
+    global _snapshot
+    if not _loaded:
+        await load_entity_index()
+        return
+    snap = _snapshot
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        politicians = await conn.fetch(
+            "SELECT id, name FROM politicians WHERE id > $1",
+            snap.max_politician_id,
+        )
+        companies = await conn.fetch(
+            "SELECT id, name, ticker FROM companies WHERE id > $1",
+            snap.max_company_id,
+        )
+    if politicians or companies:
+        _snapshot = await asyncio.to_thread(snap.extended, politicians, companies)
+        logger.info(
+            f"Entity index extended: +{len(politicians)} politicians, "
+            f"+{len(companies)} companies"
+        )
+
+
+async def _refresh_loop():
+    cycle = 0
+    while True:
+        await asyncio.sleep(settings.ENTITY_INDEX_REFRESH_SECONDS)
+        cycle += 1
+        try:
+            every = settings.ENTITY_INDEX_FULL_RELOAD_EVERY
+            if every > 0 and cycle % every == 0:
+                await load_entity_index()
+            else:
+                await refresh_entity_index()
+        except Exception as e:
+            logger.warning(f"Entity index refresh failed, keeping previous index: {e}")
+
+
+async def start_entity_index():
+    """Initial load plus background refresh task."""
+    global _refresh_task
+    if not settings.ENTITY_INDEX_ENABLED:
+        return
+    try:
+        await load_entity_index()
+    except Exception as e:
+        # Search still works without the index, just slower
+        logger.warning(f"Entity index initial load failed: {e}")
+    _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+async def stop_entity_index():
+    """Cancel the background refresh task."""
+    global _refresh_task
+    if _refresh_task:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+
+
+def lookup_entity(term: str) -> Optional[dict]:
+    """
+    Resolve a search term against the in-memory index.
+
+    Args:
+        term: Raw search term
+
+    Returns:
+        dict with 'id', 'type', 'name', 'reasoning' or None if the term is
+        unknown or ambiguous
+    """
+    hit = _snapshot.lookup(term)
+    if not hit:
+        return None
+    (entity_id, entity_type, name, _), reasoning = hit
+    return {
+        "id": str(entity_id),
+        "type": entity_type,
+        "name": name,
+        "reasoning": reasoning,
+    }
+
+
+def suggest_entities(prefix: str, limit: int = 10) -> List[dict]:
+    """
+    Typeahead suggestions from the in-memory prefix index.
+
+    Args:
+        prefix: What the user has typed so far
+        limit: Maximum number of suggestions
+
+    Returns:
+        List of dicts with 'id', 'type', 'name', 'ticker'
+    """
+    return [
+        {"id": str(entity_id), "type": entity_type, "name": name, "ticker": ticker}
+        for entity_id, entity_type, name, ticker in _snapshot.suggest(prefix, limit)
+    ]
+
+
+def get_entity_index_metrics() -> dict:
+    """Size of the currently loaded index."""
+    return {
+        "enabled": settings.ENTITY_INDEX_ENABLED,
+        "loaded": _loaded,
+        "tickers": len(_snapshot.tickers),
+        "names": len(_snapshot.names),
+        "prefix_keys": len(_snapshot.prefixes),
+    }
@@ -0,0 +1,374 @@
+"""Bulk export of the politician/company/holdings graph.
+
+Everything comes out of Postgres via COPY ... TO STDOUT. CSV is relayed
+as-is; Parquet and Arrow IPC are transcoded block by block with pyarrow,
+which is optional and imported only when one of those formats is used.
+Either way at most a few blocks are held in memory, whatever the table
+size.
+"""
+
+import asyncio
+import importlib.util
+import io
+import logging
+import threading
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, List, Optional, Tuple
+from asyncpg import Connection
+
+logger = logging.getLogger(__name__)
+
+EXPORT_TABLES = ("politicians", "companies", "holdings")
+EXPORT_FORMATS = ("csv", "parquet", "arrow")
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+FILE_EXTENSIONS = {"csv": "csv", "parquet": "parquet", "arrow": "arrows"}
+
+# COPY chunks buffered between Postgres and a slow client
+_QUEUE_CHUNKS = 64
+
+_active_exports = 0
+# Slots taken by /api/export requests, including ones still connecting
+_reserved_slots = 0
+_completed_exports = 0
+_exported_bytes = 0
+
+
+def export_format_available(fmt: str) -> bool:
+    """Whether `fmt` can be produced here (Parquet and Arrow need pyarrow)."""
+    return fmt == "csv" or importlib.util.find_spec("pyarrow") is not None
+
+
+def export_query(
+    table: str,
+    state: Optional[str] = None,
+    party: Optional[str] = None,
+    min_value: Optional[float] = None,
+) -> Tuple[str, list]:
+    """
+    SELECT statement for one table of the export, with its arguments.
+
+    Filters select a subgraph: politicians matching `state`/`party`, their
+    holdings worth at least `min_value` (absolute), and the companies
+    those holdings point to. Without filters every row is exported. Rows
+    come in table order.
+
+    Args:
+        table: 'politicians', 'companies' or 'holdings'
+        state: Politicians' state
+        party: Politicians' party affiliation
+        min_value: Minimum abs(holding_value)
+
+    Returns:
+        Tuple of (query, args)
+    """
+    args: list = []
+    politician_where: List[str] = []
+    holding_where: List[str] = []
+    if state is not None:
+        args.append(state)
+        politician_where.append(f"p.state = ${len(args)}")
+    if party is not None:
+        args.append(party)
+        politician_where.append(f"p.party_affiliation = ${len(args)}")
+    if min_value is not None:
+        args.append(min_value)
+        holding_where.append(f"abs(h.holding_value) >= ${len(args)}")
+
+    if table == "politicians":
+        where = politician_where
+        if holding_where:
+            where = where + [
+                "EXISTS (SELECT 1 FROM holdings h WHERE h.politician_id = p.id AND "
+                + " AND ".join(holding_where)
+                + ")"
+            ]
+        sql = """
+            SELECT p.id, p.name, p.position, p.state, p.party_affiliation,
+                   p.estimated_net_worth, p.last_trade_date
+            FROM politicians p
+        """
+    elif table == "companies":
+        where = []
+        if politician_where or holding_where:
+            where = [
+                "EXISTS (SELECT 1 FROM holdings h JOIN politicians p ON p.id = h.politician_id "
+                "WHERE h.company_id = c.id AND "
+                + " AND ".join(politician_where + holding_where)
+                + ")"
+            ]
+        sql = "SELECT c.id, c.name, c.ticker FROM companies c"
+    elif table == "holdings":
+        where = politician_where + holding_where
+        join = " JOIN politicians p ON p.id = h.politician_id" if politician_where else ""
+        sql = f"SELECT h.id, h.politician_id, h.company_id, h.holding_value FROM holdings h{join}"
+    else:
+        raise ValueError(f"Unknown export table: {table}")
+
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return sql, args
+
+
+def _arrow_schema(table: str):
+    import pyarrow as pa
+
+    money = pa.decimal128(18, 2)
+    if table == "politicians":
+        return pa.schema(
+            [
+                ("id", pa.int64()),
+                ("name", pa.string()),
+                ("position", pa.string()),
+                ("state", pa.string()),
+                ("party_affiliation", pa.string()),
+                ("estimated_net_worth", money),
+                ("last_trade_date", pa.date32()),
+            ]
+        )
+    if table == "companies":
+        return pa.schema([("id", pa.int64()), ("name", pa.string()), ("ticker", pa.string())])
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("politician_id", pa.int64()),
+            ("company_id", pa.int64()),
+            ("holding_value", money),
+        ]
+    )
+
+
+class _ChunkSink:
+    """Write-only file object collecting what a pyarrow writer emits."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _stream_copy(
+    conn: Connection, query: str, args: list, header: bool = True
+) -> AsyncIterator[bytes]:
+    """CSV chunks from COPY (query) TO STDOUT, with backpressure."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_CHUNKS)
+    done = object()
+
+    async def sink(data):
+        # asyncpg passes bytearrays; responses want bytes
+        await queue.put(bytes(data))
+
+    async def produce():
+        try:
+            await conn.copy_from_query(query, *args, output=sink, format="csv", header=header)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(done)
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is done:
+                break
+            if isinstance(chunk, Exception):
+                # Fail the response rather than end the file early without notice
+                raise chunk
+            yield chunk
+    finally:
+        if not task.done():
+            # Abandoned mid-COPY (client went away). The connection cannot
+            # run anything else until Postgres has finished the COPY, so drop
+            # it: that stops the query right away, and a pool replaces it.
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            conn.terminate()
+
+
+def _last_row_end(buffer: bytearray) -> int:
+    """
+    Offset just past the last complete CSV row in `buffer` (0 if none).
+
+    A newline inside a quoted field does not end a row. COPY doubles quotes
+    within fields, so a newline is outside quotes exactly when an even
+    number of quote characters precede it.
+    """
+    end = buffer.rfind(b"\n")
+    while end >= 0 and buffer.count(b'"', 0, end) % 2:
+        end = buffer.rfind(b"\n", 0, end)
+    return end + 1
+
+
+async def _stream_arrow(
+    conn: Connection, table: str, fmt: str, query: str, args: list, block_bytes: int
+) -> AsyncIterator[bytes]:
+    """
+    Parquet or Arrow IPC stream, transcoded from COPY CSV.
+
+    pyarrow's CSV reader parses blocks of about `block_bytes` CSV (one row
+    group / record batch each) far faster than asyncpg can build Python
+    rows, and does it in a worker thread while COPY keeps streaming.
+    """
+    import pyarrow as pa
+    import pyarrow.csv
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    schema = _arrow_schema(table)
+    read_options = pa.csv.ReadOptions(column_names=schema.names)
+    # Names and positions may contain newlines inside quoted fields
+    parse_options = pa.csv.ParseOptions(newlines_in_values=True)
+    # COPY writes NULL as an empty field and '' as a quoted empty one
+    convert_options = pa.csv.ConvertOptions(
+        column_types=schema, strings_can_be_null=True, quoted_strings_can_be_null=False
+    )
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    # A cancelled request must not close the writer under a running encode()
+    lock = threading.Lock()
+
+    def encode(block: bytes) -> bytes:
+        with lock:
+            writer.write_table(
+                pa.csv.read_csv(
+                    io.BytesIO(block),
+                    read_options=read_options,
+                    parse_options=parse_options,
+                    convert_options=convert_options,
+                )
+            )
+            return sink.drain()
+
+    buffer = bytearray()
+    try:
+        async with aclosing(_stream_copy(conn, query, args, header=False)) as csv_chunks:
+            async for data in csv_chunks:
+                buffer += data
+                if len(buffer) < block_bytes:
+                    continue
+                cut = _last_row_end(buffer)
+                if cut:
+                    chunk = await asyncio.to_thread(encode, bytes(buffer[:cut]))
+                    del buffer[:cut]
+                    if chunk:
+                        yield chunk
+        if buffer:
+            chunk = await asyncio.to_thread(encode, bytes(buffer))
+            if chunk:
+                yield chunk
+    finally:
+        with lock:
+            writer.close()
+    # Footer (parquet) / end-of-stream marker (arrow)
+    yield sink.drain()
+
+
+async def stream_export(
+    conn: Connection,
+    table: str,
+    fmt: str = "csv",
+    state: Optional[str] = None,
+    party: Optional[str] = None,
+    min_value: Optional[float] = None,
+    block_bytes: int = 8 * 1024 * 1024,
+) -> AsyncIterator[bytes]:
+    """
+    Export one table (or the filtered subgraph's share of it) as bytes.
+
+    Args:
+        conn: Database connection, held until the iterator is exhausted
+        table: 'politicians', 'companies' or 'holdings'
+        fmt: 'csv' (with a header row), 'parquet' or 'arrow' (IPC stream)
+        state: Only politicians from this state (and their holdings/companies)
+        party: Only politicians of this party (and their holdings/companies)
+        min_value: Only holdings with abs(holding_value) >= this
+        block_bytes: CSV bytes per row group / record batch (parquet and arrow)
+
+    Yields:
+        Chunks of the output file, in order
+    """
+    global _active_exports, _completed_exports, _exported_bytes
+    query, args = export_query(table, state, party, min_value)
+    if fmt == "csv":
+        chunks = _stream_copy(conn, query, args)
+    else:
+        chunks = _stream_arrow(conn, table, fmt, query, args, block_bytes)
+
+    _active_exports += 1
+    started = time.perf_counter()
+    size = 0
+    try:
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        _completed_exports += 1
+        logger.info(
+            f"Exported {table} as {fmt}: {size / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s"
+        )
+    finally:
+        _active_exports -= 1
+        _exported_bytes += size
+
+
+def reserve_export_slot(limit: int) -> bool:
+    """
+    Take one of `limit` export slots, or return False if all are taken.
+
+    Synchronous, so a request holds its slot before its first await and a
+    burst of requests cannot all pass the check. Give the slot back with
+    release_export_slot().
+    """
+    global _reserved_slots
+    if _reserved_slots >= limit:
+        return False
+    _reserved_slots += 1
+    return True
+
+
+def release_export_slot():
+    global _reserved_slots
+    _reserved_slots -= 1
+
+
+def get_export_metrics() -> dict:
+    """Bulk export activity in this worker."""
+    return {
+        "active": _active_exports,
+        "reserved_slots": _reserved_slots,
+        "completed": _completed_exports,
+        "bytes": _exported_bytes,
+    }
@@ -1,14 +1,104 @@
 """Graph service for building entity graphs."""
 
 import logging
-from typing import Tuple
+from decimal import Decimal
+from typing import AsyncIterator, Optional, Tuple
 from asyncpg import Connection
 
 logger = logging.getLogger(__name__)
 
+# Id of the synthetic node that stands in for the tail of a top-k graph.
+# Real ids are BIGSERIAL (positive), so this can't collide.
+AGGREGATE_NODE_ID = -1
+
+
+def person_node(row, id_key: str = "id") -> dict:
+    """Graph node for a politician row."""
+    return {
+        "id": row[id_key],
+        "type": "person",
+        "name": row["name"],
+        "position": row["position"],
+        "state": row["state"],
+        "party_affiliation": row["party_affiliation"],
+        "estimated_net_worth": row["estimated_net_worth"],
+        "last_trade_date": row["last_trade_date"],
+    }
+
+
+def company_node(row, id_key: str = "id") -> dict:
+    """Graph node for a company row."""
+    return {
+        "id": row[id_key],
+        "type": "company",
+        "name": row["name"],
+        "ticker": row["ticker"],
+    }
+
+
+_CENTS = Decimal("0.01")
+
+
+def _money(value) -> Decimal:
+    """A numeric(18,2) amount as a 2-place Decimal, which renders like Postgres' text form."""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return value.quantize(_CENTS)
+
+
+def holding_edge(politician_id: int, company_id: int, holding_value) -> dict:
+    """Edge from person to company (person holds company)."""
+    # Positive value = current stock ownership (active)
+    # Negative value = sold position (profit from sale)
+    holding_val = _money(holding_value) if holding_value else None
+    return {
+        "source": politician_id,
+        "target": company_id,
+        "edge_type": "stock-holding",
+        "ownership_value": abs(holding_val) if holding_val else None,
+        "status": "sold" if holding_val is not None and holding_val < 0 else "active",
+    }
+
+
+_PERSON_SQL = """
+    SELECT id, name, position, state, party_affiliation,
+           estimated_net_worth, last_trade_date
+    FROM politicians
+    WHERE id = $1
+"""
+
+_COMPANY_SQL = """
+    SELECT id, name, ticker
+    FROM companies
+    WHERE id = $1
+"""
+
+# Companies this person holds, largest first (LIMIT NULL = all). "Largest"
+# is by absolute value throughout the graph: a sold (negative) position is
+# as significant as a held one, and edge weights and tail totals use abs()
+_PERSON_HOLDINGS_SQL = """
+    SELECT h.holding_value, c.id AS company_id, c.name, c.ticker
+    FROM holdings h
+    JOIN companies c ON h.company_id = c.id
+    WHERE h.politician_id = $1
+    ORDER BY abs(h.holding_value) DESC
+    LIMIT $2
+"""
+
+# Politicians holding this company, largest holdings first
+_COMPANY_HOLDERS_SQL = """
+    SELECT p.id, p.name, p.position, p.state, p.party_affiliation,
+           p.estimated_net_worth, p.last_trade_date, h.holding_value
+    FROM holdings h
+    JOIN politicians p ON h.politician_id = p.id
+    WHERE h.company_id = $1
+    ORDER BY abs(h.holding_value) DESC
+    LIMIT $2
+"""
+
 
 async def get_entity_graph(
-    entity_id: str, entity_type: str, db: Connection
+    entity_id: str, entity_type: str, db: Connection, limit: Optional[int] = None
 ) -> Tuple[list, list]:
     """
     Get graph data for an entity - nodes and edges for visualization.
@@ -21,140 +111,431 @@ async def get_entity_graph(
     
     The frontend uses these values to determine edge thickness/weight.
 
+    With `limit`, only the top-k holdings by absolute holding_value are
+    returned; the rest collapse into one aggregate node ("N others, $X
+    total") joined to the center by an edge carrying the tail's total value.
+
     Args:
         entity_id: Entity identifier (integer ID)
         entity_type: 'person' or 'company'
         db: Database connection
+        limit: Keep only the top-k neighbors (None = all)
 
     Returns:
         Tuple of (nodes_rows, edges_rows)
     """
-    nodes = []
+    # Keyed by (type, id): person and company ids come from separate sequences
+    nodes = {}
     edges = []
+    key = int(entity_id) if entity_id.isdigit() else entity_id
 
     if entity_type == "person":
         # Get person details
-        person = await db.fetchrow(
-            """
-            SELECT id, name, position, state, party_affiliation,
-                   estimated_net_worth, last_trade_date
-            FROM politicians
-            WHERE id = $1
-            """,
-            int(entity_id) if entity_id.isdigit() else entity_id,
-        )
-        if person:
-            nodes.append(
-                {
-                    "id": person["id"],
-                    "type": "person",
-                    "name": person["name"],
-                    "position": person["position"],
-                    "state": person["state"],
-                    "party_affiliation": person["party_affiliation"],
-                    "estimated_net_worth": person["estimated_net_worth"],
-                    "last_trade_date": person["last_trade_date"],
-                }
-            )
+        person = await db.fetchrow(_PERSON_SQL, key)
+        if not person:
+            return [], []
+        nodes[("person", person["id"])] = person_node(person)
 
-            # Get holdings (companies this person owns)
-            holdings = await db.fetch(
-                """
-                SELECT h.id, h.holding_value, c.id as company_id, c.name, c.ticker
-                FROM holdings h
-                JOIN companies c ON h.company_id = c.id
-                WHERE h.politician_id = $1
-                """,
-                person["id"],
+        # Get holdings (companies this person owns), largest first
+        holdings = await db.fetch(_PERSON_HOLDINGS_SQL, person["id"], limit)
+        for holding in holdings:
+            node_key = ("company", holding["company_id"])
+            if node_key not in nodes:
+                nodes[node_key] = company_node(holding, id_key="company_id")
+            edges.append(
+                holding_edge(person["id"], holding["company_id"], holding["holding_value"])
             )
 
-            for holding in holdings:
-                # Add company node if not already present
-                if not any(n.get("id") == holding["company_id"] for n in nodes):
-                    nodes.append(
-                        {
-                            "id": holding["company_id"],
-                            "type": "company",
-                            "name": holding["name"],
-                            "ticker": holding["ticker"],
-                        }
-                    )
-                # Add edge from person to company
-                # Positive value = current stock ownership (active)
-                # Negative value = sold position (profit from sale)
-                holding_val = float(holding["holding_value"]) if holding["holding_value"] else 0
-                status = "sold" if holding_val < 0 else "active"
-                
-                edges.append(
-                    {
-                        "source": person["id"],
-                        "target": holding["company_id"],
-                        "edge_type": "stock-holding",
-                        "ownership_value": abs(holding_val) if holding_val else None,
-                        "status": status,
-                    }
-                )
+        if limit is not None and len(holdings) == limit:
+            tail = await _holdings_tail(
+                db, "politician_id", person["id"], len(holdings), _abs_total(holdings)
+            )
+            if tail:
+                count, total = tail
+                nodes[("company", AGGREGATE_NODE_ID)] = aggregate_node("company", count, total)
+                edges.append(aggregate_edge(person["id"], AGGREGATE_NODE_ID, total))
 
     else:  # company
         # Get company details
-        company = await db.fetchrow(
-            """
-            SELECT id, name, ticker
-            FROM companies
-            WHERE id = $1
-            """,
-            int(entity_id) if entity_id.isdigit() else entity_id,
-        )
-        if company:
-            nodes.append(
-                {
-                    "id": company["id"],
-                    "type": "company",
-                    "name": company["name"],
-                    "ticker": company["ticker"],
-                }
-            )
+        company = await db.fetchrow(_COMPANY_SQL, key)
+        if not company:
+            return [], []
+        nodes[("company", company["id"])] = company_node(company)
+
+        # Get politicians who hold this company, largest holdings first
+        politicians = await db.fetch(_COMPANY_HOLDERS_SQL, company["id"], limit)
+        for pol in politicians:
+            node_key = ("person", pol["id"])
+            if node_key not in nodes:
+                nodes[node_key] = person_node(pol)
+            edges.append(holding_edge(pol["id"], company["id"], pol["holding_value"]))
 
-            # Get politicians who hold this company
-            politicians = await db.fetch(
-                """
-                SELECT p.id, p.name, p.position, p.state, p.party_affiliation,
-                       p.estimated_net_worth, p.last_trade_date, h.holding_value
-                FROM holdings h
-                JOIN politicians p ON h.politician_id = p.id
-                WHERE h.company_id = $1
-                """,
-                company["id"],
+        if limit is not None and len(politicians) == limit:
+            tail = await _holdings_tail(
+                db, "company_id", company["id"], len(politicians), _abs_total(politicians)
             )
+            if tail:
+                count, total = tail
+                nodes[("person", AGGREGATE_NODE_ID)] = aggregate_node("person", count, total)
+                edges.append(aggregate_edge(AGGREGATE_NODE_ID, company["id"], total))
+
+    return list(nodes.values()), edges
+
+
+def _abs_total(rows):
+    return sum(abs(r["holding_value"] or 0) for r in rows)
+
+
+async def _holdings_tail(
+    db: Connection, column: str, entity_id: int, shown_count: int, shown_total
+):
+    """
+    Count and total value of holdings beyond the `shown_count` already
+    returned, whose absolute values sum to `shown_total`.
+
+    Returns:
+        (count, total_abs_value) or None if there is no tail
+    """
+    row = await db.fetchrow(
+        f"""
+        SELECT count(*) AS n, coalesce(sum(abs(holding_value)), 0) AS total
+        FROM holdings
+        WHERE {column} = $1
+        """,
+        entity_id,
+    )
+    count = row["n"] - shown_count
+    if count <= 0:
+        return None
+    return count, row["total"] - shown_total
+
 
-            for pol in politicians:
-                if not any(n.get("id") == pol["id"] for n in nodes):
-                    nodes.append(
-                        {
-                            "id": pol["id"],
-                            "type": "person",
-                            "name": pol["name"],
-                            "position": pol["position"],
-                            "state": pol["state"],
-                            "party_affiliation": pol["party_affiliation"],
-                            "estimated_net_worth": pol["estimated_net_worth"],
-                            "last_trade_date": pol["last_trade_date"],
-                        }
-                    )
-                # Edge from person to company (person holds company)
-                # Positive value = current stock ownership (active)
-                # Negative value = sold position (profit from sale)
-                holding_val = float(pol["holding_value"]) if pol["holding_value"] else 0
-                status = "sold" if holding_val < 0 else "active"
-                
-                edges.append(
-                    {
-                        "source": pol["id"],
-                        "target": company["id"],
-                        "edge_type": "stock-holding",
-                        "ownership_value": abs(holding_val) if holding_val else None,
-                        "status": status,
-                    }
+async def stream_entity_graph(
+    entity_id: str,
+    entity_type: str,
+    db: Connection,
+    limit: Optional[int] = None,
+    batch_rows: int = 1000,
+) -> AsyncIterator[Tuple[list, list]]:
+    """
+    Depth-1 graph for an entity, in batches as rows arrive.
+
+    Same nodes and edges as get_entity_graph, but neighbors are read
+    through a server-side cursor `batch_rows` at a time and yielded per
+    batch, so memory stays bounded whatever the entity's degree. The
+    first batch holds only the center node; nothing is yielded for an
+    unknown entity. Runs in its own read-only transaction, which cursors
+    require.
+
+    Args:
+        entity_id: Entity identifier (integer ID)
+        entity_type: 'person' or 'company'
+        db: Database connection, held until the iterator is exhausted
+        limit: Keep only the top-k neighbors (None = all)
+        batch_rows: Rows fetched per round trip
+
+    Yields:
+        Tuples of (nodes_rows, edges_rows)
+    """
+    key = int(entity_id) if entity_id.isdigit() else entity_id
+    async with db.transaction(readonly=True):
+        if entity_type == "person":
+            center = await db.fetchrow(_PERSON_SQL, key)
+            if not center:
+                return
+            yield [person_node(center)], []
+            cursor = await db.cursor(_PERSON_HOLDINGS_SQL, center["id"], limit)
+            column = "politician_id"
+        else:
+            center = await db.fetchrow(_COMPANY_SQL, key)
+            if not center:
+                return
+            yield [company_node(center)], []
+            cursor = await db.cursor(_COMPANY_HOLDERS_SQL, center["id"], limit)
+            column = "company_id"
+
+        shown_count, shown_total = 0, 0
+        while True:
+            rows = await cursor.fetch(batch_rows)
+            if not rows:
+                break
+            shown_count += len(rows)
+            shown_total += _abs_total(rows)
+            # (politician_id, company_id) is unique, so neighbors never repeat
+            if entity_type == "person":
+                yield (
+                    [company_node(r, id_key="company_id") for r in rows],
+                    [holding_edge(center["id"], r["company_id"], r["holding_value"]) for r in rows],
                 )
+            else:
+                yield (
+                    [person_node(r) for r in rows],
+                    [holding_edge(r["id"], center["id"], r["holding_value"]) for r in rows],
+                )
+
+        if limit is not None and shown_count == limit:
+            tail = await _holdings_tail(db, column, center["id"], shown_count, shown_total)
+            if tail:
+                count, total = tail
+                if entity_type == "person":
+                    node = aggregate_node("company", count, total)
+                    edge = aggregate_edge(center["id"], AGGREGATE_NODE_ID, total)
+                else:
+                    node = aggregate_node("person", count, total)
+                    edge = aggregate_edge(AGGREGATE_NODE_ID, center["id"], total)
+                yield [node], [edge]
+
+
+def aggregate_node(node_type: str, count: int, total) -> dict:
+    """Synthetic node summarising the holdings cut off by a top-k limit."""
+    return {
+        "id": AGGREGATE_NODE_ID,
+        "type": node_type,
+        "name": f"{count} other{'s' if count != 1 else ''}, ${total:,.0f} total",
+        "aggregated_count": count,
+    }
+
+
+def aggregate_edge(source: int, target: int, total) -> dict:
+    """Edge between the center and the aggregate node."""
+    return {
+        "source": source,
+        "target": target,
+        "edge_type": "stock-holding",
+        "ownership_value": _money(total) if total else None,
+        "status": "active",
+        "label": "aggregate",
+    }
+
+
+async def get_entity_graph_multi_hop(
+    entity_id: str,
+    entity_type: str,
+    db: Connection,
+    depth: int,
+    max_nodes: int,
+    max_edges: int,
+    fanout: int,
+) -> Tuple[list, list]:
+    """
+    Get the graph within `depth` hops of an entity in a single query.
+
+    A recursive CTE walks the bipartite holdings graph breadth-first,
+    following at most `fanout` edges (largest absolute holding_value first)
+    out of each node per hop. Nodes are kept closest-first up to `max_nodes`, and
+    the `max_edges` largest holdings among them are returned.
+
+    Args:
+        entity_id: Entity identifier (integer ID)
+        entity_type: 'person' or 'company'
+        db: Database connection
+        depth: Number of hops (1-3)
+        max_nodes: Node cap (center included)
+        max_edges: Edge cap
+        fanout: Edges followed per node per hop
+
+    Returns:
+        Tuple of (nodes_rows, edges_rows) in the same shape as get_entity_graph,
+        center node first
+    """
+    rows = await db.fetch(
+        """
+        WITH RECURSIVE walk(kind, id, depth) AS (
+            SELECT $2::text, $1::bigint, 0
+            UNION
+            SELECT n.kind, n.id, w.depth + 1
+            FROM walk w
+            CROSS JOIN LATERAL (
+                (SELECT 'company'::text AS kind, h.company_id AS id
+                 FROM holdings h
+                 WHERE w.kind = 'person' AND h.politician_id = w.id
+                 ORDER BY abs(h.holding_value) DESC
+                 LIMIT $4)
+                UNION ALL
+                (SELECT 'person'::text, h.politician_id
+                 FROM holdings h
+                 WHERE w.kind = 'company' AND h.company_id = w.id
+                 ORDER BY abs(h.holding_value) DESC
+                 LIMIT $4)
+            ) n
+            WHERE w.depth < $3
+        ),
+        kept AS (
+            SELECT kind, id, min(depth) AS depth
+            FROM walk
+            GROUP BY kind, id
+            ORDER BY min(depth), id
+            LIMIT $5
+        ),
+        node_rows AS (
+            SELECT 'node' AS row_kind, k.depth, p.id, 'person' AS type, p.name,
+                   p.position, p.state, p.party_affiliation,
+                   p.estimated_net_worth, p.last_trade_date, NULL::varchar AS ticker,
+                   NULL::bigint AS source, NULL::bigint AS target,
+                   NULL::numeric AS holding_value
+            FROM kept k JOIN politicians p ON k.kind = 'person' AND p.id = k.id
+            UNION ALL
+            SELECT 'node', k.depth, c.id, 'company', c.name,
+                   NULL, NULL, NULL, NULL, NULL, c.ticker,
+                   NULL, NULL, NULL
+            FROM kept k JOIN companies c ON k.kind = 'company' AND c.id = k.id
+        ),
+        edge_rows AS (
+            SELECT 'edge' AS row_kind, NULL::int AS depth, NULL::bigint AS id,
+                   NULL AS type, NULL AS name, NULL AS position, NULL AS state,
+                   NULL AS party_affiliation, NULL::numeric AS estimated_net_worth,
+                   NULL::date AS last_trade_date, NULL AS ticker,
+                   h.politician_id, h.company_id, h.holding_value
+            FROM holdings h
+            JOIN kept kp ON kp.kind = 'person' AND kp.id = h.politician_id
+            JOIN kept kc ON kc.kind = 'company' AND kc.id = h.company_id
+            ORDER BY abs(h.holding_value) DESC
+            LIMIT $6
+        )
+        SELECT *
+        FROM (SELECT * FROM node_rows UNION ALL SELECT * FROM edge_rows) r
+        -- Nodes first (closest first, center at depth 0), then edges by value
+        ORDER BY row_kind DESC, depth, id, abs(holding_value) DESC
+        """,
+        int(entity_id) if entity_id.isdigit() else entity_id,
+        entity_type,
+        depth,
+        fanout,
+        max_nodes,
+        max_edges,
+    )
+
+    nodes = []
+    edges = []
+    for row in rows:
+        if row["row_kind"] == "node":
+            if row["type"] == "person":
+                nodes.append(person_node(row))
+            else:
+                nodes.append(company_node(row))
+        else:
+            edges.append(holding_edge(row["source"], row["target"], row["holding_value"]))
 
     return nodes, edges
+
+
+# JSON node/edge builders for get_entity_graph_json. Keys and value formats
+# follow GraphNode/GraphEdge as FastAPI renders them (Decimals as strings).
+_PERSON_NODE_JSON = """json_build_object(
+    'id', {a}.id, 'type', 'person', 'name', {a}.name,
+    'position', {a}.position, 'state', {a}.state,
+    'party_affiliation', {a}.party_affiliation,
+    'estimated_net_worth', {a}.estimated_net_worth::text,
+    'last_trade_date', {a}.last_trade_date,
+    'ticker', NULL, 'aggregated_count', NULL)"""
+
+_COMPANY_NODE_JSON = """json_build_object(
+    'id', {a}.id, 'type', 'company', 'name', {a}.name,
+    'position', NULL, 'state', NULL, 'party_affiliation', NULL,
+    'estimated_net_worth', NULL, 'last_trade_date', NULL,
+    'ticker', {a}.ticker, 'aggregated_count', NULL)"""
+
+_EDGE_JSON = """json_build_object(
+    'source', {source}, 'target', {target}, 'type', 'stock-holding',
+    'holding_value', CASE WHEN {value} <> 0 THEN abs({value})::text END,
+    'label', {label},
+    'status', CASE WHEN {value} < 0 THEN 'sold' ELSE 'active' END)"""
+
+
+# Python's format(total, ",.0f") rounds half to even; round() in SQL doesn't
+_HALF_EVEN = "(round({x}) - CASE WHEN {x} % 1 = 0.5 AND trunc({x}) % 2 = 0 THEN 1 ELSE 0 END)"
+
+
+def _graph_json_sql(center_type: str) -> str:
+    """One statement that renders the whole depth-1 GraphResponse."""
+    if center_type == "person":
+        center_table, other_table = "politicians", "companies"
+        center_fk, other_fk, other_type = "politician_id", "company_id", "company"
+        center_node, other_node = _PERSON_NODE_JSON, _COMPANY_NODE_JSON
+        edge = _EDGE_JSON.format(source="c.id", target="t.id", value="t.holding_value", label="'stock-holding'")
+        aggregate_edge = _EDGE_JSON.format(source="c.id", target=AGGREGATE_NODE_ID, value="tail.total", label="'aggregate'")
+    else:
+        center_table, other_table = "companies", "politicians"
+        center_fk, other_fk, other_type = "company_id", "politician_id", "person"
+        center_node, other_node = _COMPANY_NODE_JSON, _PERSON_NODE_JSON
+        edge = _EDGE_JSON.format(source="t.id", target="c.id", value="t.holding_value", label="'stock-holding'")
+        aggregate_edge = _EDGE_JSON.format(source=AGGREGATE_NODE_ID, target="c.id", value="tail.total", label="'aggregate'")
+
+    return f"""
+    WITH top AS (
+        SELECT n.*, h.holding_value,
+               row_number() OVER (ORDER BY abs(h.holding_value) DESC) AS rank
+        FROM holdings h
+        JOIN {other_table} n ON n.id = h.{other_fk}
+        WHERE h.{center_fk} = $1
+        ORDER BY rank
+        LIMIT $2
+    ),
+    tail AS (
+        SELECT count(*) - (SELECT count(*) FROM top) AS n,
+               coalesce(sum(abs(h.holding_value)), 0)
+                 - (SELECT coalesce(sum(abs(holding_value)), 0) FROM top) AS total
+        FROM holdings h
+        WHERE h.{center_fk} = $1 AND $2::bigint IS NOT NULL
+    )
+    SELECT json_build_object(
+        'center_id', c.id,
+        'center_type', '{center_type}',
+        'nodes', (
+            SELECT json_agg(node ORDER BY ord)
+            FROM (
+                SELECT 0::bigint AS ord, {center_node.format(a="c")} AS node
+                UNION ALL
+                SELECT t.rank, {other_node.format(a="t")} FROM top t
+                UNION ALL
+                SELECT 9223372036854775807, json_build_object(
+                    'id', {AGGREGATE_NODE_ID}, 'type', '{other_type}',
+                    'name', tail.n || ' other' || CASE WHEN tail.n = 1 THEN '' ELSE 's' END
+                            || ', $' || to_char({_HALF_EVEN.format(x="tail.total")}, 'FM999,999,999,999,999,990')
+                            || ' total',
+                    'position', NULL, 'state', NULL, 'party_affiliation', NULL,
+                    'estimated_net_worth', NULL, 'last_trade_date', NULL,
+                    'ticker', NULL, 'aggregated_count', tail.n)
+                FROM tail WHERE tail.n > 0
+            ) nodes
+        ),
+        'edges', coalesce((
+            SELECT json_agg(edge ORDER BY ord)
+            FROM (
+                SELECT t.rank AS ord, {edge} AS edge FROM top t
+                UNION ALL
+                SELECT 9223372036854775807, {aggregate_edge}
+                FROM tail WHERE tail.n > 0
+            ) edges
+        ), '[]'::json)
+    )::text
+    FROM {center_table} c
+    WHERE c.id = $1
+    """
+
+
+_GRAPH_JSON_SQL = {t: _graph_json_sql(t) for t in ("person", "company")}
+
+
+async def get_entity_graph_json(
+    entity_id: str, entity_type: str, db: Connection, limit: Optional[int] = None
+) -> Optional[str]:
+    """
+    Depth-1 graph rendered by Postgres as the final GraphResponse JSON.
+
+    Same nodes, edges and aggregate tail as get_entity_graph, but built
+    with json_build_object/json_agg in one statement, so no rows are
+    decoded, copied into dicts, validated or re-encoded in Python.
+
+    Args:
+        entity_id: Entity identifier (integer ID)
+        entity_type: 'person' or 'company'
+        db: Database connection
+        limit: Keep only the top-k neighbors (None = all)
+
+    Returns:
+        JSON text, or None if the entity does not exist
+    """
+    if not entity_id.isdigit():
+        return None
+    return await db.fetchval(_GRAPH_JSON_SQL[entity_type], int(entity_id), limit)
@@ -0,0 +1,636 @@
+"""In-memory graph snapshot engine.
+
+Holds politicians, companies and holdings in compact array-backed form so
+/api/graph, /api/person and /api/company can be served without touching
+Postgres (GRAPH_ENGINE=memory).
+
+Layout:
+- Nodes are addressed by dense index (position in the id-sorted id array).
+  Ids map to indexes by binary search, so there is no per-node dict.
+- Adjacency is CSR in both directions (person -> companies and
+  company -> persons). Each node's neighbor run is pre-sorted by
+  abs(holding_value) DESC, so top-k is a prefix of the run.
+- Person position/state/party are interned into one string table and
+  stored as uint16 codes; money is int64 cents; dates are int32 ordinals.
+
+Memory: each holding is stored once per direction as a 4-byte neighbor
+index plus 8-byte cents, i.e. 24 bytes per holding; 10M holdings take
+~240 MB of adjacency. Each node adds 8 bytes of CSR offset plus 8 bytes
+of id. Persons add 18 bytes of attributes; names and tickers are str
+objects (or UTF-8 bytes decoded on access when memory-mapped).
+
+The snapshot is rebuilt every GRAPH_SNAPSHOT_REFRESH_SECONDS, or shortly
+after a `graph_changed` NOTIFY (see schema.sql). Each rebuild swaps the
+module-level reference, so requests see either the old or the new graph,
+never a mix.
+
+With GRAPH_SNAPSHOT_PATH set, uvicorn workers share one copy instead of
+holding one each: a single worker (chosen by a flock on PATH.lock), or
+build_graph_snapshot.py, writes the arrays to a file and renames it into
+place, and every worker mmaps the current file read-only. Opening a
+mapped snapshot only parses its header, so a fresh worker starts in
+milliseconds and its pages come from the shared page cache.
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from array import array
+from bisect import bisect_left
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, List, Optional, Tuple
+import asyncpg
+from src.core.config import settings
+from src.db.pool import get_pool
+from src.services.graph_service import (
+    aggregate_edge,
+    aggregate_node,
+    company_node,
+    holding_edge,
+    person_node,
+)
+from src.utils.mapped_file import (
+    file_version,
+    mapped_string_column,
+    open_columns,
+    release_build_lock,
+    string_columns,
+    try_build_lock,
+    write_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "graph_changed"
+SNAPSHOT_MAGIC = b"GRAPHSN1"
+SNAPSHOT_FILE_VERSION = 1
+_FETCH_BATCH = 50_000
+
+
+class _CsrBuilder:
+    """Accumulates (src, dst, value) rows, already sorted by src, into CSR arrays."""
+
+    def __init__(self, n_src: int):
+        self.offsets = array("q", bytes(8 * (n_src + 1)))
+        self.adj = array("i")
+        self.vals = array("q")
+
+    def extend(self, rows: Iterable[Tuple[int, int, int]]):
+        offsets, adj, vals = self.offsets, self.adj, self.vals
+        for src, dst, cents in rows:
+            offsets[src + 1] += 1
+            adj.append(dst)
+            vals.append(cents)
+
+    def finish(self) -> Tuple[array, array, array]:
+        offsets = self.offsets
+        for i in range(1, len(offsets)):
+            offsets[i] += offsets[i - 1]
+        return offsets, self.adj, self.vals
+
+
+class GraphSnapshot:
+    """Immutable, array-backed copy of the holdings graph."""
+
+    def __init__(self):
+        # Interned position/state/party strings, addressed by uint16 code
+        self.strings: List[Optional[str]] = []
+        self._string_codes = {}
+
+        self.person_ids = array("q")
+        self.person_names: List[str] = []
+        self.person_position = array("H")
+        self.person_state = array("H")
+        self.person_party = array("H")
+        self.person_net_worth = array("q")  # cents
+        self.person_last_trade = array("i")  # date ordinal, 0 = NULL
+
+        self.company_ids = array("q")
+        self.company_names: List[str] = []
+        self.company_tickers: List[str] = []
+
+        # CSR adjacency; *_adj holds dense indexes of the other node type
+        self.person_offsets = array("q", [0])
+        self.person_adj = array("i")
+        self.person_vals = array("q")  # cents, signed (negative = sold)
+        self.company_offsets = array("q", [0])
+        self.company_adj = array("i")
+        self.company_vals = array("q")
+
+        self.built_at = 0.0
+        self.build_seconds = 0.0
+        # Set when the columns are views over a memory-mapped file
+        self.mapped_path: Optional[str] = None
+        self._mapping = None
+
+    # -- building ---------------------------------------------------------
+
+    def _intern(self, value: Optional[str]) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def add_person(self, person_id, name, position, state, party, net_worth_cents, last_trade):
+        """Append a politician; must be called in ascending id order."""
+        self.person_ids.append(person_id)
+        self.person_names.append(name)
+        self.person_position.append(self._intern(position))
+        self.person_state.append(self._intern(state))
+        self.person_party.append(self._intern(party))
+        self.person_net_worth.append(net_worth_cents or 0)
+        self.person_last_trade.append(last_trade.toordinal() if last_trade else 0)
+
+    def add_company(self, company_id, name, ticker):
+        """Append a company; must be called in ascending id order."""
+        self.company_ids.append(company_id)
+        self.company_names.append(name)
+        self.company_tickers.append(ticker)
+
+    # -- lookups ----------------------------------------------------------
+
+    @property
+    def holdings_count(self) -> int:
+        return len(self.person_adj)
+
+    def person_index(self, person_id: int) -> Optional[int]:
+        i = bisect_left(self.person_ids, person_id)
+        if i < len(self.person_ids) and self.person_ids[i] == person_id:
+            return i
+        return None
+
+    def company_index(self, company_id: int) -> Optional[int]:
+        i = bisect_left(self.company_ids, company_id)
+        if i < len(self.company_ids) and self.company_ids[i] == company_id:
+            return i
+        return None
+
+    def person_row(self, i: int) -> dict:
+        """Politician at dense index i, shaped like a politicians row."""
+        last_trade = self.person_last_trade[i]
+        return {
+            "id": self.person_ids[i],
+            "name": self.person_names[i],
+            "position": self.strings[self.person_position[i]],
+            "state": self.strings[self.person_state[i]],
+            "party_affiliation": self.strings[self.person_party[i]],
+            "estimated_net_worth": Decimal(self.person_net_worth[i]).scaleb(-2),
+            "last_trade_date": date.fromordinal(last_trade) if last_trade else None,
+        }
+
+    def company_row(self, i: int) -> dict:
+        """Company at dense index i, shaped like a companies row."""
+        return {
+            "id": self.company_ids[i],
+            "name": self.company_names[i],
+            "ticker": self.company_tickers[i],
+        }
+
+    def iter_holdings(self) -> Iterable[Tuple[int, int, int]]:
+        """(politician id, company id, holding value in cents) for every holding."""
+        offsets, adj, vals = self.person_offsets, self.person_adj, self.person_vals
+        company_ids = self.company_ids
+        for i, person_id in enumerate(self.person_ids):
+            for k in range(offsets[i], offsets[i + 1]):
+                yield person_id, company_ids[adj[k]], vals[k]
+
+    def get_person(self, person_id: int) -> Optional[dict]:
+        i = self.person_index(person_id)
+        return None if i is None else self.person_row(i)
+
+    def get_company(self, company_id: int) -> Optional[dict]:
+        i = self.company_index(company_id)
+        return None if i is None else self.company_row(i)
+
+    def neighbors(self, kind: str, entity_id: int) -> List[Tuple[int, float]]:
+        """(neighbor id, holding_value) pairs for an entity, largest first."""
+        i = self._index(kind, entity_id)
+        if i is None:
+            return []
+        other = "company" if kind == "person" else "person"
+        offsets, adj, vals = self._csr(kind)
+        return [
+            (self._id(other, adj[k]), vals[k] / 100)
+            for k in range(offsets[i], offsets[i + 1])
+        ]
+
+    def _csr(self, kind: str):
+        if kind == "person":
+            return self.person_offsets, self.person_adj, self.person_vals
+        return self.company_offsets, self.company_adj, self.company_vals
+
+    def _node(self, kind: str, i: int) -> dict:
+        if kind == "person":
+            return person_node(self.person_row(i))
+        return company_node(self.company_row(i))
+
+    def _id(self, kind: str, i: int) -> int:
+        return self.person_ids[i] if kind == "person" else self.company_ids[i]
+
+    def _index(self, kind: str, entity_id: int) -> Optional[int]:
+        if kind == "person":
+            return self.person_index(entity_id)
+        return self.company_index(entity_id)
+
+    # -- graph queries ----------------------------------------------------
+
+    def entity_graph(
+        self, entity_id: int, entity_type: str, limit: Optional[int] = None
+    ) -> Tuple[list, list]:
+        """Same result as graph_service.get_entity_graph, from memory."""
+        i = self._index(entity_type, entity_id)
+        if i is None:
+            return [], []
+        other = "company" if entity_type == "person" else "person"
+        offsets, adj, vals = self._csr(entity_type)
+        start, end = offsets[i], offsets[i + 1]
+        stop = end if limit is None else min(end, start + limit)
+
+        center_id = self._id(entity_type, i)
+        nodes = [self._node(entity_type, i)]
+        edges = []
+        for k in range(start, stop):
+            j = adj[k]
+            nodes.append(self._node(other, j))
+            neighbor_id = self._id(other, j)
+            if entity_type == "person":
+                edges.append(holding_edge(center_id, neighbor_id, Decimal(vals[k]).scaleb(-2)))
+            else:
+                edges.append(holding_edge(neighbor_id, center_id, Decimal(vals[k]).scaleb(-2)))
+
+        if stop < end:
+            count = end - stop
+            total = Decimal(sum(abs(v) for v in vals[stop:end])).scaleb(-2)
+            nodes.append(aggregate_node(other, count, total))
+            if entity_type == "person":
+                edges.append(aggregate_edge(center_id, nodes[-1]["id"], total))
+            else:
+                edges.append(aggregate_edge(nodes[-1]["id"], center_id, total))
+        return nodes, edges
+
+    def entity_graph_multi_hop(
+        self,
+        entity_id: int,
+        entity_type: str,
+        depth: int,
+        max_nodes: int,
+        max_edges: int,
+        fanout: int,
+    ) -> Tuple[list, list]:
+        """Same result as graph_service.get_entity_graph_multi_hop, from memory."""
+        i = self._index(entity_type, entity_id)
+        if i is None:
+            return [], []
+
+        depth_of = {(entity_type, i): 0}
+        frontier = [(entity_type, i)]
+        for d in range(1, depth + 1):
+            next_frontier = []
+            for kind, idx in frontier:
+                other = "company" if kind == "person" else "person"
+                offsets, adj, _ = self._csr(kind)
+                start = offsets[idx]
+                for k in range(start, min(offsets[idx + 1], start + fanout)):
+                    key = (other, adj[k])
+                    if key not in depth_of:
+                        depth_of[key] = d
+                        next_frontier.append(key)
+            frontier = next_frontier
+
+        kept = sorted(depth_of, key=lambda key: (depth_of[key], self._id(*key)))[:max_nodes]
+        kept_set = set(kept)
+
+        # Scan the adjacency of whichever side has fewer total edges
+        degree = {"person": 0, "company": 0}
+        for kind, idx in kept:
+            offsets = self.person_offsets if kind == "person" else self.company_offsets
+            degree[kind] += offsets[idx + 1] - offsets[idx]
+        scan = "person" if degree["person"] <= degree["company"] else "company"
+        other = "company" if scan == "person" else "person"
+        offsets, adj, vals = self._csr(scan)
+
+        candidates = []
+        for kind, idx in kept:
+            if kind != scan:
+                continue
+            for k in range(offsets[idx], offsets[idx + 1]):
+                j = adj[k]
+                if (other, j) in kept_set:
+                    if scan == "person":
+                        candidates.append((vals[k], idx, j))
+                    else:
+                        candidates.append((vals[k], j, idx))
+        top = heapq.nlargest(max_edges, candidates, key=lambda t: abs(t[0]))
+
+        nodes = [self._node(kind, idx) for kind, idx in kept]
+        edges = [
+            holding_edge(self.person_ids[p], self.company_ids[c], Decimal(cents).scaleb(-2))
+            for cents, p, c in top
+        ]
+        return nodes, edges
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the fixed-width arrays (excludes name/ticker strings)."""
+        return sum(
+            getattr(self, name).itemsize * len(getattr(self, name))
+            for name in _ARRAY_COLUMNS
+        )
+
+    # -- shared file format -----------------------------------------------
+
+    def write(self, path: str):
+        """
+        Write the snapshot as a file that open() can memory-map.
+
+        See src/utils/mapped_file.py for the layout. The file is replaced
+        atomically, so readers see either the old or the new snapshot.
+        """
+        columns = [(name, getattr(self, name)) for name in _ARRAY_COLUMNS]
+        for name in _STRING_COLUMNS:
+            columns.extend(string_columns(name, getattr(self, name)))
+        write_columns(
+            path,
+            SNAPSHOT_MAGIC,
+            {
+                "version": SNAPSHOT_FILE_VERSION,
+                "built_at": self.built_at,
+                "build_seconds": self.build_seconds,
+                "strings": self.strings,
+            },
+            columns,
+        )
+
+    @classmethod
+    def open(cls, path: str) -> "GraphSnapshot":
+        """
+        Memory-map a file written by write(), read-only and zero-copy.
+
+        Columns become memoryviews over the mapping, so the pages are
+        shared by every process that maps the same file and opening only
+        parses the header.
+        """
+        header, columns, mapped = open_columns(
+            path, SNAPSHOT_MAGIC, SNAPSHOT_FILE_VERSION, "graph snapshot"
+        )
+        snap = cls()
+        snap.strings = header["strings"]
+        for name in _ARRAY_COLUMNS:
+            setattr(snap, name, columns[name])
+        for name in _STRING_COLUMNS:
+            setattr(snap, name, mapped_string_column(columns, name))
+        snap.built_at = header["built_at"]
+        snap.build_seconds = header["build_seconds"]
+        snap.mapped_path = path
+        snap._mapping = mapped
+        return snap
+
+
+# Fixed-width columns, in file order
+_ARRAY_COLUMNS = [
+    "person_ids", "person_position", "person_state", "person_party",
+    "person_net_worth", "person_last_trade", "company_ids",
+    "person_offsets", "person_adj", "person_vals",
+    "company_offsets", "company_adj", "company_vals",
+]
+_STRING_COLUMNS = ["person_names", "company_names", "company_tickers"]
+
+
+async def build_graph_snapshot(conn) -> GraphSnapshot:
+    """
+    Read the full graph from Postgres into a new snapshot.
+
+    Runs in one REPEATABLE READ read-only transaction so the three tables
+    are mutually consistent. Holdings are streamed through a cursor twice,
+    once ordered for each CSR direction, so neither pass sorts in Python.
+    """
+    started = time.perf_counter()
+    snap = GraphSnapshot()
+    async with conn.transaction(isolation="repeatable_read", readonly=True):
+        for row in await conn.fetch(
+            """
+            SELECT id, name, position, state, party_affiliation,
+                   (estimated_net_worth * 100)::bigint AS net_worth_cents,
+                   last_trade_date
+            FROM politicians
+            ORDER BY id
+            """
+        ):
+            snap.add_person(
+                row["id"], row["name"], row["position"], row["state"],
+                row["party_affiliation"], row["net_worth_cents"], row["last_trade_date"],
+            )
+        for row in await conn.fetch("SELECT id, name, ticker FROM companies ORDER BY id"):
+            snap.add_company(row["id"], row["name"], row["ticker"])
+
+        for kind, n_src in (("person", len(snap.person_ids)), ("company", len(snap.company_ids))):
+            src, dst = ("p", "c") if kind == "person" else ("c", "p")
+            builder = _CsrBuilder(n_src)
+            cursor = await conn.cursor(
+                f"""
+                SELECT {src}.idx, {dst}.idx, (h.holding_value * 100)::bigint
+                FROM holdings h
+                JOIN (SELECT id, (row_number() OVER (ORDER BY id) - 1)::int AS idx
+                      FROM politicians) p ON p.id = h.politician_id
+                JOIN (SELECT id, (row_number() OVER (ORDER BY id) - 1)::int AS idx
+                      FROM companies) c ON c.id = h.company_id
+                ORDER BY {src}.idx, abs(h.holding_value) DESC
+                """
+            )
+            while True:
+                batch = await cursor.fetch(_FETCH_BATCH)
+                if not batch:
+                    break
+                builder.extend(batch)
+            offsets, adj, vals = builder.finish()
+            if kind == "person":
+                snap.person_offsets, snap.person_adj, snap.person_vals = offsets, adj, vals
+            else:
+                snap.company_offsets, snap.company_adj, snap.company_vals = offsets, adj, vals
+
+    snap.built_at = time.time()
+    snap.build_seconds = time.perf_counter() - started
+    return snap
+
+
+_snapshot: Optional[GraphSnapshot] = None
+_snapshot_file_version = None  # (inode, mtime_ns) of the mapped file
+_changed = asyncio.Event()
+_rebuild_requested_at: Optional[float] = None
+_refresh_task: Optional[asyncio.Task] = None
+_listen_conn = None
+
+
+def get_graph_snapshot() -> Optional[GraphSnapshot]:
+    """The current snapshot, or None when the memory engine is off or not loaded."""
+    return _snapshot
+
+
+def _map_snapshot_file(path: str):
+    """Swap in the snapshot file at path (mmap, no table load)."""
+    global _snapshot, _snapshot_file_version
+    version = file_version(path)
+    _snapshot = GraphSnapshot.open(path)
+    _snapshot_file_version = version
+    logger.info(f"Graph snapshot mapped from {path}")
+
+
+async def refresh_graph_snapshot():
+    """
+    Build a fresh snapshot from Postgres and swap it in.
+
+    With GRAPH_SNAPSHOT_PATH set the snapshot is written to that file and
+    mapped from there, so this worker shares pages with the others.
+    """
+    global _snapshot
+    async with get_pool().acquire() as conn:
+        snap = await build_graph_snapshot(conn)
+    logger.info(
+        f"Graph snapshot built in {snap.build_seconds:.2f}s: "
+        f"{len(snap.person_ids)} politicians, {len(snap.company_ids)} companies, "
+        f"{snap.holdings_count} holdings, {snap.memory_bytes() / 1e6:.1f} MB arrays"
+    )
+    path = settings.GRAPH_SNAPSHOT_PATH
+    if path:
+        await asyncio.to_thread(snap.write, path)
+        _map_snapshot_file(path)
+    else:
+        _snapshot = snap
+
+
+def _needs_rebuild(path: str) -> bool:
+    version = file_version(path)
+    if version is None:
+        return True
+    written_at = version[1] / 1e9
+    if _rebuild_requested_at is not None and written_at < _rebuild_requested_at:
+        return True
+    return time.time() - written_at >= settings.GRAPH_SNAPSHOT_REFRESH_SECONDS
+
+
+async def _sync_shared_snapshot(path: str):
+    """
+    Rebuild the shared file if it is stale and no other worker is already
+    doing so, then map whatever version is current.
+    """
+    global _rebuild_requested_at
+    if settings.GRAPH_SNAPSHOT_BUILD and _needs_rebuild(path):
+        fd = try_build_lock(path)
+        if fd is not None:
+            try:
+                # Another worker may have finished a rebuild while we checked
+                if _needs_rebuild(path):
+                    await refresh_graph_snapshot()
+                _rebuild_requested_at = None
+            finally:
+                release_build_lock(fd)
+    if file_version(path) not in (None, _snapshot_file_version):
+        _map_snapshot_file(path)
+
+
+async def _load_shared_snapshot(path: str):
+    """Map an existing file, or build it once while other workers wait."""
+    while True:
+        if os.path.exists(path):
+            _map_snapshot_file(path)
+            return
+        if not settings.GRAPH_SNAPSHOT_BUILD:
+            logger.info(f"Waiting for an external builder to write {path}")
+            return
+        fd = try_build_lock(path)
+        if fd is not None:
+            try:
+                if os.path.exists(path):
+                    _map_snapshot_file(path)
+                else:
+                    await refresh_graph_snapshot()
+            finally:
+                release_build_lock(fd)
+            return
+        await asyncio.sleep(0.1)
+
+
+def _on_notify(conn, pid, channel, payload):
+    global _rebuild_requested_at
+    if _rebuild_requested_at is None:
+        _rebuild_requested_at = time.time()
+    _changed.set()
+
+
+async def _refresh_loop():
+    path = settings.GRAPH_SNAPSHOT_PATH
+    # With a shared file, poll often: checking for a new version is one stat()
+    interval = settings.GRAPH_SNAPSHOT_POLL_SECONDS if path else settings.GRAPH_SNAPSHOT_REFRESH_SECONDS
+    while True:
+        try:
+            await asyncio.wait_for(_changed.wait(), timeout=interval)
+            # Coalesce a burst of writes into one rebuild
+            await asyncio.sleep(settings.GRAPH_SNAPSHOT_NOTIFY_DEBOUNCE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _changed.clear()
+        try:
+            if path:
+                await _sync_shared_snapshot(path)
+            else:
+                await refresh_graph_snapshot()
+        except Exception as e:
+            logger.warning(f"Graph snapshot refresh failed, keeping previous: {e}")
+
+
+async def start_graph_engine():
+    """Load the snapshot and start refreshing it, if GRAPH_ENGINE=memory."""
+    global _refresh_task, _listen_conn
+    if settings.GRAPH_ENGINE != "memory":
+        return
+    try:
+        if settings.GRAPH_SNAPSHOT_PATH:
+            await _load_shared_snapshot(settings.GRAPH_SNAPSHOT_PATH)
+        else:
+            await refresh_graph_snapshot()
+    except Exception as e:
+        # Routers fall back to Postgres while there is no snapshot
+        logger.warning(f"Graph snapshot initial load failed: {e}")
+    if settings.GRAPH_SNAPSHOT_LISTEN:
+        try:
+            _listen_conn = await asyncpg.connect(settings.DATABASE_URL)
+            await _listen_conn.add_listener(NOTIFY_CHANNEL, _on_notify)
+        except Exception as e:
+            logger.warning(f"LISTEN {NOTIFY_CHANNEL} unavailable, refreshing on schedule only: {e}")
+            _listen_conn = None
+    _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+async def stop_graph_engine():
+    """Stop refreshing and drop the LISTEN connection."""
+    global _refresh_task, _listen_conn
+    if _refresh_task:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+    if _listen_conn:
+        await _listen_conn.close()
+        _listen_conn = None
+
+
+def get_graph_engine_metrics() -> dict:
+    """Engine mode and size of the loaded snapshot."""
+    snap = _snapshot
+    return {
+        "engine": settings.GRAPH_ENGINE,
+        "loaded": snap is not None,
+        "mapped_path": snap.mapped_path if snap else None,
+        "politicians": len(snap.person_ids) if snap else 0,
+        "companies": len(snap.company_ids) if snap else 0,
+        "holdings": snap.holdings_count if snap else 0,
+        "array_bytes": snap.memory_bytes() if snap else 0,
+        "built_at": snap.built_at if snap else None,
+        "build_seconds": round(snap.build_seconds, 3) if snap else None,
+        "listening": _listen_conn is not None,
+    }
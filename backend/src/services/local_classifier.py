@@ -0,0 +1,122 @@
+"""In-process learned classifier trained on the entity tables.
+
+Sits between the classification cache and Claude: confident predictions
+(>= LOCAL_CLASSIFIER_MIN_CONFIDENCE) are returned directly, everything
+else still goes to Claude/heuristics.
+"""
+
+import asyncio
+import logging
+import os
+from typing import List, Optional, Tuple
+from src.core.config import settings
+from src.db.pool import get_pool
+from src.utils.ngram_classifier import NgramNaiveBayes
+
+logger = logging.getLogger(__name__)
+
+_model: Optional[NgramNaiveBayes] = None
+_stats = {"confident": 0, "deferred": 0}
+
+
+def build_training_set(politicians, companies) -> Tuple[List[str], List[str]]:
+    """
+    Labelled examples from entity rows.
+
+    Politicians contribute their full name and surname (searches are often
+    just "Pelosi"); companies contribute their name and ticker.
+    """
+    texts, labels = [], []
+    for row in politicians:
+        name = row["name"].strip()
+        texts.append(name)
+        labels.append("person")
+        words = name.split()
+        if len(words) > 1:
+            texts.append(words[-1])
+            labels.append("person")
+    for row in companies:
+        texts.append(row["name"].strip())
+        labels.append("company")
+        if row["ticker"]:
+            texts.append(row["ticker"].strip())
+            labels.append("company")
+    return texts, labels
+
+
+async def fetch_training_rows(conn):
+    """Rows needed to train the model."""
+    politicians = await conn.fetch("SELECT name FROM politicians")
+    companies = await conn.fetch("SELECT name, ticker FROM companies")
+    return politicians, companies
+
+
+def train_model(politicians, companies) -> NgramNaiveBayes:
+    """Fit a fresh model on entity rows."""
+    texts, labels = build_training_set(politicians, companies)
+    return NgramNaiveBayes().fit(texts, labels)
+
+
+async def start_local_classifier():
+    """Load the persisted model, or train one from Postgres if configured."""
+    global _model
+    if not settings.LOCAL_CLASSIFIER_ENABLED:
+        return
+    path = settings.LOCAL_CLASSIFIER_PATH
+    try:
+        if path and os.path.exists(path):
+            _model = await asyncio.to_thread(NgramNaiveBayes.load, path)
+            logger.info(f"Local classifier loaded from {path}")
+            return
+        if not settings.LOCAL_CLASSIFIER_TRAIN_ON_STARTUP:
+            return
+        async with get_pool().acquire() as conn:
+            politicians, companies = await fetch_training_rows(conn)
+        if not politicians or not companies:
+            logger.info("Local classifier not trained: entity tables are empty")
+            return
+        _model = await asyncio.to_thread(train_model, politicians, companies)
+        logger.info(
+            f"Local classifier trained on {len(politicians)} politicians, "
+            f"{len(companies)} companies"
+        )
+        if path:
+            await asyncio.to_thread(_model.save, path)
+    except Exception as e:
+        # Classification still works without it, just with more Claude calls
+        logger.warning(f"Local classifier unavailable: {e}")
+
+
+def classify_locally(search_term: str) -> Optional[dict]:
+    """
+    Classify with the local model if it is confident enough.
+
+    Args:
+        search_term: The term to classify
+
+    Returns:
+        dict with 'type', 'confidence', 'reasoning', or None if there is no
+        model or its confidence is below LOCAL_CLASSIFIER_MIN_CONFIDENCE
+    """
+    if _model is None:
+        return None
+    label, prob = _model.predict(search_term)
+    if prob < settings.LOCAL_CLASSIFIER_MIN_CONFIDENCE:
+        _stats["deferred"] += 1
+        return None
+    _stats["confident"] += 1
+    return {
+        "type": label,
+        "confidence": round(prob, 4),
+        "reasoning": "Local n-gram model trained on known entities",
+    }
+
+
+def get_local_classifier_metrics() -> dict:
+    """Whether a model is loaded and how often it was confident."""
+    return {
+        "loaded": _model is not None,
+        "features": len(_model.feature_counts) if _model else 0,
+        "min_confidence": settings.LOCAL_CLASSIFIER_MIN_CONFIDENCE,
+        **_stats,
+    }
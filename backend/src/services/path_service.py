@@ -0,0 +1,270 @@
+"""Shortest connection paths between entities."""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from asyncpg import Connection
+from src.services.graph_service import company_node, holding_edge, person_node
+
+logger = logging.getLogger(__name__)
+
+# (type, id); person and company ids come from separate sequences
+NodeKey = Tuple[str, int]
+Expander = Callable[[List[NodeKey]], Awaitable[Dict[NodeKey, List[Tuple[NodeKey, float]]]]]
+
+
+class FrontierTooLarge(Exception):
+    """The search frontier outgrew the configured cap before the sides met."""
+
+
+async def bidirectional_bfs(
+    source: NodeKey,
+    target: NodeKey,
+    expand: Expander,
+    max_hops: int,
+    weighted: bool = False,
+    max_frontier: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Optional[Tuple[List[NodeKey], List[float]]]:
+    """
+    Shortest path by hop count, searching from both ends.
+
+    Each step expands whichever side has the smaller frontier, so the work
+    is roughly the square root of a one-sided BFS on high-degree graphs.
+
+    With `weighted`, ties between equally short paths go to larger
+    holdings: a newly reached node keeps its strongest parent from the
+    previous level, and the meeting point maximizes the weakest link.
+
+    Args:
+        source: Start node
+        target: End node
+        expand: Async callable mapping frontier nodes to (neighbor, value) lists
+        max_hops: Give up once the two searches have covered this many edges
+        weighted: Prefer larger holdings among shortest paths
+        max_frontier: Raise FrontierTooLarge if a side grows beyond this
+        deadline: time.monotonic() value after which asyncio.TimeoutError is
+            raised between levels
+
+    Returns:
+        (nodes along the path, holding value of each edge), or None if the
+        ends are not connected within max_hops
+    """
+    if source == target:
+        return [source], []
+
+    # node -> (parent, value of the edge to the parent, weakest link so far)
+    forward = {source: (None, None, float("inf"))}
+    backward = {target: (None, None, float("inf"))}
+    forward_frontier, backward_frontier = [source], [target]
+
+    for _ in range(max_hops):
+        if not forward_frontier or not backward_frontier:
+            return None
+        if deadline is not None and time.monotonic() > deadline:
+            raise asyncio.TimeoutError()
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, seen, other = forward_frontier, forward, backward
+        else:
+            frontier, seen, other = backward_frontier, backward, forward
+
+        adjacency = await expand(frontier)
+        reached = {}
+        for node in frontier:
+            strength = seen[node][2]
+            for neighbor, value in adjacency.get(node, ()):
+                if neighbor in seen:
+                    continue
+                link = min(strength, abs(value))
+                current = reached.get(neighbor)
+                if current is None or (weighted and link > current[2]):
+                    reached[neighbor] = (node, value, link)
+        seen.update(reached)
+
+        meetings = [node for node in reached if node in other]
+        if meetings:
+            if weighted:
+                meet = max(meetings, key=lambda n: (min(forward[n][2], backward[n][2]), n))
+            else:
+                meet = min(meetings)
+            return _join(meet, forward, backward)
+
+        next_frontier = list(reached)
+        if max_frontier is not None and len(next_frontier) > max_frontier:
+            raise FrontierTooLarge(f"{len(next_frontier)} nodes at one level")
+        if seen is forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+    return None
+
+
+def _join(meet: NodeKey, forward: dict, backward: dict) -> Tuple[List[NodeKey], List[float]]:
+    """Stitch the two parent chains together at the meeting node."""
+    nodes, values = [meet], []
+    node = meet
+    while forward[node][0] is not None:
+        parent, value, _ = forward[node]
+        nodes.append(parent)
+        values.append(value)
+        node = parent
+    nodes.reverse()
+    values.reverse()
+    node = meet
+    while backward[node][0] is not None:
+        parent, value, _ = backward[node]
+        nodes.append(parent)
+        values.append(value)
+        node = parent
+    return nodes, values
+
+
+def snapshot_expander(snapshot) -> Expander:
+    """Expand frontiers from the in-memory graph snapshot."""
+
+    async def expand(frontier):
+        adjacency = {}
+        for kind, entity_id in frontier:
+            other = "company" if kind == "person" else "person"
+            adjacency[(kind, entity_id)] = [
+                ((other, neighbor_id), value)
+                for neighbor_id, value in snapshot.neighbors(kind, entity_id)
+            ]
+        return adjacency
+
+    return expand
+
+
+def db_expander(db: Connection) -> Expander:
+    """Expand frontiers with one holdings query per BFS level."""
+
+    async def expand(frontier):
+        person_ids = [entity_id for kind, entity_id in frontier if kind == "person"]
+        company_ids = [entity_id for kind, entity_id in frontier if kind == "company"]
+        rows = await db.fetch(
+            """
+            SELECT politician_id, company_id, holding_value
+            FROM holdings
+            WHERE politician_id = ANY($1::bigint[]) OR company_id = ANY($2::bigint[])
+            """,
+            person_ids,
+            company_ids,
+        )
+        wanted = set(frontier)
+        adjacency = {}
+        for row in rows:
+            person = ("person", row["politician_id"])
+            company = ("company", row["company_id"])
+            value = float(row["holding_value"] or 0)
+            if person in wanted:
+                adjacency.setdefault(person, []).append((company, value))
+            if company in wanted:
+                adjacency.setdefault(company, []).append((person, value))
+        return adjacency
+
+    return expand
+
+
+async def _path_nodes_from_db(path: List[NodeKey], db: Connection) -> Optional[list]:
+    person_ids = [entity_id for kind, entity_id in path if kind == "person"]
+    company_ids = [entity_id for kind, entity_id in path if kind == "company"]
+    people = await db.fetch(
+        """
+        SELECT id, name, position, state, party_affiliation,
+               estimated_net_worth, last_trade_date
+        FROM politicians
+        WHERE id = ANY($1::bigint[])
+        """,
+        person_ids,
+    )
+    companies = await db.fetch(
+        "SELECT id, name, ticker FROM companies WHERE id = ANY($1::bigint[])",
+        company_ids,
+    )
+    rows = {("person", r["id"]): person_node(r) for r in people}
+    rows.update({("company", r["id"]): company_node(r) for r in companies})
+    if any(key not in rows for key in path):
+        return None
+    return [rows[key] for key in path]
+
+
+def _path_nodes_from_snapshot(path: List[NodeKey], snapshot) -> Optional[list]:
+    nodes = []
+    for kind, entity_id in path:
+        if kind == "person":
+            row = snapshot.get_person(entity_id)
+        else:
+            row = snapshot.get_company(entity_id)
+        if row is None:
+            return None
+        nodes.append(person_node(row) if kind == "person" else company_node(row))
+    return nodes
+
+
+def _path_edges(path: List[NodeKey], values: List[float]) -> list:
+    edges = []
+    for (kind, entity_id), (_, next_id), value in zip(path, path[1:], values):
+        if kind == "person":
+            edges.append(holding_edge(entity_id, next_id, value))
+        else:
+            edges.append(holding_edge(next_id, entity_id, value))
+    return edges
+
+
+async def find_connection_path(
+    source: NodeKey,
+    target: NodeKey,
+    max_hops: int,
+    time_budget: float,
+    weighted: bool = False,
+    max_frontier: Optional[int] = None,
+    snapshot=None,
+    db: Optional[Connection] = None,
+) -> Optional[Tuple[list, list]]:
+    """
+    Shortest path between two entities as a graph.
+
+    Uses the in-memory snapshot when given one, otherwise Postgres.
+
+    Args:
+        source: (type, id) of the start entity
+        target: (type, id) of the end entity
+        max_hops: Maximum path length in edges
+        time_budget: Seconds before the search is abandoned
+        weighted: Prefer larger holdings among shortest paths
+        max_frontier: Abandon the search if a BFS level exceeds this many nodes
+        snapshot: GraphSnapshot to search, if loaded
+        db: Database connection (used when there is no snapshot)
+
+    Returns:
+        Tuple of (nodes_rows, edges_rows) ordered along the path, or None if
+        no path exists within max_hops or an entity on it does not exist
+        (a path from an entity to itself is just that entity, if it exists)
+
+    Raises:
+        asyncio.TimeoutError: The search exceeded time_budget
+        FrontierTooLarge: A BFS level exceeded max_frontier
+    """
+    started = time.perf_counter()
+    expand = snapshot_expander(snapshot) if snapshot is not None else db_expander(db)
+    # The deadline covers CPU-bound levels on the snapshot; wait_for cancels a slow query
+    found = await asyncio.wait_for(
+        bidirectional_bfs(
+            source, target, expand, max_hops, weighted, max_frontier,
+            deadline=time.monotonic() + time_budget,
+        ),
+        timeout=time_budget,
+    )
+    if found is None:
+        return None
+    path, values = found
+    logger.info(f"Path {source} -> {target}: {len(values)} hops in {time.perf_counter() - started:.3f}s")
+
+    if snapshot is not None:
+        nodes = _path_nodes_from_snapshot(path, snapshot)
+    else:
+        nodes = await _path_nodes_from_db(path, db)
+    if nodes is None:
+        return None
+    return nodes, _path_edges(path, values)
@@ -1,7 +1,9 @@
 """Person service for retrieving politician data."""
 
 import logging
-from asyncpg import Connection
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from asyncpg import Connection, Record
 
 logger = logging.getLogger(__name__)
 
@@ -29,26 +31,66 @@ async def get_person_by_id(person_id: str, db: Connection):
     return row
 
 
-async def get_person_holdings(person_id: str, db: Connection):
+async def get_people_by_ids(person_ids: List[int], db: Connection) -> Dict[int, Record]:
     """
-    Get all holdings for a person.
+    Get metadata for many people in one query.
+
+    Args:
+        person_ids: Person IDs (duplicates allowed)
+        db: Database connection
+
+    Returns:
+        Rows keyed by ID; IDs with no politician are absent
+    """
+    rows = await db.fetch(
+        """
+        SELECT id, name, position, state, party_affiliation,
+               estimated_net_worth, last_trade_date
+        FROM politicians
+        WHERE id = ANY($1::bigint[])
+        """,
+        list(set(person_ids)),
+    )
+    return {row["id"]: row for row in rows}
+
+
+async def get_person_holdings(
+    person_id: str,
+    db: Connection,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[Decimal, int]] = None,
+):
+    """
+    Get a person's holdings, largest first.
+
+    Ordered by (holding_value, holding id) descending, which
+    idx_holdings_pol_value_id serves directly, so a page starting `after`
+    a given row costs the same however deep it is.
 
     Args:
         person_id: Person ID
         db: Database connection
+        limit: Maximum rows to return (None for all)
+        after: (holding_value, holding id) of the last row already seen
 
     Returns:
         List of holdings with company details
     """
+    args = [int(person_id) if person_id.isdigit() else person_id, limit]
+    seek = ""
+    if after is not None:
+        args.extend(after)
+        seek = "AND (h.holding_value, h.id) < ($3, $4)"
     rows = await db.fetch(
-        """
+        f"""
         SELECT h.id, h.politician_id, h.company_id, h.holding_value,
                c.name as company_name, c.ticker
         FROM holdings h
         JOIN companies c ON h.company_id = c.id
-        WHERE h.politician_id = $1
-        ORDER BY h.holding_value DESC NULLS LAST
+        WHERE h.politician_id = $1 {seek}
+        ORDER BY h.holding_value DESC, h.id DESC
+        LIMIT $2
         """,
-        int(person_id) if person_id.isdigit() else person_id,
+        *args,
     )
     return rows
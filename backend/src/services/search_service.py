@@ -1,30 +1,81 @@
 """Search service for resolving entities."""
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 from asyncpg import Connection
+from src.db.pool import get_pool
+from src.services.classification_service import classify_search_term
 
 logger = logging.getLogger(__name__)
 
 
-async def resolve_entity_id_by_search(
-    q: str, db: Connection, entity_type: str
-) -> Optional[dict]:
+def _substring_pattern(q: str) -> str:
+    """ILIKE pattern matching q anywhere in a name, with q's wildcards escaped."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+async def _fuzzy_rows(q: str, db: Connection, table: str, limit: int) -> list:
     """
-    Search for an entity by ticker or name and return its id, type, and name.
+    Best matches in `table` by trigram word similarity.
+
+    `q <% name` only keeps names whose best-matching word scores at least
+    pg_trgm.word_similarity_threshold (0.6 by default), which drops short
+    mid-word fragments like "elos" for "Pelosi" that the old ILIKE search
+    found. If nothing passes, fall back to that substring match; the GIN
+    trigram indexes serve ILIKE as well.
+    """
+    rows = await db.fetch(
+        f"""
+        SELECT id, name, word_similarity($1, name) AS score
+        FROM {table}
+        WHERE $1 <% name
+        ORDER BY score DESC, id
+        LIMIT $2
+        """,
+        q,
+        limit,
+    )
+    if rows:
+        return rows
+    return await db.fetch(
+        f"""
+        SELECT id, name, word_similarity($1, name) AS score
+        FROM {table}
+        WHERE name ILIKE $3
+        ORDER BY score DESC, id
+        LIMIT $2
+        """,
+        q,
+        limit,
+        _substring_pattern(q),
+    )
+
+
+async def search_entity_candidates(
+    q: str, db: Connection, entity_type: str, limit: int = 5
+) -> List[dict]:
+    """
+    Fuzzy-search entities of one type and return the top matches by similarity.
+
+    Uses pg_trgm word similarity (backed by the GIN trigram indexes in
+    schema.sql), so partial names like "Pelosi" still rank "Nancy Pelosi"
+    first. Queries too far from every word of every name fall back to a
+    substring match. An exact ticker match always ranks first with score 1.0.
 
     Args:
         q: Search query
         db: Database connection
         entity_type: 'person' or 'company' from classification
+        limit: Maximum number of candidates
 
     Returns:
-        dict with 'id', 'type', 'name' or None if not found
+        List of dicts with 'id', 'type', 'name', 'score', best first
     """
     logger.info(f"Attempting database search for: '{q}' as type: '{entity_type}'")
-    search_pattern = f"%{q}%"
-    
-    # Search companies table
+    candidates = []
+
     if entity_type == "company":
         # Try exact ticker match
         logger.debug(f"Trying exact ticker match: '{q.upper()}'")
@@ -34,40 +85,245 @@ async def resolve_entity_id_by_search(
         )
         if row:
             logger.info(f"Found company by ticker: {dict(row)}")
-            return {
-                "id": str(row["id"]),
-                "type": "company",
-                "name": row["name"],
-            }
+            candidates.append(
+                {
+                    "id": str(row["id"]),
+                    "type": "company",
+                    "name": row["name"],
+                    "score": 1.0,
+                }
+            )
+            if limit <= 1:
+                return candidates
 
-        # Search for companies by name
-        logger.debug(f"Trying company name search with pattern: '{search_pattern}'")
-        row = await db.fetchrow(
-            "SELECT id, name, ticker FROM companies WHERE name ILIKE $1 LIMIT 1",
-            search_pattern,
-        )
-        if row:
-            logger.info(f"Found company: {dict(row)}")
-            return {
+        logger.debug(f"Trying company trigram search for: '{q}'")
+        rows = await _fuzzy_rows(q, db, "companies", limit)
+
+    elif entity_type == "person":
+        logger.debug(f"Trying politician trigram search for: '{q}'")
+        rows = await _fuzzy_rows(q, db, "politicians", limit)
+
+    else:
+        rows = []
+
+    seen = {c["id"] for c in candidates}
+    for row in rows:
+        if str(row["id"]) in seen:
+            continue
+        candidates.append(
+            {
                 "id": str(row["id"]),
-                "type": "company",
+                "type": entity_type,
                 "name": row["name"],
+                "score": float(row["score"]),
             }
+        )
 
-    # Search politicians table
-    elif entity_type == "person":
-        logger.debug(f"Trying politician name search with pattern: '{search_pattern}'")
-        row = await db.fetchrow(
-            "SELECT id, name FROM politicians WHERE name ILIKE $1 LIMIT 1",
-            search_pattern,
+    if not candidates:
+        logger.warning(f"No results found in database for: '{q}' as type '{entity_type}'")
+    return candidates[:limit]
+
+
+async def resolve_entity_id_by_search(
+    q: str, db: Connection, entity_type: str
+) -> Optional[dict]:
+    """
+    Search for an entity by ticker or name and return its id, type, and name.
+
+    Args:
+        q: Search query
+        db: Database connection
+        entity_type: 'person' or 'company' from classification
+
+    Returns:
+        dict with 'id', 'type', 'name', 'score' or None if not found
+    """
+    candidates = await search_entity_candidates(q, db, entity_type, limit=1)
+    if not candidates:
+        return None
+    logger.info(f"Found {entity_type}: {candidates[0]}")
+    return candidates[0]
+
+
+async def resolve_speculatively(q: str, limit: int = 1) -> Optional[dict]:
+    """
+    Race classification against person and company lookups.
+
+    Both DB lookups run, one after the other on a single pool connection,
+    while the classifier is working. A request never holds one connection
+    while waiting for another, so concurrent searches cannot exhaust the
+    pool between them. If only one entity type matches, the classifier is
+    cancelled and that match wins; the classification is awaited only to
+    break a tie when both types match. Latency is roughly max(LLM, DB)
+    instead of their sum, and often just the DB time.
+
+    Args:
+        q: Search query
+        limit: Maximum number of candidates to return
+
+    Returns:
+        dict with 'candidates' (best first), 'confidence', 'reasoning',
+        or None if neither table matches
+    """
+    classify_task = asyncio.create_task(classify_search_term(q))
+    try:
+        async with get_pool().acquire() as conn:
+            people = await search_entity_candidates(q, conn, "person", limit)
+            companies = await search_entity_candidates(q, conn, "company", limit)
+    except BaseException:
+        classify_task.cancel()
+        raise
+
+    if not people or not companies:
+        classify_task.cancel()
+        candidates = people or companies
+        if not candidates:
+            return None
+        entity_type = candidates[0]["type"]
+        logger.info(f"Speculative search: only {entity_type} matched, skipped classification")
+        return {
+            "candidates": candidates,
+            "confidence": candidates[0]["score"],
+            "reasoning": f"Only a {entity_type} matched the search term",
+        }
+
+    classification = await classify_task
+    logger.info(f"Speculative search: both matched, classifier chose {classification['type']}")
+    return {
+        "candidates": people if classification["type"] == "person" else companies,
+        "confidence": classification["confidence"],
+        "reasoning": classification["reasoning"],
+    }
+
+
+async def resolve_exact_batch(terms: List[str], db: Connection) -> Dict[str, dict]:
+    """
+    Resolve many terms by exact ticker or exact (case-insensitive) name.
+
+    One round-trip for the whole batch, using ANY() arrays against
+    companies.ticker and lower(name) on both entity tables.
+
+    Args:
+        terms: Distinct search terms
+        db: Database connection
+
+    Returns:
+        dict mapping term -> {'id', 'type', 'name', 'reasoning'} for terms
+        with exactly one exact hit (ticker hits win over name hits)
+    """
+    if not terms:
+        return {}
+    # Distinct terms can normalize to the same key ("aapl", "AAPL "); each
+    # key keeps all of them so every one gets the match
+    tickers: Dict[str, List[str]] = {}
+    names: Dict[str, List[str]] = {}
+    for t in terms:
+        tickers.setdefault(t.strip().upper(), []).append(t)
+        names.setdefault(" ".join(t.split()).lower(), []).append(t)
+    rows = await db.fetch(
+        """
+        SELECT 'ticker' AS kind, id, name, ticker AS key
+        FROM companies WHERE ticker = ANY($1::text[])
+        UNION ALL
+        SELECT 'company', id, name, lower(name)
+        FROM companies WHERE lower(name) = ANY($2::text[])
+        UNION ALL
+        SELECT 'person', id, name, lower(name)
+        FROM politicians WHERE lower(name) = ANY($2::text[])
+        """,
+        list(tickers),
+        list(names),
+    )
+
+    by_ticker: Dict[str, dict] = {}
+    by_name: Dict[str, List[dict]] = {}
+    for row in rows:
+        if row["kind"] == "ticker":
+            for term in tickers[row["key"]]:
+                by_ticker[term] = {
+                    "id": str(row["id"]),
+                    "type": "company",
+                    "name": row["name"],
+                    "reasoning": "Exact ticker match",
+                }
+        else:
+            for term in names[row["key"]]:
+                by_name.setdefault(term, []).append(
+                    {
+                        "id": str(row["id"]),
+                        "type": row["kind"],
+                        "name": row["name"],
+                        "reasoning": "Exact name match",
+                    }
+                )
+
+    matches = dict(by_ticker)
+    for term, hits in by_name.items():
+        if term not in matches and len(hits) == 1:
+            matches[term] = hits[0]
+    return matches
+
+
+async def search_best_candidates_batch(
+    terms_by_type: Dict[str, str], db: Connection
+) -> Dict[str, dict]:
+    """
+    Fuzzy-resolve many classified terms with one query per entity table.
+
+    Each term gets its best trigram match via a LATERAL subquery over
+    unnest(), so the round-trip count doesn't grow with the batch. Terms
+    with no trigram match get one more query per table trying the
+    substring fallback of search_entity_candidates.
+
+    Args:
+        terms_by_type: dict mapping term -> 'person' or 'company'
+        db: Database connection
+
+    Returns:
+        dict mapping term -> {'id', 'type', 'name', 'score'} for matched terms
+    """
+    matches: Dict[str, dict] = {}
+    for entity_type, table in (("company", "companies"), ("person", "politicians")):
+        terms = [t for t, typ in terms_by_type.items() if typ == entity_type]
+        if not terms:
+            continue
+        rows = await db.fetch(
+            f"""
+            SELECT t.q, e.id, e.name, e.score
+            FROM unnest($1::text[]) AS t(q)
+            CROSS JOIN LATERAL (
+                SELECT id, name, word_similarity(t.q, name) AS score
+                FROM {table}
+                WHERE t.q <% name
+                ORDER BY score DESC, id
+                LIMIT 1
+            ) e
+            """,
+            terms,
         )
-        if row:
-            logger.info(f"Found person: {dict(row)}")
-            return {
+        found = {row["q"] for row in rows}
+        unmatched = [t for t in terms if t not in found]
+        if unmatched:
+            rows = list(rows) + await db.fetch(
+                f"""
+                SELECT t.q, e.id, e.name, e.score
+                FROM unnest($1::text[], $2::text[]) AS t(q, pattern)
+                CROSS JOIN LATERAL (
+                    SELECT id, name, word_similarity(t.q, name) AS score
+                    FROM {table}
+                    WHERE name ILIKE t.pattern
+                    ORDER BY score DESC, id
+                    LIMIT 1
+                ) e
+                """,
+                unmatched,
+                [_substring_pattern(t) for t in unmatched],
+            )
+        for row in rows:
+            matches[row["q"]] = {
                 "id": str(row["id"]),
-                "type": "person",
+                "type": entity_type,
                 "name": row["name"],
+                "score": float(row["score"]),
             }
-
-    logger.warning(f"No results found in database for: '{q}' as type '{entity_type}'")
-    return None
+    return matches
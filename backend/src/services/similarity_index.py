@@ -0,0 +1,454 @@
+"""Precomputed co-holding similarity ("similar politicians/companies").
+
+Politicians are compared by the companies they hold, companies by the
+politicians holding them. Both metrics come out of one sparse pass per
+side: for every entity, walking the holder lists of its features gives the
+row of A·Aᵀ (shared counts and value-weighted dot products) for that entity
+without touching pairs that share nothing.
+
+- jaccard: shared / (|A| + |B| - shared)
+- cosine: dot(A, B) / (|A| * |B|), weighted by abs(holding_value)
+
+Only the top SIMILARITY_TOP_K neighbors per entity are kept, so a query is
+a slice of a precomputed list.
+
+The index is built without an extra holdings scan per worker: from the
+in-memory graph snapshot when one is loaded, otherwise once per host into
+SIMILARITY_INDEX_PATH (by whichever worker takes the file lock, or by
+build_similarity_index.py), which every worker then memory-maps.
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from src.core.config import settings
+from src.db.pool import get_pool
+from src.services.graph_snapshot import get_graph_snapshot
+from src.utils.mapped_file import (
+    file_version,
+    mapped_string_column,
+    open_columns,
+    release_build_lock,
+    string_columns,
+    try_build_lock,
+    write_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_MAGIC = b"SIMIDX01"
+SIMILARITY_FILE_VERSION = 1
+_KINDS = ("person", "company")
+_METRICS = ("jaccard", "cosine")
+# Per type: sorted entity ids; per type and metric: CSR offsets (indexed
+# like the ids) into neighbor id, score and shared-count columns
+_ARRAY_COLUMNS = [f"{kind}_ids" for kind in _KINDS] + [
+    f"{kind}_{metric}_{part}"
+    for kind in _KINDS
+    for metric in _METRICS
+    for part in ("offsets", "other", "score", "shared")
+]
+_STRING_COLUMNS = [f"{kind}_names" for kind in _KINDS]
+
+# other id, score, shared holdings
+Neighbor = Tuple[int, float, int]
+
+
+def top_k_similar(
+    rows: Iterable[Tuple[int, int, float]], k: int, max_degree: int = 0
+) -> Dict[int, Dict[str, List[Neighbor]]]:
+    """
+    Top-k Jaccard and cosine neighbors for every entity.
+
+    A feature shared by nearly everyone (one company held by every
+    politician) would make the pass quadratic in entities. Features with
+    more than `max_degree` holders are therefore not used to find
+    candidates, though they still count toward the scores of candidates
+    found through other features. Pairs that share only such features
+    are not ranked.
+
+    Args:
+        rows: (entity id, feature id, weight) triples
+        k: Neighbors to keep per entity and metric
+        max_degree: Candidate-generation cutoff (0 = no cutoff, exact)
+
+    Returns:
+        entity id -> {"jaccard": [...], "cosine": [...]}, best first
+    """
+    vectors: Dict[int, Dict[int, float]] = defaultdict(dict)
+    holder_ids: Dict[int, List[int]] = defaultdict(list)
+    holder_weights: Dict[int, List[float]] = defaultdict(list)
+    for entity, feature, weight in rows:
+        w = abs(float(weight or 0))
+        vectors[entity][feature] = w
+        holder_ids[feature].append(entity)
+        holder_weights[feature].append(w)
+    norms = {e: math.sqrt(sum(w * w for w in v.values())) for e, v in vectors.items()}
+
+    result = {}
+    for entity, vector in vectors.items():
+        # Counter.update counts in C; dot products need the weights, so they
+        # get their own (tighter) loop
+        shared = Counter()
+        dots: Dict[int, float] = {}
+        dots_get = dots.get
+        popular = []
+        for feature, w in vector.items():
+            ids = holder_ids[feature]
+            if max_degree and len(ids) > max_degree:
+                popular.append((feature, w))
+                continue
+            shared.update(ids)
+            for other, other_w in zip(ids, holder_weights[feature]):
+                dots[other] = dots_get(other, 0.0) + w * other_w
+        del shared[entity]
+        # Popular features don't generate candidates but still score them
+        for other in list(shared) if popular else ():
+            other_vector = vectors[other]
+            for feature, w in popular:
+                other_w = other_vector.get(feature)
+                if other_w is not None:
+                    dots[other] += w * other_w
+                    shared[other] += 1
+
+        size, norm = len(vector), norms[entity]
+        jaccard = heapq.nlargest(
+            k,
+            ((o, s / (size + len(vectors[o]) - s), s) for o, s in shared.items()),
+            key=lambda t: (t[1], -t[0]),
+        )
+        cosine = heapq.nlargest(
+            k,
+            (
+                (o, dots[o] / (norm * norms[o]) if norm and norms[o] else 0.0, s)
+                for o, s in shared.items()
+            ),
+            key=lambda t: (t[1], -t[0]),
+        )
+        result[entity] = {"jaccard": jaccard, "cosine": cosine}
+    return result
+
+
+class SimilarityIndex:
+    """Immutable top-k neighbor lists for both entity types, in flat arrays."""
+
+    def __init__(self):
+        # Column name -> array (memoryview when mapped); *_names are str sequences
+        self.columns: Dict[str, object] = {}
+        self.source = ""
+        self.built_at = 0.0
+        self.build_seconds = 0.0
+        # Set when the columns are views over a memory-mapped file
+        self.mapped_path: Optional[str] = None
+        self._mapping = None
+
+    @classmethod
+    def build(
+        cls,
+        holdings: Callable[[], Iterable[Tuple[int, int, float]]],
+        person_names: Dict[int, str],
+        company_names: Dict[int, str],
+        k: int,
+        max_degree: int = 0,
+    ) -> "SimilarityIndex":
+        """
+        Args:
+            holdings: Returns a fresh iterator of (politician id, company
+                id, holding value) each call; it is walked once per side
+            person_names: Politician id -> name
+            company_names: Company id -> name
+            k: Neighbors to keep per entity and metric
+            max_degree: Candidate-generation cutoff, see top_k_similar
+        """
+        started = time.perf_counter()
+        index = cls()
+        neighbors = {
+            "person": top_k_similar(holdings(), k, max_degree),
+            "company": top_k_similar(((c, p, v) for p, c, v in holdings()), k, max_degree),
+        }
+        for kind, names in (("person", person_names), ("company", company_names)):
+            ids = array("q", sorted(names))
+            index.columns[f"{kind}_ids"] = ids
+            index.columns[f"{kind}_names"] = [names[entity_id] for entity_id in ids]
+            for metric in _METRICS:
+                offsets = array("q", [0])
+                others, scores, shared = array("q"), array("d"), array("q")
+                for entity_id in ids:
+                    for other, score, count in neighbors[kind].get(entity_id, {}).get(metric, ()):
+                        others.append(other)
+                        scores.append(score)
+                        shared.append(count)
+                    offsets.append(len(others))
+                prefix = f"{kind}_{metric}"
+                index.columns[f"{prefix}_offsets"] = offsets
+                index.columns[f"{prefix}_other"] = others
+                index.columns[f"{prefix}_score"] = scores
+                index.columns[f"{prefix}_shared"] = shared
+        index.built_at = time.time()
+        index.build_seconds = time.perf_counter() - started
+        return index
+
+    def entity_count(self, kind: str) -> int:
+        return len(self.columns[f"{kind}_ids"])
+
+    def similar(self, kind: str, entity_id: int, metric: str, limit: int) -> Optional[List[dict]]:
+        """Top `limit` neighbors of an entity, or None if it is unknown."""
+        ids = self.columns[f"{kind}_ids"]
+        i = bisect_left(ids, entity_id)
+        if i == len(ids) or ids[i] != entity_id:
+            return None
+        names = self.columns[f"{kind}_names"]
+        prefix = f"{kind}_{metric}"
+        offsets = self.columns[f"{prefix}_offsets"]
+        others = self.columns[f"{prefix}_other"]
+        scores = self.columns[f"{prefix}_score"]
+        shared = self.columns[f"{prefix}_shared"]
+        result = []
+        for n in range(offsets[i], min(offsets[i + 1], offsets[i] + limit)):
+            other = others[n]
+            j = bisect_left(ids, other)
+            result.append(
+                {
+                    "id": other,
+                    "name": names[j] if j < len(ids) and ids[j] == other else "",
+                    "score": round(scores[n], 6),
+                    "shared_holdings": shared[n],
+                }
+            )
+        return result
+
+    # -- shared file format -----------------------------------------------
+
+    def write(self, path: str):
+        """Write the index as a file that open() can memory-map; replaced atomically."""
+        columns = [(name, self.columns[name]) for name in _ARRAY_COLUMNS]
+        for name in _STRING_COLUMNS:
+            columns.extend(string_columns(name, self.columns[name]))
+        write_columns(
+            path,
+            SIMILARITY_MAGIC,
+            {
+                "version": SIMILARITY_FILE_VERSION,
+                "source": self.source,
+                "built_at": self.built_at,
+                "build_seconds": self.build_seconds,
+            },
+            columns,
+        )
+
+    @classmethod
+    def open(cls, path: str) -> "SimilarityIndex":
+        """Memory-map a file written by write(), read-only and zero-copy."""
+        header, columns, mapped = open_columns(
+            path, SIMILARITY_MAGIC, SIMILARITY_FILE_VERSION, "similarity index"
+        )
+        index = cls()
+        for name in _ARRAY_COLUMNS:
+            index.columns[name] = columns[name]
+        for name in _STRING_COLUMNS:
+            index.columns[name] = mapped_string_column(columns, name)
+        index.source = header["source"]
+        index.built_at = header["built_at"]
+        index.build_seconds = header["build_seconds"]
+        index.mapped_path = path
+        index._mapping = mapped
+        return index
+
+
+# (description, holding count, holdings factory, politician names, company names)
+HoldingsSource = Tuple[str, int, Callable[[], Iterable], Dict[int, str], Dict[int, str]]
+
+
+def snapshot_holdings(snapshot) -> HoldingsSource:
+    """Holdings and names read from a graph snapshot, without copying the holdings."""
+    return (
+        "graph snapshot",
+        snapshot.holdings_count,
+        snapshot.iter_holdings,
+        dict(zip(snapshot.person_ids, snapshot.person_names)),
+        dict(zip(snapshot.company_ids, snapshot.company_names)),
+    )
+
+
+async def fetch_holdings(conn) -> HoldingsSource:
+    """Every holding and name, fetched from Postgres."""
+    rows = await conn.fetch("SELECT politician_id, company_id, holding_value FROM holdings")
+    person_names = dict(await conn.fetch("SELECT id, name FROM politicians"))
+    company_names = dict(await conn.fetch("SELECT id, name FROM companies"))
+    return "Postgres", len(rows), lambda: iter(rows), person_names, company_names
+
+
+async def compute_similarity_index(holdings: HoldingsSource) -> SimilarityIndex:
+    """Compute a fresh index from the given holdings and names."""
+    source, count, rows, person_names, company_names = holdings
+    # The pass is CPU-bound; keep it off the event loop
+    index = await asyncio.to_thread(
+        SimilarityIndex.build,
+        rows,
+        person_names,
+        company_names,
+        settings.SIMILARITY_TOP_K,
+        settings.SIMILARITY_MAX_FEATURE_DEGREE,
+    )
+    index.source = source
+    logger.info(
+        f"Similarity index built in {index.build_seconds:.2f}s from {count} holdings ({source})"
+    )
+    return index
+
+
+_index: Optional[SimilarityIndex] = None
+_index_file_version = None  # (inode, mtime_ns) of the mapped file
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def _similarity_enabled() -> bool:
+    if settings.SIMILARITY_INDEX_ENABLED is not None:
+        return settings.SIMILARITY_INDEX_ENABLED
+    return settings.GRAPH_ENGINE == "memory" or bool(settings.SIMILARITY_INDEX_PATH)
+
+
+async def _compute_in_process() -> Optional[SimilarityIndex]:
+    """A fresh index, or None while waiting for a graph snapshot to build it from."""
+    snapshot = get_graph_snapshot()
+    if snapshot is not None:
+        return await compute_similarity_index(snapshot_holdings(snapshot))
+    # Every worker reading every holding only when asked for explicitly;
+    # a shared file is built by one worker per host
+    if settings.SIMILARITY_INDEX_ENABLED or settings.SIMILARITY_INDEX_PATH:
+        async with get_pool().acquire() as conn:
+            holdings = await fetch_holdings(conn)
+        return await compute_similarity_index(holdings)
+    return None
+
+
+def _needs_rebuild(path: str) -> bool:
+    version = file_version(path)
+    if version is None:
+        return True
+    return time.time() - version[1] / 1e9 >= settings.SIMILARITY_REFRESH_SECONDS
+
+
+async def _sync_shared_index(path: str):
+    """
+    Rebuild the shared file if it is stale and no other worker is already
+    doing so, then map whatever version is current.
+    """
+    global _index, _index_file_version
+    if settings.SIMILARITY_INDEX_BUILD and _needs_rebuild(path):
+        fd = try_build_lock(path)
+        if fd is not None:
+            try:
+                # Another worker may have finished a rebuild while we checked
+                if _needs_rebuild(path):
+                    index = await _compute_in_process()
+                    if index is not None:
+                        await asyncio.to_thread(index.write, path)
+            finally:
+                release_build_lock(fd)
+    version = file_version(path)
+    if version is not None and version != _index_file_version:
+        _index = SimilarityIndex.open(path)
+        _index_file_version = version
+        logger.info(f"Similarity index mapped from {path}")
+
+
+async def load_similarity_index():
+    """
+    Bring the index up to date and swap it in.
+
+    With SIMILARITY_INDEX_PATH the shared file is rebuilt when stale (by
+    this worker, if it takes the lock) and mapped; otherwise the index is
+    recomputed in this process, from the graph snapshot if one is loaded.
+    """
+    global _index
+    if settings.SIMILARITY_INDEX_PATH:
+        await _sync_shared_index(settings.SIMILARITY_INDEX_PATH)
+        return
+    index = await _compute_in_process()
+    if index is not None:
+        _index = index
+
+
+async def _refresh_loop():
+    while True:
+        # Poll while there is nothing to serve, or for another worker's file
+        if _index is None or settings.SIMILARITY_INDEX_PATH:
+            await asyncio.sleep(settings.SIMILARITY_INDEX_POLL_SECONDS)
+        else:
+            await asyncio.sleep(settings.SIMILARITY_REFRESH_SECONDS)
+        try:
+            await load_similarity_index()
+        except Exception as e:
+            logger.warning(f"Similarity index refresh failed, keeping previous index: {e}")
+
+
+async def start_similarity_index():
+    """Initial build or mapping plus background refresh task."""
+    global _refresh_task
+    if not _similarity_enabled():
+        return
+    try:
+        await load_similarity_index()
+    except Exception as e:
+        logger.warning(f"Similarity index initial build failed: {e}")
+    _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+async def stop_similarity_index():
+    """Cancel the background refresh task."""
+    global _refresh_task
+    if _refresh_task:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+
+
+def get_similar_entities(
+    entity_type: str, entity_id: int, metric: str = "jaccard", limit: int = 10
+) -> Optional[List[dict]]:
+    """
+    Most similar entities of the same type.
+
+    Args:
+        entity_type: 'person' or 'company'
+        entity_id: Entity ID
+        metric: 'jaccard' or 'cosine'
+        limit: Maximum number of results (at most SIMILARITY_TOP_K)
+
+    Returns:
+        List of dicts with 'id', 'name', 'score', 'shared_holdings', or None
+        if the index is not built or the entity is unknown
+    """
+    index = _index
+    if index is None:
+        return None
+    return index.similar(entity_type, entity_id, metric, limit)
+
+
+def similarity_index_ready() -> bool:
+    return _index is not None
+
+
+def get_similarity_index_metrics() -> dict:
+    """Size and age of the similarity index."""
+    index = _index
+    return {
+        "loaded": index is not None,
+        "source": index.source if index else None,
+        "mapped_path": index.mapped_path if index else None,
+        "politicians": index.entity_count("person") if index else 0,
+        "companies": index.entity_count("company") if index else 0,
+        "top_k": settings.SIMILARITY_TOP_K,
+        "built_at": index.built_at if index else None,
+        "build_seconds": round(index.build_seconds, 3) if index else None,
+    }
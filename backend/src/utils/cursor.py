@@ -0,0 +1,30 @@
+"""Opaque cursor tokens for keyset pagination."""
+
+import base64
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Tuple
+
+
+def encode_cursor(value: Decimal, row_id: int) -> str:
+    """Token for the position just after the row with sort key (value, row_id)."""
+    raw = json.dumps([str(value), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> Tuple[Decimal, int]:
+    """
+    Sort key (value, row_id) a cursor token was made from.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        value, row_id = json.loads(raw)
+        value = Decimal(value)
+    except (ValueError, TypeError, InvalidOperation) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+    if not value.is_finite() or type(row_id) is not int:
+        raise ValueError(f"Invalid cursor: {token!r}")
+    return value, row_id
@@ -0,0 +1,150 @@
+"""Memory-mappable column files shared between worker processes.
+
+Layout: 8-byte magic, little-endian uint64 header length, JSON header,
+then each column as raw native-endian array data padded to 8 bytes.
+Files are written beside their path and renamed over it, so readers see
+either the old or the new file, never a partial one. Opening maps the
+file read-only and only parses the header; columns are memoryviews over
+the mapping, so every process mapping the same file shares its pages.
+"""
+
+import fcntl
+import json
+import mmap
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def _padded(nbytes: int) -> int:
+    return (nbytes + 7) // 8 * 8
+
+
+class StringColumn:
+    """Read-only str sequence over UTF-8 data and an offsets column, decoded on access."""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.data[self.offsets[i] : self.offsets[i + 1]], "utf-8")
+
+
+def string_columns(name: str, values: Sequence[str]) -> List[Tuple[str, object]]:
+    """The (offsets, data) column pair write_columns() stores a str column as."""
+    encoded = [values[i].encode("utf-8") for i in range(len(values))]
+    offsets = array("q", [0])
+    for b in encoded:
+        offsets.append(offsets[-1] + len(b))
+    return [(f"{name}.offsets", offsets), (f"{name}.data", b"".join(encoded))]
+
+
+def mapped_string_column(columns: dict, name: str) -> StringColumn:
+    """The str column stored by string_columns(name, ...)."""
+    return StringColumn(columns[f"{name}.offsets"], columns[f"{name}.data"])
+
+
+def write_columns(path: str, magic: bytes, header: dict, columns: List[Tuple[str, object]]):
+    """
+    Write arrays (or bytes) as a file open_columns() can memory-map.
+
+    Args:
+        path: Destination, replaced atomically
+        magic: 8-byte file type marker
+        header: JSON-serializable metadata; "byteorder" and "columns" are added
+        columns: (name, array or bytes) in file order
+    """
+    layout, position = {}, 0
+    for name, data in columns:
+        view = memoryview(data)
+        typecode = data.typecode if isinstance(data, array) else view.format
+        layout[name] = [typecode, position, len(view)]
+        position += _padded(view.nbytes)
+    encoded = json.dumps({**header, "byteorder": sys.byteorder, "columns": layout}).encode("utf-8")
+    encoded += b" " * (_padded(len(encoded)) - len(encoded))
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(magic)
+            f.write(len(encoded).to_bytes(8, "little"))
+            f.write(encoded)
+            for _, data in columns:
+                view = memoryview(data).cast("B")
+                f.write(view)
+                f.write(b"\0" * (_padded(view.nbytes) - view.nbytes))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def open_columns(
+    path: str, magic: bytes, version: int, kind: str
+) -> Tuple[dict, Dict[str, memoryview], mmap.mmap]:
+    """
+    Memory-map a file written by write_columns(), read-only and zero-copy.
+
+    Args:
+        path: File to map
+        magic: Expected file type marker
+        version: Expected header "version"
+        kind: What the file holds, for error messages
+
+    Returns:
+        (header, column name -> memoryview, the mapping to keep alive)
+
+    Raises:
+        ValueError: Wrong file type, version or byte order
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if bytes(view[:8]) != magic:
+        raise ValueError(f"{path} is not a {kind} file")
+    header_len = int.from_bytes(view[8:16], "little")
+    header = json.loads(bytes(view[16 : 16 + header_len]))
+    if header["version"] != version:
+        raise ValueError(f"Unsupported {kind} version: {header['version']}")
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"{kind.capitalize()} was written on a {header['byteorder']}-endian host")
+
+    data_start = 16 + header_len
+    columns = {}
+    for name, (typecode, offset, length) in header["columns"].items():
+        start = data_start + offset
+        itemsize = array(typecode).itemsize
+        columns[name] = view[start : start + length * itemsize].cast(typecode)
+    return header, columns, mapped
+
+
+def file_version(path: str):
+    """(inode, mtime_ns) of the file at path, or None if there is none."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns)
+
+
+def try_build_lock(path: str) -> Optional[int]:
+    """Take the cross-process build lock for path without waiting; returns the fd or None."""
+    fd = os.open(f"{path}.lock", os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def release_build_lock(fd: int):
+    os.close(fd)  # closing the descriptor releases the flock
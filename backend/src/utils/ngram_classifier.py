@@ -0,0 +1,154 @@
+"""Character n-gram naive Bayes classifier for short entity names.
+
+Pure Python, no dependencies. Trained on politician names vs company
+names/tickers, it tells "Nancy Pelosi" from "Pelosi Capital" in a few
+microseconds. Models are persisted as gzipped JSON.
+"""
+
+import gzip
+import json
+import math
+from typing import Dict, Iterable, List, Tuple
+
+MODEL_VERSION = 1
+
+
+def extract_features(text: str, ngram_min: int = 2, ngram_max: int = 4) -> List[str]:
+    """
+    Character n-grams of the padded, lower-cased text plus a few shape cues.
+
+    Shape cues keep information lost by lower-casing (all-caps tickers,
+    digits) and the word count.
+    """
+    t = " ".join(text.split())
+    padded = f" {t.lower()} "
+    feats = [
+        padded[i : i + n]
+        for n in range(ngram_min, ngram_max + 1)
+        for i in range(len(padded) - n + 1)
+    ]
+    words = t.split(" ") if t else []
+    feats.append(f"#words:{min(len(words), 5)}")
+    if t.isupper():
+        feats.append("#allcaps")
+    if any(c.isdigit() for c in t):
+        feats.append("#digit")
+    if words and all(w[:1].isupper() for w in words):
+        feats.append("#titlecase")
+    return feats
+
+
+class NgramNaiveBayes:
+    """Multinomial naive Bayes over character n-grams with add-alpha smoothing."""
+
+    def __init__(self, ngram_min: int = 2, ngram_max: int = 4, alpha: float = 0.5):
+        self.ngram_min = ngram_min
+        self.ngram_max = ngram_max
+        self.alpha = alpha
+        self.classes: List[str] = []
+        self.class_counts: List[int] = []
+        self.feature_counts: Dict[str, List[int]] = {}
+        self._log_prior: List[float] = []
+        self._log_likelihood: Dict[str, List[float]] = {}
+
+    def fit(self, texts: Iterable[str], labels: Iterable[str], min_count: int = 1) -> "NgramNaiveBayes":
+        """
+        Train on (text, label) pairs.
+
+        Args:
+            texts: Training strings
+            labels: Class label per string
+            min_count: Drop features seen fewer times overall (shrinks the model)
+        """
+        pairs = list(zip(texts, labels))
+        self.classes = sorted({label for _, label in pairs})
+        index = {c: i for i, c in enumerate(self.classes)}
+        self.class_counts = [0] * len(self.classes)
+        counts: Dict[str, List[int]] = {}
+        for text, label in pairs:
+            ci = index[label]
+            self.class_counts[ci] += 1
+            for feat in extract_features(text, self.ngram_min, self.ngram_max):
+                row = counts.get(feat)
+                if row is None:
+                    row = counts[feat] = [0] * len(self.classes)
+                row[ci] += 1
+        self.feature_counts = {f: row for f, row in counts.items() if sum(row) >= min_count}
+        self._prepare()
+        return self
+
+    def _prepare(self):
+        """Precompute log-probabilities so prediction is just dict lookups and adds."""
+        n_classes = len(self.classes)
+        total_docs = sum(self.class_counts)
+        vocab = len(self.feature_counts)
+        totals = [0] * n_classes
+        for row in self.feature_counts.values():
+            for i, c in enumerate(row):
+                totals[i] += c
+        denom = [totals[i] + self.alpha * vocab for i in range(n_classes)]
+        self._log_prior = [math.log(c / total_docs) for c in self.class_counts]
+        self._log_likelihood = {
+            f: [math.log((row[i] + self.alpha) / denom[i]) for i in range(n_classes)]
+            for f, row in self.feature_counts.items()
+        }
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """
+        Most likely class and its probability.
+
+        Features never seen in training are ignored, and the posterior is
+        shrunk toward uniform by the share of features that were seen, so
+        strings unlike anything in the training data don't get naive
+        Bayes' usual near-1.0 confidence.
+        """
+        scores = list(self._log_prior)
+        n_classes = len(scores)
+        feats = extract_features(text, self.ngram_min, self.ngram_max)
+        known = 0
+        for feat in feats:
+            ll = self._log_likelihood.get(feat)
+            if ll is None:
+                continue
+            known += 1
+            for i in range(n_classes):
+                scores[i] += ll[i]
+        top = max(scores)
+        exp = [math.exp(s - top) for s in scores]
+        best = exp.index(1.0)
+        posterior = exp[best] / sum(exp)
+        uniform = 1 / n_classes
+        return self.classes[best], uniform + (posterior - uniform) * known / len(feats)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": MODEL_VERSION,
+            "ngram_min": self.ngram_min,
+            "ngram_max": self.ngram_max,
+            "alpha": self.alpha,
+            "classes": self.classes,
+            "class_counts": self.class_counts,
+            "feature_counts": self.feature_counts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NgramNaiveBayes":
+        if data.get("version") != MODEL_VERSION:
+            raise ValueError(f"Unsupported model version: {data.get('version')}")
+        model = cls(data["ngram_min"], data["ngram_max"], data["alpha"])
+        model.classes = data["classes"]
+        model.class_counts = data["class_counts"]
+        model.feature_counts = data["feature_counts"]
+        model._prepare()
+        return model
+
+    def save(self, path: str):
+        """Write the model as gzipped JSON."""
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "NgramNaiveBayes":
+        """Read a model written by save()."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
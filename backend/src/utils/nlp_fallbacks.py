@@ -1,7 +1,73 @@
-"""Fallback heuristics for entity classification when AI is unavailable."""
+"""Fallback heuristics for entity classification when AI is unavailable.
+
+All patterns and keyword tables are built once at import time; this runs on
+the hot path whenever Claude is disabled, slow or the breaker is open.
+"""
 
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List
+
+# Ticker-like patterns (1-5 uppercase letters, possibly with dots)
+_TICKER_RE = re.compile(r"^[A-Z]{1,5}(\.)?$")
+
+# str.endswith accepts a tuple and checks every suffix in C
+_COMPANY_SUFFIXES = (
+    "inc",
+    "corporation",
+    "corp",
+    "llc",
+    "ltd",
+    "limited",
+    "group",
+    "systems",
+    "labs",
+    "co.",
+    "company",
+    "technologies",
+    "tech",
+    "ventures",
+    "capital",
+    "partners",
+    "holdings",
+)
+
+# Multiple capitals (common in company names), e.g. "McDonalds", "NYSE"
+_MULTI_CAPS_RE = re.compile(r"[A-Z].*[A-Z]")
+_FIRST_LAST_RE = re.compile(r"^[A-Z][a-z]+ [A-Z][a-z]+$")
+
+_TITLES = frozenset({"mr", "mrs", "ms", "dr", "prof", "sen", "rep", "gov", "pres", "vice"})
+
+_MIDDLE_INITIAL_RE = re.compile(r"^[A-Z][a-z]+ [A-Z]\.? [A-Z][a-z]+$")  # John M. Doe
+
+# Political positions/roles, matched as one alternation instead of N substring scans
+_POLITICAL_RE = re.compile(
+    "|".join(
+        re.escape(k)
+        for k in (
+            "senator",
+            "sen.",
+            "representative",
+            "rep.",
+            "governor",
+            "gov.",
+            "mayor",
+            "congressman",
+            "congresswoman",
+            "president",
+            "vice president",
+            "secretary",
+            "attorney general",
+            "assemblyman",
+        )
+    )
+)
+
+_AGE_RE = re.compile(r"\d{1,2}\s*(years old|yr old|yrs old)")
+_ORG_RE = re.compile(r"committee|foundation|fund")
+
+
+def _result(entity_type: str, confidence: float, reasoning: str) -> Dict[str, Any]:
+    return {"type": entity_type, "confidence": confidence, "reasoning": reasoning}
 
 
 def simple_classify(term: str) -> Dict[str, Any]:
@@ -16,141 +82,61 @@ def simple_classify(term: str) -> Dict[str, Any]:
     """
     t = term.strip()
     t_lower = t.lower()
-    words = [w for w in t.split() if w]
-
-    # Check for ticker-like patterns (1-5 uppercase letters, possibly with dots)
-    if re.match(r"^[A-Z]{1,5}(\.)?$", t):
-        return {
-            "type": "company",
-            "confidence": 0.7,
-            "reasoning": "Uppercase pattern matches stock ticker format",
-        }
-
-    # Check for company suffixes
-    company_suffixes = [
-        "inc",
-        "corporation",
-        "corp",
-        "llc",
-        "ltd",
-        "limited",
-        "group",
-        "systems",
-        "labs",
-        "co.",
-        "company",
-        "technologies",
-        "tech",
-        "ventures",
-        "capital",
-        "partners",
-        "holdings",
-    ]
-    if any(t_lower.endswith(suffix) for suffix in company_suffixes):
-        return {
-            "type": "company",
-            "confidence": 0.75,
-            "reasoning": "Contains typical company suffix",
-        }
-
-    # Check for multiple capitals (common in company names)
-    # e.g., "Starbucks", "McDonalds", "NYSE"
-    if re.match(r".*[A-Z].*[A-Z].*", t) and not re.match(
-        r"^[A-Z][a-z]+ [A-Z][a-z]+$", t
-    ):
+
+    if _TICKER_RE.match(t):
+        return _result("company", 0.7, "Uppercase pattern matches stock ticker format")
+
+    if t_lower.endswith(_COMPANY_SUFFIXES):
+        return _result("company", 0.75, "Contains typical company suffix")
+
+    if _MULTI_CAPS_RE.search(t) and not _FIRST_LAST_RE.match(t):
         # Multiple capitals but not typical "FirstName LastName" pattern
-        return {
-            "type": "company",
-            "confidence": 0.65,
-            "reasoning": "Multiple capital letters suggest company branding",
-        }
+        return _result("company", 0.65, "Multiple capital letters suggest company branding")
 
     # Person detection: 2-4 words with proper capitalization
+    words = t.split()
     if 2 <= len(words) <= 4:
-        # Check if words are primarily capitalized (person name)
-        proper_caps = sum(1 for w in words if w and w[0].isupper())
+        proper_caps = sum(1 for w in words if w[0].isupper())
 
         if proper_caps >= len(words) * 0.8:  # Most words are capitalized
-            # Check for title prefixes
-            titles = [
-                "mr",
-                "mrs",
-                "ms",
-                "dr",
-                "prof",
-                "sen",
-                "rep",
-                "gov",
-                "pres",
-                "vice",
-            ]
-            if words[0].lower() in titles:
-                return {
-                    "type": "person",
-                    "confidence": 0.85,
-                    "reasoning": "Title prefix detected",
-                }
-
-            # Check for common person indicators
-            if re.match(r"^[A-Z][a-z]+ [A-Z]\.? [A-Z][a-z]+$", t):  # John M. Doe
-                return {
-                    "type": "person",
-                    "confidence": 0.8,
-                    "reasoning": "Middle initial pattern typical of person names",
-                }
-
-            # 2-3 word capitalized names
-            if 2 <= len(words) <= 3:
-                return {
-                    "type": "person",
-                    "confidence": 0.7,
-                    "reasoning": "Proper capitalization suggests person name",
-                }
-
-    # Check for political positions/roles (indicators of politicians)
-    political_keywords = [
-        "senator",
-        "sen.",
-        "representative",
-        "rep.",
-        "governor",
-        "gov.",
-        "mayor",
-        "congressman",
-        "congresswoman",
-        "representative",
-        "president",
-        "vice president",
-        "secretary",
-        "attorney general",
-        "assemblyman",
-    ]
-    if any(keyword in t_lower for keyword in political_keywords):
-        return {
-            "type": "person",
-            "confidence": 0.8,
-            "reasoning": "Contains political position keyword",
-        }
-
-    # Check for age indicators (person)
-    if re.search(r"\d{1,2}\s*(years old|yr old|yrs old)", t_lower):
-        return {
-            "type": "person",
-            "confidence": 0.75,
-            "reasoning": "Age indicator suggests person",
-        }
-
-    # Default: check for generic indicators
-    if "committee" in t_lower or "foundation" in t_lower or "fund" in t_lower:
-        return {
-            "type": "company",
-            "confidence": 0.6,
-            "reasoning": "Contains organization indicator",
-        }
-
-    # Default assumption
-    return {
-        "type": "company",
-        "confidence": 0.5,
-        "reasoning": "Default assumption: company",
-    }
+            if words[0].lower() in _TITLES:
+                return _result("person", 0.85, "Title prefix detected")
+
+            if _MIDDLE_INITIAL_RE.match(t):
+                return _result("person", 0.8, "Middle initial pattern typical of person names")
+
+            if len(words) <= 3:
+                return _result("person", 0.7, "Proper capitalization suggests person name")
+
+    if _POLITICAL_RE.search(t_lower):
+        return _result("person", 0.8, "Contains political position keyword")
+
+    if _AGE_RE.search(t_lower):
+        return _result("person", 0.75, "Age indicator suggests person")
+
+    if _ORG_RE.search(t_lower):
+        return _result("company", 0.6, "Contains organization indicator")
+
+    return _result("company", 0.5, "Default assumption: company")
+
+
+def classify_many(terms: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Classify many search terms at once.
+
+    Repeated terms are classified once and share a result.
+
+    Args:
+        terms: Search terms to classify
+
+    Returns:
+        List of classification dicts in input order
+    """
+    seen: Dict[str, Dict[str, Any]] = {}
+    results = []
+    for term in terms:
+        result = seen.get(term)
+        if result is None:
+            result = seen[term] = simple_classify(term)
+        results.append(result)
+    return results
@@ -0,0 +1,131 @@
+"""Fast JSON and MessagePack responses."""
+
+from contextlib import aclosing
+from datetime import date
+from decimal import Decimal
+from typing import Any, AsyncIterator, Optional, Sequence
+import msgpack
+import orjson
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any):
+    # Same representations FastAPI's jsonable_encoder/pydantic use
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by pydantic-core (models) or orjson (anything else).
+
+    Return one built from an already-validated model, e.g.
+    `FastJSONResponse(GraphResponse(**data))`, to skip FastAPI's second
+    validation against response_model and its jsonable_encoder pass.
+    Output is byte-compatible with FastAPI's: Decimals as strings, dates
+    as ISO 8601.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return orjson.dumps(content, default=_default)
+
+
+def _msgpack_default(obj: Any):
+    # MessagePack has no decimal or date types
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not MessagePack serializable: {type(obj).__name__}")
+
+
+class MsgpackResponse(Response):
+    """MessagePack response. Decimals become floats, dates ISO 8601 strings."""
+
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, default=_msgpack_default, use_bin_type=True)
+
+
+def negotiate_media_type(accept: Optional[str], offered: Sequence[str]) -> str:
+    """
+    Pick the offered media type the client prefers.
+
+    Each offered type gets the q-value of the most specific Accept range
+    that matches it (exact, then type/*, then */*). Ties, a missing header
+    and a header that accepts none of them all go to the first offered
+    type.
+
+    Args:
+        accept: Accept header value, if any
+        offered: Media types the endpoint can produce, default first
+
+    Returns:
+        One of `offered`
+    """
+    if not accept:
+        return offered[0]
+    ranges = {}
+    for part in accept.split(","):
+        media_range, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges[media_range.strip().lower()] = q
+
+    best, best_q = offered[0], 0.0
+    for media_type in offered:
+        main_type = media_type.split("/")[0]
+        for candidate in (media_type, f"{main_type}/*", "*/*"):
+            if candidate in ranges:
+                if ranges[candidate] > best_q:
+                    best, best_q = media_type, ranges[candidate]
+                break
+    return best
+
+
+async def prepend(first: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Put back a chunk read ahead of a StreamingResponse.
+
+    Handlers read the first chunk themselves so that a missing entity or
+    failing query becomes an error status rather than a truncated 200.
+    """
+    yield first
+    async with aclosing(rest):
+        async for chunk in rest:
+            yield chunk
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that closes its body iterator when done.
+
+    When the client disconnects, Starlette stops iterating but leaves the
+    generator suspended. Anything it holds, such as a pool connection or
+    a running COPY, would then wait for garbage collection. Generators
+    streamed through this class should use contextlib.aclosing on the
+    iterators they consume so the close reaches them too.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,65 @@
+"""Regression checks for the classifier's half-open circuit breaker probe."""
+
+import asyncio
+import os
+
+os.environ.setdefault("DATABASE_URL", "postgresql://test@localhost/test")
+
+from src.services import classification_service  # noqa: E402
+from src.utils.circuit_breaker import HALF_OPEN, CircuitBreaker  # noqa: E402
+
+
+def _half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    breaker.record_failure()
+    assert breaker.state == HALF_OPEN
+    return breaker
+
+
+def _patch_classifier(monkeypatch, breaker: CircuitBreaker):
+    async def no_cache(term):
+        return None
+
+    async def slow_claude(client, term):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(classification_service, "_breaker", breaker)
+    monkeypatch.setattr(classification_service, "get_anthropic", lambda: object())
+    monkeypatch.setattr(classification_service, "get_cached_classification", no_cache)
+    monkeypatch.setattr(classification_service, "classify_locally", lambda term: None)
+    monkeypatch.setattr(classification_service, "_classify_with_claude", slow_claude)
+    monkeypatch.setattr(classification_service.settings, "CLASSIFY_LATENCY_BUDGET_MS", 0)
+
+
+def test_cancelled_probe_releases_half_open_breaker(monkeypatch):
+    breaker = _half_open_breaker()
+    _patch_classifier(monkeypatch, breaker)
+
+    async def run():
+        caller = asyncio.create_task(classification_service.classify_search_term("acme"))
+        await asyncio.sleep(0.01)
+        assert breaker._probe_in_flight
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_probe_cancelled_before_it_starts_releases_breaker(monkeypatch):
+    breaker = _half_open_breaker()
+    _patch_classifier(monkeypatch, breaker)
+
+    async def run():
+        caller = asyncio.create_task(classification_service.classify_search_term("acme"))
+        # Let the caller create the probe task, then cancel before it runs
+        while not breaker._probe_in_flight:
+            await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert breaker.allow_request()
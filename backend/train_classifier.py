@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Train the local person/company classifier from the entity tables.
+
+Usage (from backend/):
+  python train_classifier.py --output models/classifier.json.gz
+
+Reads politicians and companies from DATABASE_URL, reports held-out
+accuracy of the model against the simple_classify heuristics, then trains
+on all rows and writes the model. Point LOCAL_CLASSIFIER_PATH at the file
+to have the API load it at startup instead of training in-process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+
+import asyncpg
+
+from src.core.config import settings
+from src.services.local_classifier import build_training_set, fetch_training_rows
+from src.utils.ngram_classifier import NgramNaiveBayes
+from src.utils.nlp_fallbacks import classify_many
+
+
+def evaluate(texts, labels, holdout: float, threshold: float, seed: int):
+    """Print held-out accuracy and coverage for the model vs heuristics."""
+    pairs = list(zip(texts, labels))
+    random.Random(seed).shuffle(pairs)
+    cut = int(len(pairs) * (1 - holdout))
+    train, test = pairs[:cut], pairs[cut:]
+    if not test:
+        logging.warning("Not enough rows for a held-out evaluation")
+        return
+
+    model = NgramNaiveBayes().fit([t for t, _ in train], [l for _, l in train])
+    predictions = [model.predict(t) for t, _ in test]
+    model_acc = sum(p == l for (p, _), (_, l) in zip(predictions, test)) / len(test)
+
+    confident = [(p, l) for (p, prob), (_, l) in zip(predictions, test) if prob >= threshold]
+    confident_acc = sum(p == l for p, l in confident) / len(confident) if confident else 0.0
+
+    heuristic = classify_many(t for t, _ in test)
+    heuristic_acc = sum(h["type"] == l for h, (_, l) in zip(heuristic, test)) / len(test)
+
+    print(f"held-out examples:           {len(test)}")
+    print(f"heuristic accuracy:          {heuristic_acc:.3f}")
+    print(f"model accuracy (all):        {model_acc:.3f}")
+    print(
+        f"model accuracy (p>={threshold}): {confident_acc:.3f} "
+        f"on {len(confident) / len(test):.1%} of terms"
+    )
+
+
+async def run(args):
+    conn = await asyncpg.connect(settings.DATABASE_URL)
+    try:
+        politicians, companies = await fetch_training_rows(conn)
+    finally:
+        await conn.close()
+    logging.info("Loaded %d politicians, %d companies", len(politicians), len(companies))
+
+    texts, labels = build_training_set(politicians, companies)
+    if args.holdout > 0:
+        evaluate(texts, labels, args.holdout, args.threshold, args.seed)
+
+    model = NgramNaiveBayes().fit(texts, labels, min_count=args.min_count)
+    out_dir = os.path.dirname(args.output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    model.save(args.output)
+    print(
+        f"wrote {args.output}: {len(model.feature_counts)} features, "
+        f"{os.path.getsize(args.output) / 1024:.1f} KiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local person/company classifier")
+    parser.add_argument("--output", "-o", default="models/classifier.json.gz", help="Model output path")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction held out for evaluation (0 to skip)")
+    parser.add_argument("--threshold", type=float, default=settings.LOCAL_CLASSIFIER_MIN_CONFIDENCE, help="Confidence threshold to report")
+    parser.add_argument("--min-count", type=int, default=2, help="Drop n-grams seen fewer times (smaller model)")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,13 @@ interface SearchResponse {
   reasoning: string
 }
 
+interface SuggestItem {
+  id: string
+  type: 'person' | 'company'
+  name: string
+  ticker: string | null
+}
+
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000'
 
 export function SearchBar({
@@ -32,6 +39,28 @@ export function SearchBar({
   const [query, setQuery] = useState('')
   const [searchTerm, setSearchTerm] = useState<string | null>(null)
   const [uiError, setUiError] = useState<string | null>(null)
+  const [suggestTerm, setSuggestTerm] = useState('')
+
+  // Debounce keystrokes before asking for suggestions
+  useEffect(() => {
+    const timer = setTimeout(() => setSuggestTerm(query.trim()), 120)
+    return () => clearTimeout(timer)
+  }, [query])
+
+  const { data: suggestions } = useQuery<SuggestItem[]>({
+    queryKey: queryKeys.search.suggest(suggestTerm),
+    queryFn: async () => {
+      const url = `${API_BASE_URL}/api/search/suggest?q=${encodeURIComponent(suggestTerm)}&limit=8`
+      const res = await fetch(url)
+      if (!res.ok) return []
+      const json = (await res.json()) as { suggestions: SuggestItem[] }
+      return json.suggestions
+    },
+    enabled: suggestTerm.length > 0 && !searchTerm,
+    staleTime: 60_000,
+    placeholderData: (prev) => prev,
+    refetchOnWindowFocus: false,
+  })
 
   const { data, error, isFetching } = useQuery<SearchResponse>({
     queryKey: searchTerm
@@ -111,6 +140,38 @@ export function SearchBar({
 
   const handleSearch = () => triggerSearch(query)
 
+  const handleSuggestionClick = (item: SuggestItem) => {
+    setQuery('')
+    setSuggestTerm('')
+    setUiError(null)
+    onSearch?.(item.name)
+    navigate({
+      to: '/visual/$type/$id',
+      params: { type: item.type, id: item.id },
+    })
+  }
+
+  const suggestionList =
+    query.trim() && suggestions && suggestions.length > 0 ? (
+      <ul className="absolute left-0 right-0 top-full mt-2 z-50 glass-strong rounded-xl border border-primary/10 overflow-hidden text-left">
+        {suggestions.map((item) => (
+          <li key={`${item.type}-${item.id}`}>
+            <button
+              type="button"
+              onMouseDown={(e) => e.preventDefault()}
+              onClick={() => handleSuggestionClick(item)}
+              className="w-full flex items-center justify-between px-4 py-2 text-sm hover:bg-primary/10 cursor-pointer"
+            >
+              <span className="text-foreground">{item.name}</span>
+              <span className="text-muted-foreground text-xs">
+                {item.ticker ?? item.type}
+              </span>
+            </button>
+          </li>
+        ))}
+      </ul>
+    ) : null
+
   const handleKeyDown = (e: React.KeyboardEvent<HTMLInputElement>) => {
     if (e.key === 'Enter') {
       triggerSearch(query)
@@ -149,6 +210,7 @@ export function SearchBar({
             {isPending ? '...' : 'Go'}
           </Button>
         </div>
+        {suggestionList}
       </div>
     )
   }
@@ -185,6 +247,7 @@ export function SearchBar({
               {isPending ? 'Searching...' : buttonText}
             </Button>
           </div>
+          {suggestionList}
         </div>
       </div>
 
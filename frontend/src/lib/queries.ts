@@ -27,12 +27,56 @@ export function useVisualData(id: string, type: string) {
   })
 }
 
-async function fetchPerson(id: number) {
-  const res = await fetch(`${API_BASE_URL}/api/person/${id}`)
-  if (!res.ok) throw new Error(`Failed to fetch person: ${res.statusText}`)
-  return res.json() as Promise<Pick<Node, 'id' | 'name' | 'type' | 'position' | 'state' | 'party_affiliation' | 'estimated_net_worth' | 'last_trade_date'>>
+type PersonMeta = Pick<Node, 'id' | 'name' | 'type' | 'position' | 'state' | 'party_affiliation' | 'estimated_net_worth' | 'last_trade_date'>
+type CompanyMeta = Pick<Node, 'id' | 'name' | 'type' | 'ticker'>
+
+// Server-side cap on ids per batch request (MAX_BATCH_IDS)
+const MAX_BATCH_IDS = 1000
+
+// Collects the ids asked for within one tick and fetches them with a single
+// GET /api/{kind}?ids=... request, so a list of N people costs one round trip.
+function createBatchLoader<T>(kind: 'person' | 'company') {
+  let pending = new Map<number, { resolve: (value: T) => void; reject: (error: Error) => void }[]>()
+
+  async function flush(batch: typeof pending) {
+    const ids = [...batch.keys()]
+    for (let start = 0; start < ids.length; start += MAX_BATCH_IDS) {
+      const chunk = ids.slice(start, start + MAX_BATCH_IDS)
+      try {
+        const res = await fetch(`${API_BASE_URL}/api/${kind}?ids=${chunk.join(',')}`)
+        if (!res.ok) throw new Error(`Failed to fetch ${kind}: ${res.statusText}`)
+        const data = await res.json() as { results: ({ id: number; found: boolean } & Record<string, unknown>)[] }
+        for (const item of data.results) {
+          for (const waiter of batch.get(item.id) ?? []) {
+            if (item.found) waiter.resolve(item[kind] as T)
+            else waiter.reject(new Error(`Failed to fetch ${kind}: Not Found`))
+          }
+        }
+      } catch (error) {
+        for (const id of chunk) {
+          for (const waiter of batch.get(id) ?? []) waiter.reject(error as Error)
+        }
+      }
+    }
+  }
+
+  return (id: number) =>
+    new Promise<T>((resolve, reject) => {
+      if (pending.size === 0) {
+        setTimeout(() => {
+          const batch = pending
+          pending = new Map()
+          void flush(batch)
+        }, 0)
+      }
+      const waiters = pending.get(id) ?? []
+      waiters.push({ resolve, reject })
+      pending.set(id, waiters)
+    })
 }
 
+const fetchPerson = createBatchLoader<PersonMeta>('person')
+
 export function usePerson(id?: number) {
   return useQuery({
     queryKey: ['person', id],
@@ -42,11 +86,7 @@ export function usePerson(id?: number) {
   })
 }
 
-async function fetchCompany(id: number) {
-  const res = await fetch(`${API_BASE_URL}/api/company/${id}`)
-  if (!res.ok) throw new Error(`Failed to fetch company: ${res.statusText}`)
-  return res.json() as Promise<Pick<Node, 'id' | 'name' | 'type' | 'ticker'>>
-}
+const fetchCompany = createBatchLoader<CompanyMeta>('company')
 
 export function useCompany(id?: number) {
   return useQuery({
@@ -56,4 +96,3 @@ export function useCompany(id?: number) {
     staleTime: 5 * 60 * 1000,
   })
 }
-
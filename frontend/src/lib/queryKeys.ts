@@ -8,6 +8,7 @@ export const queryKeys = {
   },
   search: {
     byQuery: (q: string) => ['search', q] as const,
+    suggest: (q: string) => ['search', 'suggest', q] as const,
   },
 }
 
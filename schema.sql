@@ -21,6 +21,9 @@
 
 BEGIN;
 
+-- Trigram similarity for fuzzy name search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create the tables
 CREATE TABLE IF NOT EXISTS politicians (
   id                   BIGSERIAL PRIMARY KEY,
@@ -43,6 +46,14 @@ CREATE TABLE IF NOT EXISTS companies (
 );
 CREATE INDEX IF NOT EXISTS idx_companies_ticker ON companies (ticker);
 
+-- GIN trigram indexes back word_similarity (<%) lookups in search_service.py
+CREATE INDEX IF NOT EXISTS idx_politicians_name_trgm ON politicians USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_companies_name_trgm   ON companies   USING GIN (name gin_trgm_ops);
+
+-- Case-insensitive exact name lookups (batch search: lower(name) = ANY($1))
+CREATE INDEX IF NOT EXISTS idx_politicians_name_lower ON politicians (lower(name));
+CREATE INDEX IF NOT EXISTS idx_companies_name_lower   ON companies   (lower(name));
+
 CREATE TABLE IF NOT EXISTS holdings (
   id             BIGSERIAL PRIMARY KEY,
   politician_id  BIGINT NOT NULL REFERENCES politicians(id) ON DELETE CASCADE,
@@ -51,8 +62,141 @@ CREATE TABLE IF NOT EXISTS holdings (
 
   CONSTRAINT uq_holdings_unique UNIQUE (politician_id, company_id)
 );
-CREATE INDEX IF NOT EXISTS idx_holdings_pol ON holdings (politician_id);
-CREATE INDEX IF NOT EXISTS idx_holdings_co  ON holdings (company_id);
+-- Composite indexes serve "WHERE <entity> = $1 ORDER BY holding_value DESC LIMIT k"
+-- straight from the index and cover plain entity lookups too.
+-- The trailing id makes the order total, so the keyset-paginated holdings/holders
+-- routes seek "(holding_value, id) < ($3, $4)" with one range scan at any depth.
+CREATE INDEX IF NOT EXISTS idx_holdings_pol_value_id ON holdings (politician_id, holding_value DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_holdings_co_value_id  ON holdings (company_id, holding_value DESC, id DESC);
+-- Graph top-k ranks by size regardless of sign (sold positions are negative):
+-- "WHERE <entity> = $1 ORDER BY abs(holding_value) DESC LIMIT k"
+CREATE INDEX IF NOT EXISTS idx_holdings_pol_abs_value ON holdings (politician_id, abs(holding_value) DESC);
+CREATE INDEX IF NOT EXISTS idx_holdings_co_abs_value  ON holdings (company_id, abs(holding_value) DESC);
+-- Superseded by the two above
+DROP INDEX IF EXISTS idx_holdings_pol_value;
+DROP INDEX IF EXISTS idx_holdings_co_value;
+
+-- Tell the in-memory graph engine (GRAPH_ENGINE=memory) to rebuild its snapshot
+CREATE OR REPLACE FUNCTION notify_graph_changed() RETURNS trigger AS
+$$
+BEGIN
+   PERFORM pg_notify('graph_changed', TG_TABLE_NAME);
+   RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_politicians_graph_changed ON politicians;
+CREATE TRIGGER trg_politicians_graph_changed
+   AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON politicians
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_graph_changed();
+
+DROP TRIGGER IF EXISTS trg_companies_graph_changed ON companies;
+CREATE TRIGGER trg_companies_graph_changed
+   AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON companies
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_graph_changed();
+
+DROP TRIGGER IF EXISTS trg_holdings_graph_changed ON holdings;
+CREATE TRIGGER trg_holdings_graph_changed
+   AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON holdings
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_graph_changed();
+
+-- Tell the entity caches (entity_cache.py) which rows changed:
+-- 'person:<id>', 'company:<id>', 'holding:<politician_id>:<company_id>',
+-- one notification per distinct key. Statements touching more than 100
+-- row versions (bulk loads, cascades) and TRUNCATE send '<kind>:*' instead,
+-- so a 10M-row import costs listeners one cache clear, not 10M callbacks.
+CREATE OR REPLACE FUNCTION notify_entity_changed() RETURNS trigger AS
+$$
+DECLARE
+   kind TEXT := CASE TG_TABLE_NAME
+                   WHEN 'politicians' THEN 'person'
+                   WHEN 'companies'   THEN 'company'
+                   ELSE 'holding'
+                END;
+   max_rows CONSTANT INT := 100;
+   changed JSONB[] := '{}';
+BEGIN
+   -- Transition tables exist only for the events that have them
+   IF TG_OP IN ('UPDATE', 'DELETE') THEN
+      SELECT changed || coalesce(array_agg(to_jsonb(o)), '{}') INTO changed
+      FROM (SELECT * FROM old_rows LIMIT max_rows + 1) o;
+   END IF;
+   IF TG_OP IN ('INSERT', 'UPDATE') THEN
+      SELECT changed || coalesce(array_agg(to_jsonb(n)), '{}') INTO changed
+      FROM (SELECT * FROM new_rows LIMIT max_rows + 1) n;
+   END IF;
+
+   IF TG_OP = 'TRUNCATE' OR cardinality(changed) > max_rows THEN
+      PERFORM pg_notify('entity_changed', kind || ':*');
+      RETURN NULL;
+   END IF;
+
+   PERFORM pg_notify('entity_changed', k.key)
+   FROM (
+      SELECT DISTINCT kind || ':' || CASE
+                WHEN kind = 'holding' THEN (r->>'politician_id') || ':' || (r->>'company_id')
+                ELSE r->>'id'
+             END AS key
+      FROM unnest(changed) r
+   ) k;
+   RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+-- Transition tables allow one event per trigger
+DROP TRIGGER IF EXISTS trg_politicians_entity_changed ON politicians;
+DROP TRIGGER IF EXISTS trg_politicians_entity_inserted ON politicians;
+CREATE TRIGGER trg_politicians_entity_inserted
+   AFTER INSERT ON politicians REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+DROP TRIGGER IF EXISTS trg_politicians_entity_updated ON politicians;
+CREATE TRIGGER trg_politicians_entity_updated
+   AFTER UPDATE ON politicians REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+DROP TRIGGER IF EXISTS trg_politicians_entity_deleted ON politicians;
+CREATE TRIGGER trg_politicians_entity_deleted
+   AFTER DELETE ON politicians REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+DROP TRIGGER IF EXISTS trg_politicians_entity_truncated ON politicians;
+CREATE TRIGGER trg_politicians_entity_truncated
+   AFTER TRUNCATE ON politicians
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+
+DROP TRIGGER IF EXISTS trg_companies_entity_changed ON companies;
+DROP TRIGGER IF EXISTS trg_companies_entity_inserted ON companies;
+CREATE TRIGGER trg_companies_entity_inserted
+   AFTER INSERT ON companies REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+DROP TRIGGER IF EXISTS trg_companies_entity_updated ON companies;
+CREATE TRIGGER trg_companies_entity_updated
+   AFTER UPDATE ON companies REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+DROP TRIGGER IF EXISTS trg_companies_entity_deleted ON companies;
+CREATE TRIGGER trg_companies_entity_deleted
+   AFTER DELETE ON companies REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+DROP TRIGGER IF EXISTS trg_companies_entity_truncated ON companies;
+CREATE TRIGGER trg_companies_entity_truncated
+   AFTER TRUNCATE ON companies
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+
+DROP TRIGGER IF EXISTS trg_holdings_entity_changed ON holdings;
+DROP TRIGGER IF EXISTS trg_holdings_entity_inserted ON holdings;
+CREATE TRIGGER trg_holdings_entity_inserted
+   AFTER INSERT ON holdings REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+DROP TRIGGER IF EXISTS trg_holdings_entity_updated ON holdings;
+CREATE TRIGGER trg_holdings_entity_updated
+   AFTER UPDATE ON holdings REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+DROP TRIGGER IF EXISTS trg_holdings_entity_deleted ON holdings;
+CREATE TRIGGER trg_holdings_entity_deleted
+   AFTER DELETE ON holdings REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
+DROP TRIGGER IF EXISTS trg_holdings_entity_truncated ON holdings;
+CREATE TRIGGER trg_holdings_entity_truncated
+   AFTER TRUNCATE ON holdings
+   FOR EACH STATEMENT EXECUTE FUNCTION notify_entity_changed();
 
 -- Mock data
 INSERT INTO politicians (name, position, state, party_affiliation, estimated_net_worth, last_trade_date)